@@ -20,12 +20,15 @@ import atexit
 import functools
 import os
 import sys
+from contextlib import nullcontext
 from queue import Full, Queue
 from threading import Event, Thread
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 
 from skywalking import config, loggings, meter, plugins, profile, sampling
 from skywalking.agent.protocol import Protocol, ProtocolAsync
+from skywalking.agent.reporter_queue import ReporterQueue
+from skywalking.agent.scheduler import Scheduler
 from skywalking.command import command_service, command_service_async
 from skywalking.loggings import logger
 from skywalking.profile.profile_task import ProfileTask
@@ -57,8 +60,10 @@ def report_with_backoff(reporter_name, init_wait):
                     # for segment/log reporter, if the queue not empty(return True), we should keep reporter working
                     # for other cases(return false or None), reset to base wait time on success
                     wait = 0 if flag else base
+                    self.reporter_backoff[reporter_name] = 0
                 except Exception:  # noqa
                     wait = min(60, wait * 2 or 1)  # double wait time with each consecutive error up to a maximum
+                    self.reporter_backoff[reporter_name] = wait
                     logger.exception(f'Exception in {reporter_name} service in pid {os.getpid()}, '
                                      f'retry in {wait} seconds')
                 self._finished.wait(wait)
@@ -112,10 +117,13 @@ class SkyWalkingAgent(Singleton):
         self.started_pid = None
         self.__protocol: Optional[Protocol] = None
         self._finished: Optional[Event] = None
+        self.scheduler: Optional[Scheduler] = None
         # True only after __bootstrap() in the current process; stays False in a pre-fork master
         self.__reporting: bool = False
         self.__at_fork_registered: bool = False
         self.__fini_registered: bool = False
+        # current backoff in seconds of each reporter, published by the agent health meters
+        self.reporter_backoff: Dict[str, float] = {}
 
     def __bootstrap(self):
         # when forking, already instrumented modules must not be instrumented again
@@ -124,7 +132,10 @@ class SkyWalkingAgent(Singleton):
         # Initialize queues for segment, log, meter and profiling snapshots
         self.__init_queues()
 
-        if config.agent_protocol == 'grpc':
+        if config.agent_protocol == 'grpc' and config.agent_local_collector_socket:
+            from skywalking.agent.protocol.collector import CollectorProtocol
+            self.__protocol = CollectorProtocol()
+        elif config.agent_protocol == 'grpc':
             from skywalking.agent.protocol.grpc import GrpcProtocol
             self.__protocol = GrpcProtocol()
         elif config.agent_protocol == 'http':
@@ -143,15 +154,21 @@ class SkyWalkingAgent(Singleton):
         """
         This method initializes all the queues for the agent and reporters.
         """
-        self.__segment_queue = Queue(maxsize=config.agent_trace_reporter_max_buffer_size)
-        self.__log_queue: Optional[Queue] = None
-        self.__meter_queue: Optional[Queue] = None
+        def reporter_queue(name: str, maxsize: int) -> ReporterQueue:
+            if config.agent_self_meter_reporter_active:
+                from skywalking.meter.agent_health import MeteredQueue
+                return MeteredQueue(name, maxsize=maxsize)
+            return ReporterQueue(maxsize=maxsize)
+
+        self.__segment_queue = reporter_queue('segment', maxsize=config.agent_trace_reporter_max_buffer_size)
+        self.__log_queue: Optional[ReporterQueue] = None
+        self.__meter_queue: Optional[ReporterQueue] = None
         self.__snapshot_queue: Optional[Queue] = None
 
         if config.agent_meter_reporter_active:
-            self.__meter_queue = Queue(maxsize=config.agent_meter_reporter_max_buffer_size)
+            self.__meter_queue = reporter_queue('meter', maxsize=config.agent_meter_reporter_max_buffer_size)
         if config.agent_log_reporter_active:
-            self.__log_queue = Queue(maxsize=config.agent_log_reporter_max_buffer_size)
+            self.__log_queue = reporter_queue('log', maxsize=config.agent_log_reporter_max_buffer_size)
         if config.agent_profile_active:
             self.__snapshot_queue = Queue(maxsize=config.agent_profile_snapshot_transport_buffer_size)
 
@@ -161,32 +178,42 @@ class SkyWalkingAgent(Singleton):
         This method initializes all the threads for the agent and reporters.
         Upon os.fork(), callback will reinitialize threads and queues by calling this method
 
-        Heartbeat thread is started by default.
-        Segment reporter thread and segment queue is created by default.
-        All other queues and threads depends on user configuration.
+        The segment and log reporters have their own threads, as their reports stream from the queues,
+        all the other periodic jobs run on the scheduler thread.
+        Heartbeat and segment reporter are started by default.
+        All other queues and jobs depends on user configuration.
         """
         self._finished = Event()
+        self.scheduler = Scheduler()
 
-        __heartbeat_thread = Thread(name='HeartbeatThread', target=self.__heartbeat, daemon=True)
-        __heartbeat_thread.start()
+        self.__schedule('heartbeat', config.agent_collector_heartbeat_period, self.__heartbeat)
 
         __segment_report_thread = Thread(name='SegmentReportThread', target=self.__report_segment, daemon=True)
         __segment_report_thread.start()
 
         if config.agent_meter_reporter_active:
-            __meter_report_thread = Thread(name='MeterReportThread', target=self.__report_meter, daemon=True)
-            __meter_report_thread.start()
+            self.__schedule('meter_service', config.agent_meter_reporter_period, meter._meter_service.send,
+                            delay=config.agent_meter_reporter_period)
+            self.__schedule('meter', config.agent_meter_reporter_period, self.__report_meter)
 
             if config.agent_pvm_meter_reporter_active:
-                from skywalking.meter.pvm.cpu_usage import CPUUsageDataSource
                 from skywalking.meter.pvm.gc_data import GCDataSource
-                from skywalking.meter.pvm.mem_usage import MEMUsageDataSource
-                from skywalking.meter.pvm.thread_data import ThreadDataSource
+                from skywalking.meter.pvm.process_data import ProcessDataSource
 
-                MEMUsageDataSource().register()
-                CPUUsageDataSource().register()
+                ProcessDataSource().register()
                 GCDataSource().register()
-                ThreadDataSource().register()
+
+            if config.agent_self_meter_reporter_active:
+                self.__register_health_meters()
+
+            if config.agent_plugin_overhead_active:
+                from skywalking.meter import plugin_overhead
+                plugin_overhead.register()
+
+        if config.agent_loop_monitor_active:
+            from skywalking.meter import loop_monitor
+            loop_monitor.monitor.register()  # reported only with the meter reporter active
+            self.__schedule('loop_monitor', config.agent_loop_monitor_interval, loop_monitor.monitor.check)
 
         if config.agent_log_reporter_active:
             __log_report_thread = Thread(name='LogReportThread', target=self.__report_log, daemon=True)
@@ -194,17 +221,61 @@ class SkyWalkingAgent(Singleton):
 
         if config.agent_profile_active:
             # Now only profiler receives commands from OAP
-            __command_dispatch_thread = Thread(name='CommandDispatchThread', target=self.__command_dispatch,
-                                               daemon=True)
-            __command_dispatch_thread.start()
+            self.__schedule('query_profile_command', config.agent_collector_get_profile_task_interval,
+                            self.__query_profile_command)
+            self.__schedule('profile_snapshot', 0.5, self.__send_profile_snapshot)
+
+        if config.agent_dynamic_config_active:
+            self.__schedule('query_configurations', config.agent_dynamic_config_interval, self.__query_configurations)
+
+        if config.agent_dynamic_config_file:
+            from skywalking import dynamic_config
+            self.__schedule('dynamic_config_file', config.agent_dynamic_config_interval, dynamic_config.check_file)
+
+        self.scheduler.start()
+
+    def __schedule(self, reporter_name: str, interval: float, func, delay: float = 0) -> None:
+        """
+        Run func on the scheduler every interval seconds, with the same exponential backoff
+        on errors as the reporter threads.
+        """
+        wait = interval
 
-            __query_profile_thread = Thread(name='QueryProfileCommandThread', target=self.__query_profile_command,
-                                            daemon=True)
-            __query_profile_thread.start()
+        def job():
+            nonlocal wait
+            try:
+                func()
+                wait = interval
+                self.reporter_backoff[reporter_name] = 0
+            except Exception:  # noqa
+                wait = min(60, wait * 2 or 1)  # double wait time with each consecutive error up to a maximum
+                self.reporter_backoff[reporter_name] = wait
+                logger.exception(f'Exception in {reporter_name} service in pid {os.getpid()}, '
+                                 f'retry in {wait} seconds')
+            return None if self._finished.is_set() else wait
 
-            __send_profile_thread = Thread(name='SendProfileSnapShotThread', target=self.__send_profile_snapshot,
-                                           daemon=True)
-            __send_profile_thread.start()
+        job.__name__ = reporter_name
+        self.scheduler.schedule(delay, job)
+
+    def __register_health_meters(self) -> None:
+        from skywalking.meter.agent_health import register_backoff, register_spool
+
+        register_backoff(self.reporter_backoff, 'heartbeat')
+        for queue in (self.__segment_queue, self.__log_queue, self.__meter_queue):
+            if queue is not None:
+                queue.register()
+                register_backoff(self.reporter_backoff, queue.name)
+
+        spool = getattr(self.__protocol, 'spool', None)
+        if spool is not None:
+            register_spool(spool)
+
+    @staticmethod
+    def __measure(queue: Queue):
+        """
+        Measure a report from the queue if the agent health meters are enabled.
+        """
+        return queue.measure() if config.agent_self_meter_reporter_active else nullcontext()
 
     @staticmethod  # for now
     def __fork_before() -> None:
@@ -307,7 +378,7 @@ class SkyWalkingAgent(Singleton):
             profile.init()
         if config.agent_meter_reporter_active:
             meter.init(force=True)  # force re-init after fork()
-        if config.sample_n_per_3_secs > 0:
+        if sampling.strategy():
             sampling.init(force=True)
 
         self.__bootstrap()  # calls init_threading
@@ -336,6 +407,10 @@ class SkyWalkingAgent(Singleton):
             log.install()
         # Here we install all other lib plugins on first time start (parent process)
         plugins.install()
+        if config.agent_loop_monitor_active:
+            from skywalking.meter import loop_monitor
+            loop_monitor.install(config.agent_loop_monitor_interval,
+                                 config.agent_loop_monitor_slow_callback_threshold / 1000)
 
     def __register_fork_hooks(self) -> None:
         # at-fork registrations cannot be removed and are fork-inherited; never register twice
@@ -364,6 +439,10 @@ class SkyWalkingAgent(Singleton):
             logger.info(f'SkyWalking Python agent instrumented pre-fork master pid-{os.getpid()}, '
                         f'reporters will start in forked worker processes.')
 
+        if config.agent_local_collector_socket and config.agent_local_collector_spawn:
+            from skywalking.agent import collector
+            collector.spawn()
+
         self.started_pid = os.getpid()
 
         if config.agent_experimental_fork_support:
@@ -391,7 +470,15 @@ class SkyWalkingAgent(Singleton):
             self.__protocol.report_meter(self.__meter_queue, False)
             self.__meter_queue.join()
 
+        if config.agent_plugin_overhead_active:
+            from skywalking.meter import plugin_overhead
+            logger.info('plugin overhead of pid-%s:\n%s', os.getpid(), plugin_overhead.dump())
+
         self._finished.set()
+        self.scheduler.stop()
+        for queue in (self.__segment_queue, self.__log_queue):
+            if queue is not None:
+                queue.close()
 
     def stop(self) -> None:
         """
@@ -403,47 +490,43 @@ class SkyWalkingAgent(Singleton):
         self.__reporting = False
         self.__started = False
 
-    @report_with_backoff(reporter_name='heartbeat', init_wait=config.agent_collector_heartbeat_period)
     def __heartbeat(self) -> None:
         self.__protocol.heartbeat()
 
-    # segment/log init_wait is set to 0.02 to prevent threads from hogging the cpu too much
-    # The value of 0.02(20 ms) is set to be consistent with the queue delay of the Java agent
+    # segment/log reporters block until archive_* fills a batch or the flush deadline of the oldest item passes,
+    # the default deadline of 20 ms is consistent with the queue delay of the Java agent
 
-    @report_with_backoff(reporter_name='segment', init_wait=0.02)
-    def __report_segment(self) -> bool:
-        """Returns True if the queue is not empty"""
-        queue_not_empty_flag = not self.__segment_queue.empty()
-        if queue_not_empty_flag:
-            self.__protocol.report_segment(self.__segment_queue)
-        return queue_not_empty_flag
+    @report_with_backoff(reporter_name='segment', init_wait=0)
+    def __report_segment(self) -> None:
+        if self.__segment_queue.wait_batch():
+            with self.__measure(self.__segment_queue):
+                self.__protocol.report_segment(self.__segment_queue)
 
-    @report_with_backoff(reporter_name='log', init_wait=0.02)
-    def __report_log(self) -> bool:
-        """Returns True if the queue is not empty"""
-        queue_not_empty_flag = not self.__log_queue.empty()
-        if queue_not_empty_flag:
-            self.__protocol.report_log(self.__log_queue)
-        return queue_not_empty_flag
+    @report_with_backoff(reporter_name='log', init_wait=0)
+    def __report_log(self) -> None:
+        if self.__log_queue.wait_batch():
+            with self.__measure(self.__log_queue):
+                self.__protocol.report_log(self.__log_queue)
+
+    # meters and snapshots are reported on the scheduler thread, only what is already queued, without waiting for
+    # more, not to hold up the heartbeat and the other jobs
 
-    @report_with_backoff(reporter_name='meter', init_wait=config.agent_meter_reporter_period)
     def __report_meter(self) -> None:
         if not self.__meter_queue.empty():
-            self.__protocol.report_meter(self.__meter_queue)
+            with self.__measure(self.__meter_queue):
+                self.__protocol.report_meter(self.__meter_queue, block=False)
 
-    @report_with_backoff(reporter_name='profile_snapshot', init_wait=0.5)
     def __send_profile_snapshot(self) -> None:
         if not self.__snapshot_queue.empty():
-            self.__protocol.report_snapshot(self.__snapshot_queue)
+            self.__protocol.report_snapshot(self.__snapshot_queue, block=False)
 
-    @report_with_backoff(reporter_name='query_profile_command',
-                         init_wait=config.agent_collector_get_profile_task_interval)
     def __query_profile_command(self) -> None:
         self.__protocol.query_profile_commands()
+        # execute the commands received right away, on the scheduler thread
+        command_service.dispatch()
 
-    @staticmethod
-    def __command_dispatch() -> None:
-        # command dispatch will stuck when there are no commands
+    def __query_configurations(self) -> None:
+        self.__protocol.query_configurations()
         command_service.dispatch()
 
     def started(self) -> bool:
@@ -464,6 +547,7 @@ class SkyWalkingAgent(Singleton):
         try:  # unlike checking __queue.full() then inserting, this is atomic
             self.__segment_queue.put(segment, block=False)
         except Full:
+            self.__dropped(self.__segment_queue)
             logger.warning('the queue is full, the segment will be abandoned')
 
     def archive_log(self, log_data: 'LogData'):
@@ -472,6 +556,7 @@ class SkyWalkingAgent(Singleton):
         try:
             self.__log_queue.put(log_data, block=False)
         except Full:
+            self.__dropped(self.__log_queue)
             logger.warning('the queue is full, the log will be abandoned')
 
     def archive_meter(self, meter_data: 'MeterData'):
@@ -480,8 +565,14 @@ class SkyWalkingAgent(Singleton):
         try:
             self.__meter_queue.put(meter_data, block=False)
         except Full:
+            self.__dropped(self.__meter_queue)
             logger.warning('the queue is full, the meter will be abandoned')
 
+    @staticmethod
+    def __dropped(queue: Queue) -> None:
+        if config.agent_self_meter_reporter_active:
+            queue.dropped.increment()
+
     def add_profiling_snapshot(self, snapshot: TracingThreadSnapshot):
         if not self.__reporting:
             return
@@ -551,24 +642,37 @@ class SkyWalkingAgentAsync(Singleton):
             self.background_coroutines.add(self.__report_meter())
 
             if config.agent_pvm_meter_reporter_active:
-                from skywalking.meter.pvm.cpu_usage import CPUUsageDataSource
                 from skywalking.meter.pvm.gc_data import GCDataSource
-                from skywalking.meter.pvm.mem_usage import MEMUsageDataSource
-                from skywalking.meter.pvm.thread_data import ThreadDataSource
+                from skywalking.meter.pvm.process_data import ProcessDataSource
 
-                MEMUsageDataSource().register()
-                CPUUsageDataSource().register()
+                ProcessDataSource().register()
                 GCDataSource().register()
-                ThreadDataSource().register()
+
+            if config.agent_plugin_overhead_active:
+                from skywalking.meter import plugin_overhead
+                plugin_overhead.register()
+
+        if config.agent_loop_monitor_active:
+            from skywalking.meter import loop_monitor
+            loop_monitor.monitor.register()  # reported only with the meter reporter active
+            self.background_coroutines.add(self.__check_loop_monitor())
 
         if config.agent_log_reporter_active:
             self.background_coroutines.add(self.__report_log())
 
-        if config.agent_profile_active:
+        if config.agent_profile_active or config.agent_dynamic_config_active:
             self.background_coroutines.add(self.__command_dispatch())
+
+        if config.agent_profile_active:
             self.background_coroutines.add(self.__query_profile_command())
             self.background_coroutines.add(self.__send_profile_snapshot())
 
+        if config.agent_dynamic_config_active:
+            self.background_coroutines.add(self.__query_configurations())
+
+        if config.agent_dynamic_config_file:
+            self.background_coroutines.add(self.__check_dynamic_config_file())
+
     async def __start_event_loop_async(self) -> None:
         self.loop = asyncio.get_running_loop()  # always get the current running loop first
         # asyncio Queue should be created after the creation of event loop
@@ -591,7 +695,7 @@ class SkyWalkingAgentAsync(Singleton):
         if config.agent_meter_reporter_active:
             # meter.init(force=True)
             await meter.init_async()
-        if config.sample_n_per_3_secs > 0:
+        if sampling.strategy():
             await sampling.init_async()
 
         self.__bootstrap()  # gather all coroutines
@@ -628,6 +732,10 @@ class SkyWalkingAgentAsync(Singleton):
 
             # Here we install all other lib plugins on first time start (parent process)
             plugins.install()
+            if config.agent_loop_monitor_active:
+                from skywalking.meter import loop_monitor
+                loop_monitor.install(config.agent_loop_monitor_interval,
+                                     config.agent_loop_monitor_slow_callback_threshold / 1000)
 
         elif self.__started and os.getpid() == self.started_pid:
             # if already started, and this is the same process, raise an error
@@ -664,6 +772,8 @@ class SkyWalkingAgentAsync(Singleton):
             queue_join_coroutine_list.append(self.__meter_queue.join())
 
         await asyncio.gather(*queue_join_coroutine_list, return_exceptions=True)    # clean queues
+        if self.__protocol is not None:
+            await self.__protocol.stop()
         # cancel all tasks
         all_tasks = asyncio.all_tasks(self.loop)
         for task in all_tasks:
@@ -674,6 +784,9 @@ class SkyWalkingAgentAsync(Singleton):
             asyncio.run_coroutine_threadsafe(self.__fini_async(), self.loop)
         self.event_loop_thread.join()
         logger.info('Finished Python agent event_loop thread')
+        if config.agent_plugin_overhead_active:
+            from skywalking.meter import plugin_overhead
+            logger.info('plugin overhead of pid-%s:\n%s', os.getpid(), plugin_overhead.dump())
         # TODO: Unhandled error in sys.excepthook https://github.com/pytest-dev/execnet/issues/30
 
     def stop(self) -> None:
@@ -709,6 +822,11 @@ class SkyWalkingAgentAsync(Singleton):
         if not self.__meter_queue.empty():
             await self.__protocol.report_meter(self.__meter_queue)
 
+    @report_with_backoff_async(reporter_name='loop_monitor', init_wait=config.agent_loop_monitor_interval)
+    async def __check_loop_monitor(self) -> None:
+        from skywalking.meter import loop_monitor
+        loop_monitor.monitor.check()
+
     @report_with_backoff_async(reporter_name='profile_snapshot', init_wait=0.5)
     async def __send_profile_snapshot(self) -> None:
         if not self.__snapshot_queue.empty():
@@ -720,6 +838,15 @@ class SkyWalkingAgentAsync(Singleton):
     async def __query_profile_command(self) -> None:
         await self.__protocol.query_profile_commands()
 
+    @report_with_backoff_async(reporter_name='query_configurations', init_wait=config.agent_dynamic_config_interval)
+    async def __query_configurations(self) -> None:
+        await self.__protocol.query_configurations()
+
+    @report_with_backoff_async(reporter_name='dynamic_config_file', init_wait=config.agent_dynamic_config_interval)
+    async def __check_dynamic_config_file(self) -> None:
+        from skywalking import dynamic_config
+        dynamic_config.check_file()
+
     @staticmethod
     async def __command_dispatch() -> None:
         # command dispatch will stuck when there are no commands
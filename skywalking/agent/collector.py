@@ -0,0 +1,327 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+The local collector, a process reporting to the OAP on behalf of all the agent processes of a host, e.g. the workers
+of pre-fork servers, which forward their serialized segments, logs, meters and heartbeats over a Unix socket instead
+of each opening a connection to the OAP. Run it with `python -m skywalking.agent.collector`, it listens on
+`agent_local_collector_socket` and reports with the gRPC configuration of the agent.
+"""
+
+import atexit
+import os
+import selectors
+import signal
+import socket
+import subprocess
+import sys
+from functools import partial
+from queue import Empty, Full
+from threading import Event, Thread
+from time import monotonic
+from typing import Dict, Optional
+
+from skywalking import config, loggings, meter
+from skywalking.agent import report_with_backoff
+from skywalking.agent.protocol.collector import FRAME, MAX_FRAME_SIZE, FrameKind
+from skywalking.agent.protocol.spool import SpoolKind
+from skywalking.agent.scheduler import Scheduler
+from skywalking.loggings import logger
+from skywalking.meter.agent_health import MeteredQueue
+
+DROPPED_WARNING_INTERVAL = 60  # seconds between two warnings about frames dropped by a full queue
+
+
+class LocalCollector:
+    def __init__(self, path: str):
+        from skywalking.agent.protocol.grpc import GrpcProtocol
+
+        self.path = path
+        self.protocol = GrpcProtocol()
+        self.queues: Dict[FrameKind, MeteredQueue] = {
+            FrameKind.SEGMENT: MeteredQueue('collector_segment', maxsize=config.agent_trace_reporter_max_buffer_size),
+            FrameKind.LOG: MeteredQueue('collector_log', maxsize=config.agent_log_reporter_max_buffer_size),
+            FrameKind.METER: MeteredQueue('collector_meter', maxsize=config.agent_meter_reporter_max_buffer_size),
+        }
+        self.reporters = {
+            FrameKind.SEGMENT: self.protocol.traces_reporter,
+            FrameKind.LOG: self.protocol.log_reporter,
+            FrameKind.METER: self.protocol.meter_reporter,
+        }
+        # current backoff in seconds of each reporter, published by the health meters
+        self.reporter_backoff: Dict[str, float] = {}
+        self._dropped_warned: Optional[float] = None
+        # heartbeats and instance properties of the agent processes are sent one at a time off the socket thread
+        self.scheduler = Scheduler()
+        self._finished = Event()
+        self._selector = selectors.DefaultSelector()
+        self._server: Optional[socket.socket] = None
+        self._serve_thread: Optional[Thread] = None
+
+    def start(self) -> None:
+        self._server = listen(self.path)
+        self._server.setblocking(False)
+        self._selector.register(self._server, selectors.EVENT_READ)
+
+        self.scheduler.start()
+        self.scheduler.schedule(config.agent_collector_heartbeat_period, self.__replay)
+        if config.agent_meter_reporter_active and config.agent_self_meter_reporter_active:
+            self.__register_health_meters()
+            self.scheduler.schedule(config.agent_meter_reporter_period, self.__report_health)
+        for kind, queue in self.queues.items():
+            report = report_with_backoff(reporter_name=queue.name, init_wait=0)(LocalCollector.__report)
+            Thread(name=f'Collector{kind.name.capitalize()}Thread', target=report, args=(self, kind),
+                   daemon=True).start()
+        self._serve_thread = Thread(name='CollectorSocketThread', target=self.__serve, daemon=True)
+        self._serve_thread.start()
+        logger.info('local collector listening at %s', self.path)
+
+    def stop(self) -> None:
+        self._finished.set()
+        self.scheduler.stop()
+        for queue in self.queues.values():
+            queue.close()
+        if self._serve_thread is not None:
+            self._serve_thread.join()
+
+    def __serve(self) -> None:
+        buffers: Dict[socket.socket, bytearray] = {}
+        while not self._finished.is_set():
+            for key, _ in self._selector.select(timeout=1):
+                sock = key.fileobj
+                if sock is self._server:
+                    try:
+                        conn, _ = self._server.accept()
+                    except OSError:
+                        continue
+                    conn.setblocking(False)
+                    self._selector.register(conn, selectors.EVENT_READ)
+                    buffers[conn] = bytearray()
+                    continue
+
+                try:
+                    data = sock.recv(65536)
+                except BlockingIOError:
+                    continue
+                except OSError:
+                    data = b''
+                buffer = buffers[sock]
+                buffer += data
+                if not data or not self.__consume(buffer):
+                    self._selector.unregister(sock)
+                    sock.close()
+                    del buffers[sock]
+
+        for sock in buffers:
+            sock.close()
+        self._selector.close()
+        self._server.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    def __consume(self, buffer: bytearray) -> bool:
+        """
+        Dispatch the complete frames in the buffer and keep the rest, returns False if the stream is corrupted.
+        """
+        offset = 0
+        while len(buffer) - offset >= FRAME.size:
+            length, kind = FRAME.unpack_from(buffer, offset)
+            if length > MAX_FRAME_SIZE or kind not in FrameKind._value2member_map_:
+                logger.warning('invalid frame received by the local collector, closing the connection')
+                return False
+            end = offset + FRAME.size + length
+            if end > len(buffer):
+                break
+            self.dispatch(FrameKind(kind), bytes(buffer[offset + FRAME.size:end]))
+            offset = end
+        del buffer[:offset]
+        return True
+
+    def dispatch(self, kind: FrameKind, payload: bytes) -> None:
+        if kind is FrameKind.KEEP_ALIVE:
+            self.scheduler.schedule(0, partial(self.__keep_alive, payload))
+        elif kind is FrameKind.INSTANCE_PROPERTIES:
+            self.scheduler.schedule(0, partial(self.__report_instance_properties, payload))
+        else:
+            queue = self.queues[kind]
+            try:
+                queue.put_nowait(payload)
+            except Full:
+                queue.dropped.increment()
+                self.__warn_dropped(kind, queue)
+
+    def __warn_dropped(self, kind: FrameKind, queue: MeteredQueue) -> None:
+        """
+        Warn about the frames dropped by a full queue, at most once every `DROPPED_WARNING_INTERVAL` seconds.
+        """
+        now = monotonic()
+        if self._dropped_warned is not None and now - self._dropped_warned < DROPPED_WARNING_INTERVAL:
+            return
+        self._dropped_warned = now
+        logger.warning('the local collector %s queue is full, %d frames dropped so far', kind.name.lower(),
+                       queue.dropped.get())
+
+    def __keep_alive(self, payload: bytes) -> None:
+        from skywalking.protocol.management.Management_pb2 import InstancePingPkg
+
+        self.__manage('keepAlive', InstancePingPkg.FromString(payload))
+
+    def __report_instance_properties(self, payload: bytes) -> None:
+        from skywalking.protocol.management.Management_pb2 import InstanceProperties
+
+        self.__manage('reportInstanceProperties', InstanceProperties.FromString(payload))
+
+    def __manage(self, method: str, message) -> None:
+        import grpc
+
+        try:
+            getattr(self.protocol.service_management.service_stub, method)(message)
+        except grpc.RpcError as e:
+            logger.warning('local collector failed to send %s of instance %s: %s', method, message.serviceInstance,
+                           e.code())
+
+    def __report(self, kind: FrameKind) -> None:
+        """
+        Report the next batch of frames of a kind, retried with the backoff of the agent reporters on errors.
+        """
+        queue, reporter = self.queues[kind], self.reporters[kind]
+
+        def generator():
+            while True:
+                try:
+                    payload = queue.get_nowait()
+                except Empty:
+                    return
+                queue.task_done()
+                yield payload
+
+        if queue.wait_batch():
+            with queue.measure():
+                # what a failed report already took from the queue is kept in the backlog, retried first
+                self.protocol.report_records(SpoolKind(kind), reporter, generator())
+
+    def __replay(self) -> float:
+        """
+        Replay a slice of the backlog, which otherwise waits for the next report.
+        """
+        import grpc
+
+        if self.protocol.backlog is not None:
+            try:
+                self.protocol.replay_backlog(max_batches=1)
+            except grpc.RpcError as e:
+                logger.warning('local collector failed to replay the backlog: %s', e.code())
+        return config.agent_collector_heartbeat_period
+
+    def __register_health_meters(self) -> None:
+        from skywalking.meter.agent_health import register_backoff, register_spool
+
+        meter.init()
+        for queue in self.queues.values():
+            queue.register()
+            register_backoff(self.reporter_backoff, queue.name)
+        if self.protocol.spool is not None:
+            register_spool(self.protocol.spool)
+
+    def __report_health(self) -> float:
+        """
+        Report the health meters of the collector itself along with the meters forwarded by the agent processes.
+        """
+        meter._meter_service.send(lambda data: self.dispatch(FrameKind.METER, data.SerializeToString()))
+        return config.agent_meter_reporter_period
+
+
+def listen(path: str) -> socket.socket:
+    """
+    Bind the collector socket, replacing the file left by a collector that is gone.
+    """
+    if os.path.exists(path):
+        if reachable(path):
+            raise RuntimeError(f'a local collector is already listening at {path}')
+        os.unlink(path)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    os.chmod(path, 0o600)
+    server.listen(128)
+    return server
+
+
+def reachable(path: str) -> bool:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def spawn() -> Optional[subprocess.Popen]:
+    """
+    Start the local collector in a new process unless one is already listening, it is stopped with this process.
+    """
+    path = config.agent_local_collector_socket
+    if reachable(path):
+        return None
+
+    env = dict(os.environ)
+    if env.get('PYTHONPATH'):  # keep the sw-python loader from starting an agent in the collector
+        from skywalking.bootstrap import loader
+        loader_dir = os.path.dirname(loader.__file__)
+        env['PYTHONPATH'] = os.pathsep.join(p for p in env['PYTHONPATH'].split(os.pathsep) if p != loader_dir)
+
+    process = subprocess.Popen([sys.executable, '-m', 'skywalking.agent.collector'], env=env)
+    pid = os.getpid()
+
+    def terminate():
+        if os.getpid() == pid:  # atexit handlers are inherited by the forked workers
+            process.terminate()
+
+    atexit.register(terminate)
+    logger.info('spawned the local collector pid-%s listening at %s', process.pid, path)
+    return process
+
+
+def main() -> None:
+    config.finalize()
+    loggings.init()
+    if not config.agent_local_collector_socket:
+        sys.exit('SW_AGENT_LOCAL_COLLECTOR_SOCKET is not set')
+
+    collector = LocalCollector(config.agent_local_collector_socket)
+    try:
+        collector.start()
+    except RuntimeError as e:  # lost the race against another collector
+        logger.info('%s', e)
+        return
+
+    stopped = Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    try:
+        stopped.wait()
+    except KeyboardInterrupt:
+        pass
+    collector.stop()
+
+
+if __name__ == '__main__':
+    main()
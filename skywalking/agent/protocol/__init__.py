@@ -45,6 +45,10 @@ class Protocol(ABC):
     def query_profile_commands(self):
         raise NotImplementedError()
 
+    @abstractmethod
+    def query_configurations(self):
+        raise NotImplementedError()
+
     @abstractmethod
     def notify_profile_task_finish(self, task):
         raise NotImplementedError()
@@ -75,6 +79,15 @@ class ProtocolAsync(ABC):
     async def query_profile_commands(self):
         raise NotImplementedError()
 
+    @abstractmethod
+    async def query_configurations(self):
+        raise NotImplementedError()
+
     @abstractmethod
     async def notify_profile_task_finish(self, task):
         raise NotImplementedError()
+
+    async def stop(self):
+        """
+        Called when the agent stops, once the queues are drained.
+        """
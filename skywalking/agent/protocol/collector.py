@@ -0,0 +1,193 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import socket
+import struct
+import time
+from enum import IntEnum
+from queue import Queue
+from threading import Lock
+from typing import Iterable, List, Optional
+
+import grpc
+
+from skywalking import config
+from skywalking.agent.protocol.grpc import GrpcProtocol, serialize
+from skywalking.agent.protocol.spool import SpoolKind
+from skywalking.loggings import logger, logger_debug_enabled
+
+
+class FrameKind(IntEnum):
+    SEGMENT = SpoolKind.SEGMENT
+    LOG = SpoolKind.LOG
+    METER = SpoolKind.METER
+    INSTANCE_PROPERTIES = 4
+    KEEP_ALIVE = 5
+
+
+# payload length, kind
+FRAME = struct.Struct('<IB')
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+
+def pack(kind: FrameKind, payloads: Iterable[bytes]) -> bytes:
+    """
+    Length-prefix the serialized messages into frames, written to the socket in a single call.
+    """
+    buffer = bytearray()
+    for payload in payloads:
+        buffer += FRAME.pack(len(payload), kind)
+        buffer += payload
+    return bytes(buffer)
+
+
+class CollectorClient:
+    """
+    The connection of an agent process to the local collector, shared by its reporter threads.
+    A failed connection is retried at most every `RETRY_INTERVAL` seconds, the process reports by itself meanwhile.
+    """
+
+    RETRY_INTERVAL = 5
+
+    def __init__(self, path: str):
+        self.path = path
+        self._sock: Optional[socket.socket] = None
+        self._retry_at = 0.0
+        self._lock = Lock()
+
+    def available(self) -> bool:
+        if self._sock is not None:
+            return True
+        if time.monotonic() < self._retry_at:
+            return False
+
+        with self._lock:
+            if self._sock is None:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.settimeout(config.agent_queue_timeout)
+                try:
+                    sock.connect(self.path)
+                except OSError as e:
+                    sock.close()
+                    self._retry_at = time.monotonic() + self.RETRY_INTERVAL
+                    if logger_debug_enabled:
+                        logger.debug('local collector at %s is not reachable: %s', self.path, e)
+                    return False
+                logger.info('reporting through the local collector at %s', self.path)
+                self._sock = sock
+        return True
+
+    def send(self, kind: FrameKind, payloads: List[bytes]) -> bool:
+        """
+        Send the serialized messages to the collector, returns False if they could not be sent. The frames of a
+        failed write may have partly reached the collector, so they can be reported twice.
+        """
+        if not self.available():
+            return False
+
+        data = pack(kind, payloads)
+        with self._lock:
+            if self._sock is None:
+                return False
+            try:
+                self._sock.sendall(data)
+                return True
+            except OSError as e:
+                logger.warning('lost the connection to the local collector at %s: %s', self.path, e)
+                self._sock.close()
+                self._sock = None
+                self._retry_at = time.monotonic() + self.RETRY_INTERVAL
+                return False
+
+    def close(self) -> None:
+        with self._lock:
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
+
+
+class _ForwardingManagementStub:
+    """
+    Forwards instance properties and heartbeats to the collector, or to the OAP while it is not available.
+    """
+
+    def __init__(self, client: CollectorClient, stub):
+        self.client = client
+        self.stub = stub
+
+    def reportInstanceProperties(self, message):  # noqa
+        if not self.client.send(FrameKind.INSTANCE_PROPERTIES, [message.SerializeToString()]):
+            self.stub.reportInstanceProperties(message)
+
+    def keepAlive(self, message):  # noqa
+        if not self.client.send(FrameKind.KEEP_ALIVE, [message.SerializeToString()]):
+            self.stub.keepAlive(message)
+
+
+class CollectorProtocol(GrpcProtocol):
+    """
+    The gRPC protocol of a process reporting through the local collector: segments, logs, meters and heartbeats are
+    serialized in the process and forwarded over a Unix socket to the collector, which reports them to the OAP over
+    its single connection. The gRPC channel of the process is only connected while the collector is not available,
+    and for profiling.
+    """
+
+    def __init__(self):
+        super().__init__(connect=False)
+        self.collector = CollectorClient(config.agent_local_collector_socket)
+        management = self.service_management
+        management.service_stub = _ForwardingManagementStub(self.collector, management.service_stub)
+
+    # with the collector available, reporters only drain what is queued, the reporter queue already waited for a
+    # batch to be ready, and the collector batches the reports to the OAP
+
+    def report_segment(self, queue: Queue, block: bool = True):
+        super().report_segment(queue, block and not self.collector.available())
+
+    def report_log(self, queue: Queue, block: bool = True):
+        super().report_log(queue, block and not self.collector.available())
+
+    def report_meter(self, queue: Queue, block: bool = True):
+        super().report_meter(queue, block and not self.collector.available())
+
+    def report_records(self, kind: SpoolKind, reporter, generator):
+        if not self.collector.available():
+            super().report_records(kind, reporter, generator)
+            return
+
+        batch = []
+        for message in generator:
+            batch.append(serialize(message))
+            if len(batch) >= config.agent_local_collector_batch_size:
+                self.__forward(kind, reporter, batch)
+                batch = []
+        if batch:
+            self.__forward(kind, reporter, batch)
+
+    def __forward(self, kind: SpoolKind, reporter, batch: List[bytes]):
+        if self.collector.send(FrameKind(kind), batch):
+            return
+
+        # the collector went away, report the batch by ourselves
+        try:
+            reporter.report_serialized(iter(batch))
+        except grpc.RpcError:
+            if self.backlog is not None:
+                for data in batch:
+                    self.backlog.append(kind, data)
+            raise
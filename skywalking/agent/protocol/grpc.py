@@ -18,48 +18,75 @@
 import logging
 import traceback
 from queue import Queue, Empty
+from threading import Lock
 from time import time
+from typing import Optional
 
 import grpc
 
 from skywalking import config
 from skywalking.agent.protocol import Protocol
 from skywalking.agent.protocol.interceptors import header_adder_interceptor
+from skywalking.agent.protocol.spool import ReplayBuffer, Spool, SpoolKind
 from skywalking.client.grpc import GrpcServiceManagementClient, GrpcTraceSegmentReportService, \
-    GrpcProfileTaskChannelService, GrpcLogDataReportService, GrpcMeterReportService
+    GrpcProfileTaskChannelService, GrpcLogDataReportService, GrpcMeterReportService, \
+    GrpcConfigurationDiscoveryService, channel_compression, channel_options
 from skywalking.loggings import logger, logger_debug_enabled
 from skywalking.profile.profile_task import ProfileTask
 from skywalking.profile.snapshot import TracingThreadSnapshot
-from skywalking.protocol.common.Common_pb2 import KeyStringValuePair
-from skywalking.protocol.language_agent.Tracing_pb2 import SegmentObject, SpanObject, Log, SegmentReference
 from skywalking.protocol.logging.Logging_pb2 import LogData
 from skywalking.protocol.language_agent.Meter_pb2 import MeterData
 from skywalking.protocol.profile.Profile_pb2 import ThreadSnapshot, ThreadStack
+from skywalking.trace.encoder import encode_segment, segment_object
 from skywalking.trace.segment import Segment
 
 
+def serialize(message) -> bytes:
+    return message if isinstance(message, bytes) else message.SerializeToString()
+
+
 class GrpcProtocol(Protocol):
-    def __init__(self):
+    def __init__(self, connect: bool = True):
         self.properties_sent = False
         self.state = None
 
         if config.agent_force_tls:
-            self.channel = grpc.secure_channel(config.agent_collector_backend_services, grpc.ssl_channel_credentials())
+            self.channel = grpc.secure_channel(config.agent_collector_backend_services, grpc.ssl_channel_credentials(),
+                                               options=channel_options(), compression=channel_compression())
         else:
-            self.channel = grpc.insecure_channel(config.agent_collector_backend_services)
+            self.channel = grpc.insecure_channel(config.agent_collector_backend_services, options=channel_options(),
+                                                 compression=channel_compression())
 
         if config.agent_authentication:
             self.channel = grpc.intercept_channel(
                 self.channel, header_adder_interceptor('authentication', config.agent_authentication)
             )
 
-        self.channel.subscribe(self._cb, try_to_connect=True)
+        # without `connect`, the channel stays idle until its first call
+        self.channel.subscribe(self._cb, try_to_connect=connect)
         self.service_management = GrpcServiceManagementClient(self.channel)
         self.traces_reporter = GrpcTraceSegmentReportService(self.channel)
         self.profile_channel = GrpcProfileTaskChannelService(self.channel)
+        self.configuration_discovery = GrpcConfigurationDiscoveryService(self.channel)
         self.log_reporter = GrpcLogDataReportService(self.channel)
         self.meter_reporter = GrpcMeterReportService(self.channel)
 
+        self.spool = Spool.for_process() if config.agent_spool_active else None
+        # where the records pulled by a failed stream are kept for a retry, the spool if active
+        self.backlog = self.spool
+        if self.spool is None and config.agent_grpc_replay_buffer_size > 0:
+            self.backlog = ReplayBuffer(config.agent_grpc_replay_buffer_size)
+        self._replay_lock = Lock()
+
+        # with streaming sessions, a `collect` call is fed from the queue until it is old or large enough to be
+        # rotated, the reporter backoff opens a new one right after, or after an error
+        if config.agent_grpc_streaming_session:
+            self.stream_max_age = config.agent_grpc_streaming_session_max_age
+            self.stream_max_messages = config.agent_grpc_streaming_session_max_messages
+        else:
+            self.stream_max_age = config.agent_queue_timeout
+            self.stream_max_messages = 0  # unlimited
+
     def _cb(self, state):
         if logger_debug_enabled:
             logger.debug('grpc channel connectivity changed, [%s -> %s]', self.state, state)
@@ -70,6 +97,11 @@ class GrpcProtocol(Protocol):
             logger.debug('query profile commands')
         self.profile_channel.do_query()
 
+    def query_configurations(self):
+        if logger_debug_enabled:
+            logger.debug('query configurations')
+        self.configuration_discovery.do_query()
+
     def notify_profile_task_finish(self, task: ProfileTask):
         self.profile_channel.finish(task)
 
@@ -81,6 +113,9 @@ class GrpcProtocol(Protocol):
 
             self.service_management.send_heart_beat()
 
+            if self.backlog is not None:  # a slice only, not to hold up the other jobs of the scheduler thread
+                self.replay_backlog(max_batches=1)
+
         except grpc.RpcError:
             self.on_error()
             raise
@@ -90,15 +125,78 @@ class GrpcProtocol(Protocol):
         self.channel.unsubscribe(self._cb)
         self.channel.subscribe(self._cb, try_to_connect=True)
 
+    def report_records(self, kind: SpoolKind, reporter, generator):
+        """
+        Report the messages from generator, serialized once unless they already are. Messages already pulled from the
+        queue are kept in the backlog when the stream fails, and retried first by the next report. With spool enabled,
+        messages are also spooled instead while the channel is down.
+        """
+        if self.backlog is None:
+            reporter.report_serialized(serialize(message) for message in generator)
+            return
+
+        if self.spool is not None and \
+                self.state in (grpc.ChannelConnectivity.TRANSIENT_FAILURE, grpc.ChannelConnectivity.SHUTDOWN):
+            for message in generator:
+                self.spool.append(kind, serialize(message))
+            return
+
+        self.replay_backlog()
+
+        # the tail of the stream not acknowledged yet, bounded in bytes as the backlog is
+        pulled = ReplayBuffer(self.backlog.capacity)
+
+        def serialized():
+            for message in generator:
+                data = serialize(message)
+                pulled.append(kind, data)
+                yield data
+
+        try:
+            reporter.report_serialized(serialized())
+        except grpc.RpcError:
+            for _, data in pulled.peek(len(pulled))[0]:
+                self.backlog.append(kind, data)
+            raise
+
+    def replay_backlog(self, max_batches: Optional[int] = None):
+        """
+        Replay the backlog batch by batch, up to `max_batches` batches if set, a batch is removed from the backlog
+        only after it is delivered.
+        """
+        if not self._replay_lock.acquire(blocking=False):  # another reporter thread is replaying
+            return
+
+        try:
+            batches = 0
+            while not self.backlog.empty() and (max_batches is None or batches < max_batches):
+                batches += 1
+                records, offset = self.backlog.peek(config.agent_spool_replay_batch_size)
+                for kind, reporter in ((SpoolKind.SEGMENT, self.traces_reporter),
+                                       (SpoolKind.LOG, self.log_reporter),
+                                       (SpoolKind.METER, self.meter_reporter)):
+                    batch = [data for record_kind, data in records if record_kind == kind]
+                    if batch:
+                        reporter.report_serialized(iter(batch))
+                self.backlog.commit(offset)
+
+                if logger_debug_enabled:
+                    logger.debug('replayed %d records', len(records))
+        finally:
+            self._replay_lock.release()
+
     def report_segment(self, queue: Queue, block: bool = True):
         start = None
 
         def generator():
             nonlocal start
+            sent = 0
 
             while True:
                 try:
-                    timeout = config.agent_queue_timeout  # type: int
+                    if self.stream_max_messages and sent >= self.stream_max_messages:
+                        return
+                    timeout = self.stream_max_age  # type: int
                     if not start:  # make sure first time through queue is always checked
                         start = time()
                     else:
@@ -114,48 +212,14 @@ class GrpcProtocol(Protocol):
                 if logger_debug_enabled:
                     logger.debug('reporting segment %s', segment)
 
-                s = SegmentObject(
-                    traceId=str(segment.related_traces[0]),
-                    traceSegmentId=str(segment.segment_id),
-                    service=config.agent_name,
-                    serviceInstance=config.agent_instance_name,
-                    isSizeLimited=segment.is_size_limited,
-                    spans=[SpanObject(
-                        spanId=span.sid,
-                        parentSpanId=span.pid,
-                        startTime=span.start_time,
-                        endTime=span.end_time,
-                        operationName=span.op,
-                        peer=span.peer,
-                        spanType=span.kind.name,
-                        spanLayer=span.layer.name,
-                        componentId=span.component.value,
-                        isError=span.error_occurred,
-                        logs=[Log(
-                            time=int(log.timestamp * 1000),
-                            data=[KeyStringValuePair(key=item.key, value=item.val) for item in log.items],
-                        ) for log in span.logs],
-                        tags=[KeyStringValuePair(
-                            key=tag.key,
-                            value=tag.val,
-                        ) for tag in span.iter_tags()],
-                        refs=[SegmentReference(
-                            refType=0 if ref.ref_type == 'CrossProcess' else 1,
-                            traceId=ref.trace_id,
-                            parentTraceSegmentId=ref.segment_id,
-                            parentSpanId=ref.span_id,
-                            parentService=ref.service,
-                            parentServiceInstance=ref.service_instance,
-                            parentEndpoint=ref.endpoint,
-                            networkAddressUsedAtPeer=ref.client_address,
-                        ) for ref in span.refs if ref.trace_id],
-                    ) for span in segment.spans],
-                )
+                # a segment whose spans were encoded as they finished is reported as it is
+                s = segment_object(segment) if segment.encoded is None else encode_segment(segment)
 
+                sent += 1
                 yield s
 
         try:
-            self.traces_reporter.report(generator())
+            self.report_records(SpoolKind.SEGMENT, self.traces_reporter, generator())
         except grpc.RpcError:
             self.on_error()
             raise  # reraise so that incremental reconnect wait can process
@@ -165,10 +229,13 @@ class GrpcProtocol(Protocol):
 
         def generator():
             nonlocal start
+            sent = 0
 
             while True:
                 try:
-                    timeout = config.agent_queue_timeout  # type: int
+                    if self.stream_max_messages and sent >= self.stream_max_messages:
+                        return
+                    timeout = self.stream_max_age  # type: int
                     if not start:  # make sure first time through queue is always checked
                         start = time()
                     else:
@@ -184,10 +251,11 @@ class GrpcProtocol(Protocol):
                 if logger_debug_enabled:
                     logger.debug('Reporting Log')
 
+                sent += 1
                 yield log_data
 
         try:
-            self.log_reporter.report(generator())
+            self.report_records(SpoolKind.LOG, self.log_reporter, generator())
         except grpc.RpcError:
             self.on_error()
             raise
@@ -197,10 +265,13 @@ class GrpcProtocol(Protocol):
 
         def generator():
             nonlocal start
+            sent = 0
 
             while True:
                 try:
-                    timeout = config.agent_queue_timeout  # type: int
+                    if self.stream_max_messages and sent >= self.stream_max_messages:
+                        return
+                    timeout = self.stream_max_age  # type: int
                     if not start:  # make sure first time through queue is always checked
                         start = time()
                     else:
@@ -213,12 +284,13 @@ class GrpcProtocol(Protocol):
 
                 queue.task_done()
 
+                sent += 1
                 yield meter_data
 
         try:
             if logger_debug_enabled:
                 logger.debug('Reporting Meter')
-            self.meter_reporter.report(generator())
+            self.report_records(SpoolKind.METER, self.meter_reporter, generator())
         except grpc.RpcError:
             self.on_error()
             raise
@@ -24,8 +24,10 @@ import grpc
 from skywalking import config
 from skywalking.agent.protocol import ProtocolAsync
 from skywalking.agent.protocol.interceptors_aio import header_adder_interceptor_async
+from skywalking.client.grpc import channel_compression, channel_options
 from skywalking.client.grpc_aio import GrpcServiceManagementClientAsync, GrpcTraceSegmentReportServiceAsync, \
-    GrpcProfileTaskChannelServiceAsync, GrpcLogReportServiceAsync, GrpcMeterReportServiceAsync
+    GrpcProfileTaskChannelServiceAsync, GrpcLogReportServiceAsync, GrpcMeterReportServiceAsync, \
+    GrpcConfigurationDiscoveryServiceAsync
 from skywalking.loggings import logger, logger_debug_enabled
 from skywalking.profile.profile_task import ProfileTask
 from skywalking.profile.snapshot import TracingThreadSnapshot
@@ -56,22 +58,29 @@ class GrpcProtocolAsync(ProtocolAsync):
 
         if config.agent_force_tls:
             self.channel = grpc.aio.secure_channel(config.agent_collector_backend_services,
-                                                   grpc.ssl_channel_credentials(), interceptors=interceptors)
+                                                   grpc.ssl_channel_credentials(), options=channel_options(),
+                                                   compression=channel_compression(), interceptors=interceptors)
         else:
-            self.channel = grpc.aio.insecure_channel(config.agent_collector_backend_services,
-                                                     interceptors=interceptors)
+            self.channel = grpc.aio.insecure_channel(config.agent_collector_backend_services, options=channel_options(),
+                                                     compression=channel_compression(), interceptors=interceptors)
 
         self.service_management = GrpcServiceManagementClientAsync(self.channel)
         self.traces_reporter = GrpcTraceSegmentReportServiceAsync(self.channel)
         self.log_reporter = GrpcLogReportServiceAsync(self.channel)
         self.meter_reporter = GrpcMeterReportServiceAsync(self.channel)
         self.profile_channel = GrpcProfileTaskChannelServiceAsync(self.channel)
+        self.configuration_discovery = GrpcConfigurationDiscoveryServiceAsync(self.channel)
 
     async def query_profile_commands(self):
         if logger_debug_enabled:
             logger.debug('query profile commands')
         await self.profile_channel.do_query()
 
+    async def query_configurations(self):
+        if logger_debug_enabled:
+            logger.debug('query configurations')
+        await self.configuration_discovery.do_query()
+
     async def notify_profile_task_finish(self, task: ProfileTask):
         await self.profile_channel.finish(task)
 
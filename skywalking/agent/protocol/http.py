@@ -109,5 +109,8 @@ class HttpProtocol(Protocol):
     def query_profile_commands(self):
         ...
 
+    def query_configurations(self):
+        ...
+
     def notify_profile_task_finish(self, task):
         ...
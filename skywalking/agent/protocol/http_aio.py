@@ -90,5 +90,8 @@ class HttpProtocolAsync(ProtocolAsync):
     async def query_profile_commands(self):
         ...
 
+    async def query_configurations(self):
+        ...
+
     async def notify_profile_task_finish(self, task):
         ...
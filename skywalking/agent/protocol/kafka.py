@@ -22,7 +22,7 @@ from time import time
 from skywalking import config
 from skywalking.agent import Protocol
 from skywalking.client.kafka import KafkaServiceManagementClient, KafkaTraceSegmentReportService, \
-    KafkaLogDataReportService, KafkaMeterDataReportService
+    KafkaLogDataReportService, KafkaMeterDataReportService, create_producer
 from skywalking.loggings import logger, getLogger, logger_debug_enabled
 from skywalking.protocol.common.Common_pb2 import KeyStringValuePair
 from skywalking.protocol.language_agent.Tracing_pb2 import SegmentObject, SpanObject, Log, SegmentReference
@@ -37,10 +37,12 @@ logger_kafka.setLevel(max(logging.WARN, logger.level))
 
 class KafkaProtocol(Protocol):
     def __init__(self):
-        self.service_management = KafkaServiceManagementClient()
-        self.traces_reporter = KafkaTraceSegmentReportService()
-        self.log_reporter = KafkaLogDataReportService()
-        self.meter_reporter = KafkaMeterDataReportService()
+        # a new protocol is created in every (forked) process, so is the producer shared by its reporters
+        self.producer = create_producer()
+        self.service_management = KafkaServiceManagementClient(self.producer)
+        self.traces_reporter = KafkaTraceSegmentReportService(self.producer)
+        self.log_reporter = KafkaLogDataReportService(self.producer)
+        self.meter_reporter = KafkaMeterDataReportService(self.producer)
 
     def heartbeat(self):
         self.service_management.send_heart_beat()
@@ -170,5 +172,8 @@ class KafkaProtocol(Protocol):
     def query_profile_commands(self):
         ...
 
+    def query_configurations(self):
+        ...
+
     def notify_profile_task_finish(self, task):
         ...
@@ -94,11 +94,8 @@ class KafkaProtocolAsync(ProtocolAsync):
                 )
 
                 yield s
-        try:
-            await self.traces_reporter.report(generator())
-        except Exception as e:
-            if logger_debug_enabled:
-                logger.debug('reporting segment failed: %s', e)
+        # delivery failures propagate to the reporter's backoff
+        await self.traces_reporter.report(generator())
 
     async def report_log(self, queue: Queue):
         async def generator():
@@ -112,11 +109,7 @@ class KafkaProtocolAsync(ProtocolAsync):
                     logger.debug('Reporting Log %s', log_data.timestamp)
 
                 yield log_data
-        try:
-            await self.log_reporter.report(generator=generator())
-        except Exception as e:
-            if logger_debug_enabled:
-                logger.debug('reporting log failed: %s', e)
+        await self.log_reporter.report(generator=generator())
 
     async def report_meter(self, queue: Queue):
         async def generator():
@@ -130,11 +123,17 @@ class KafkaProtocolAsync(ProtocolAsync):
                     logger.debug('Reporting Meter %s', meter_data.timestamp)
 
                 yield meter_data
-        try:
-            await self.meter_reporter.report(generator=generator())
-        except Exception as e:
-            if logger_debug_enabled:
-                logger.debug('reporting meter failed: %s', e)
+        await self.meter_reporter.report(generator=generator())
+
+    async def stop(self):
+        """
+        Wait for the records still in flight, the failures of their delivery are logged.
+        """
+        for reporter in (self.traces_reporter, self.log_reporter, self.meter_reporter):
+            try:
+                await reporter.window.drain()
+            except Exception as e:  # noqa
+                logger.warning('failed to deliver the last records to topic %s: %s', reporter.topic, e)
 
     # TODO: implement profiling for kafka
     async def report_snapshot(self, queue: Queue):
@@ -143,5 +142,8 @@ class KafkaProtocolAsync(ProtocolAsync):
     async def query_profile_commands(self):
         ...
 
+    async def query_configurations(self):
+        ...
+
     async def notify_profile_task_finish(self, task):
         ...
@@ -0,0 +1,295 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import itertools
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+from collections import deque
+from enum import IntEnum
+from typing import Deque, List, Tuple
+
+from skywalking import config
+from skywalking.loggings import logger, logger_debug_enabled
+
+
+class SpoolKind(IntEnum):
+    SEGMENT = 1
+    LOG = 2
+    METER = 3
+
+
+# magic, capacity, head, tail, crc32 of (capacity, head, tail)
+_HEADER = struct.Struct('<4sQQQI')
+_HEADER_BODY = struct.Struct('<QQQ')
+# payload length, kind, crc32 of payload
+_RECORD = struct.Struct('<IBI')
+_MAGIC = b'SWSP'
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name == 'nt':  # os.kill would terminate it, the spool files of other processes are left alone
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # owned by another user
+        return True
+    return True
+
+
+class Spool:
+    """
+    A size-capped ring of serialized telemetry records backed by a memory-mapped file.
+
+    Records are length-prefixed and checksummed, ``head`` and ``tail`` are monotonically increasing logical
+    byte offsets kept in the file header. A record becomes visible only after its bytes are fully written and
+    the header is updated, so a process crashing in between leaves at most an invisible partial record behind.
+    When the ring is full the oldest records are overwritten.
+    """
+
+    def __init__(self, path: str, capacity: int):
+        if capacity <= _RECORD.size:
+            raise ValueError(f'spool capacity {capacity} is too small')
+
+        self.path = path
+        self.capacity = capacity
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+        size = _HEADER.size + capacity
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size != size:
+                os.ftruncate(fd, size)
+            self._mm = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+        self._head = self._tail = 0
+        if not self.__restore():
+            self.__write_header()
+
+    @classmethod
+    def for_process(cls) -> 'Spool':
+        """
+        Open the spool file of the current process under `config.agent_spool_dir`, and take over the records left in
+        the spool files of processes of the same service that are gone, e.g. before a crash or a restart.
+        """
+        os.makedirs(config.agent_spool_dir, exist_ok=True)
+        service = re.sub(r'[^\w.-]', '_', config.agent_name)
+        path = os.path.join(config.agent_spool_dir, f'{service}-{os.getpid()}.spool')
+        spool = cls(path, config.agent_spool_max_size)
+        spool.adopt_orphans(service)
+        return spool
+
+    def adopt_orphans(self, service: str) -> int:
+        """
+        Move the records of the spool files named after `service` whose process is dead into this spool, and delete
+        those files. A file is first renamed after the adopting process, so that only one process adopts it, and a
+        process dying while adopting leaves a file the next one adopts again. Returns the number of records adopted.
+        """
+        directory = os.path.dirname(self.path)
+        pattern = re.compile(rf'{re.escape(service)}-(\d+)\.spool(?:\.(\d+))?')
+        adopted = 0
+        for name in sorted(os.listdir(directory)):
+            match = pattern.fullmatch(name)
+            path = os.path.join(directory, name)
+            if match is None or path == self.path or _pid_alive(int(match.group(2) or match.group(1))):
+                continue
+
+            claimed = os.path.join(directory, f'{service}-{match.group(1)}.spool.{os.getpid()}')
+            try:
+                os.rename(path, claimed)
+                capacity = os.path.getsize(claimed) - _HEADER.size
+            except OSError:  # adopted by another process meanwhile
+                continue
+
+            if capacity > _RECORD.size:
+                orphan = Spool(claimed, capacity)
+                while not orphan.empty():
+                    records, offset = orphan.peek(config.agent_spool_replay_batch_size)
+                    for kind, payload in records:
+                        self.append(kind, payload)
+                    adopted += len(records)
+                    orphan.commit(offset)
+                orphan.close()
+            os.remove(claimed)
+
+        if adopted:
+            logger.info('adopted %d records left in the spool files of %s by dead processes', adopted, service)
+        return adopted
+
+    def __len__(self):
+        return self._head - self._tail
+
+    def empty(self) -> bool:
+        return self._head == self._tail
+
+    def append(self, kind: SpoolKind, payload: bytes) -> bool:
+        """
+        Append one serialized record, overwriting the oldest records if there is not enough room.
+        Returns False if the record can never fit into the spool.
+        """
+        need = _RECORD.size + len(payload)
+        if need > self.capacity:
+            logger.warning('record of %d bytes exceeds the spool capacity, it will be abandoned', len(payload))
+            return False
+
+        with self._lock:
+            while self.capacity - (self._head - self._tail) < need:
+                length, _, _ = _RECORD.unpack(self.__read(self._tail, _RECORD.size))
+                self._tail += _RECORD.size + length
+                self.dropped += 1
+
+            self.__write(self._head, _RECORD.pack(len(payload), kind, zlib.crc32(payload)))
+            self.__write(self._head + _RECORD.size, payload)
+            self._head += need
+            self.__write_header()
+
+        return True
+
+    def peek(self, max_records: int) -> Tuple[List[Tuple[SpoolKind, bytes]], int]:
+        """
+        Copy up to `max_records` of the oldest records without removing them.
+        Returns the records and the offset to pass to `commit` once they are delivered.
+        """
+        records = []
+        with self._lock:
+            offset = self._tail
+            while offset < self._head and len(records) < max_records:
+                length, kind, _ = _RECORD.unpack(self.__read(offset, _RECORD.size))
+                records.append((SpoolKind(kind), self.__read(offset + _RECORD.size, length)))
+                offset += _RECORD.size + length
+
+        return records, offset
+
+    def commit(self, offset: int) -> None:
+        """
+        Remove all records before `offset`, records already overwritten in the meantime are skipped.
+        """
+        with self._lock:
+            if offset > self._tail:
+                self._tail = min(offset, self._head)
+                self.__write_header()
+
+    def close(self) -> None:
+        with self._lock:
+            self._mm.flush()
+            self._mm.close()
+
+    def __read(self, offset: int, length: int) -> bytes:
+        pos = offset % self.capacity
+        first = min(length, self.capacity - pos)
+        start = _HEADER.size + pos
+        data = self._mm[start:start + first]
+        if first < length:
+            data += self._mm[_HEADER.size:_HEADER.size + length - first]
+        return data
+
+    def __write(self, offset: int, data: bytes) -> None:
+        pos = offset % self.capacity
+        first = min(len(data), self.capacity - pos)
+        start = _HEADER.size + pos
+        self._mm[start:start + first] = data[:first]
+        if first < len(data):
+            self._mm[_HEADER.size:_HEADER.size + len(data) - first] = data[first:]
+
+    def __write_header(self) -> None:
+        body = _HEADER_BODY.pack(self.capacity, self._head, self._tail)
+        self._mm[:_HEADER.size] = _HEADER.pack(_MAGIC, self.capacity, self._head, self._tail, zlib.crc32(body))
+
+    def __restore(self) -> bool:
+        """
+        Recover head and tail left by a previous process, truncating at the first corrupted record.
+        """
+        magic, capacity, head, tail, crc = _HEADER.unpack(self._mm[:_HEADER.size])
+        if magic != _MAGIC or capacity != self.capacity or \
+                crc != zlib.crc32(_HEADER_BODY.pack(capacity, head, tail)) or not 0 <= head - tail <= capacity:
+            return False
+
+        self._head = self._tail = tail
+        count = 0
+        while self._head < head:
+            if head - self._head < _RECORD.size:
+                break
+            length, kind, checksum = _RECORD.unpack(self.__read(self._head, _RECORD.size))
+            end = self._head + _RECORD.size + length
+            if end > head or kind not in SpoolKind._value2member_map_ or \
+                    zlib.crc32(self.__read(self._head + _RECORD.size, length)) != checksum:
+                logger.warning('corrupted record found in spool %s, discarding the rest of it', self.path)
+                break
+            self._head = end
+            count += 1
+
+        if self._head != head:
+            self.__write_header()
+        if logger_debug_enabled:
+            logger.debug('restored %d records from spool %s', count, self.path)
+        return True
+
+
+class ReplayBuffer:
+    """
+    An in-memory, byte-capped buffer of serialized records, with the `append`, `peek` and `commit` of `Spool`.
+
+    It keeps what a failed gRPC stream already pulled from the reporter queues when the spool is not active, so
+    that the records are retried as they are, without being encoded again. The oldest records are dropped when the
+    buffer is full, and everything is lost when the process exits.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.size = 0
+        self.dropped = 0
+        self._records: Deque[Tuple[SpoolKind, bytes]] = deque()
+        self._tail = 0  # logical index of the oldest record, like the offsets of the spool
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._records)
+
+    def empty(self) -> bool:
+        return not self._records
+
+    def append(self, kind: SpoolKind, payload: bytes) -> bool:
+        if len(payload) > self.capacity:
+            return False
+
+        with self._lock:
+            while self.size + len(payload) > self.capacity:
+                self.size -= len(self._records.popleft()[1])
+                self._tail += 1
+                self.dropped += 1
+            self._records.append((kind, payload))
+            self.size += len(payload)
+        return True
+
+    def peek(self, max_records: int) -> Tuple[List[Tuple[SpoolKind, bytes]], int]:
+        with self._lock:
+            records = list(itertools.islice(self._records, max_records))
+            return records, self._tail + len(records)
+
+    def commit(self, offset: int) -> None:
+        with self._lock:
+            while self._tail < offset and self._records:
+                self.size -= len(self._records.popleft()[1])
+                self._tail += 1
@@ -0,0 +1,74 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from queue import Queue
+from threading import Condition
+from time import monotonic
+
+from skywalking import config
+
+
+class ReporterQueue(Queue):
+    """
+    A queue whose reporter sleeps until there is a batch to report instead of polling it: the reporter is woken up
+    once the queue holds `agent_reporter_flush_batch_size` items, or once the oldest item has waited for
+    `agent_reporter_flush_interval_ms`. The signal is raised in `_put`, under the mutex `put` already holds.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        super().__init__(maxsize)
+        self.batch_size = max(1, config.agent_reporter_flush_batch_size)
+        self.flush_interval = config.agent_reporter_flush_interval_ms / 1000
+        self.batch_ready = Condition(self.mutex)
+        self.oldest = 0.0
+        self.closed = False
+
+    def _put(self, item):
+        super()._put(item)
+        size = len(self.queue)
+        if size == 1:  # the reporter starts waiting for the flush deadline
+            self.oldest = monotonic()
+            self.batch_ready.notify()
+        elif size == self.batch_size:
+            self.batch_ready.notify()
+
+    def wait_batch(self) -> bool:
+        """
+        Block until there is a batch to report, returns False if the queue has been closed in the meantime.
+        """
+        with self.mutex:
+            while not self.closed:
+                size = self._qsize()
+                if size >= self.batch_size:
+                    return True
+                if not size:
+                    self.batch_ready.wait()
+                    continue
+                remaining = self.oldest + self.flush_interval - monotonic()
+                if remaining <= 0:
+                    return True
+                self.batch_ready.wait(remaining)
+            return False
+
+    def close(self) -> None:
+        """
+        Wake up and release the reporter waiting for a batch, as the agent is shutting down.
+        """
+        with self.mutex:
+            self.closed = True
+            self.batch_ready.notify_all()
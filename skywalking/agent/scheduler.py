@@ -0,0 +1,76 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import heapq
+import itertools
+from threading import Condition, Thread
+from time import monotonic
+from typing import Callable, List, Optional, Tuple
+
+from skywalking.loggings import logger
+
+Job = Callable[[], Optional[float]]
+
+
+class Scheduler(Thread):
+    """
+    Runs the periodic and delayed jobs of the agent on a single thread, in the order of their due time kept in a heap.
+    A job returns the delay in seconds until it should run again, or None to run only once. Jobs run one at a time,
+    so a slow job delays the others, but never the application threads.
+    """
+
+    def __init__(self):
+        super().__init__(name='SkyWalkingScheduler', daemon=True)
+        self._jobs: List[Tuple[float, int, Job]] = []
+        self._sequence = itertools.count()  # keeps jobs due at the same time in the order they were scheduled
+        self._cond = Condition()
+        self._stopped = False
+
+    def schedule(self, delay: float, job: Job) -> None:
+        with self._cond:
+            heapq.heappush(self._jobs, (monotonic() + max(0.0, delay), next(self._sequence), job))
+            if self._jobs[0][2] is job:  # due before the job the scheduler is waiting for
+                self._cond.notify()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+
+    def run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    if not self._jobs:
+                        self._cond.wait()
+                        continue
+                    remaining = self._jobs[0][0] - monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._stopped:
+                    return
+                _, _, job = heapq.heappop(self._jobs)
+
+            try:
+                delay = job()
+            except Exception:  # noqa
+                logger.exception('Exception in scheduled job %s', getattr(job, '__name__', job))
+                delay = None
+            if delay is not None:
+                self.schedule(delay, job)
@@ -136,6 +136,12 @@ class ProfileTaskChannelService(Service):
         raise NotImplementedError()
 
 
+class ConfigurationDiscoveryService(ABC):
+    @abstractmethod
+    def do_query(self):
+        raise NotImplementedError()
+
+
 # Asyncio Implementation
 class ServiceManagementClientAsync(ABC):
     """
@@ -245,3 +251,9 @@ class ProfileTaskChannelServiceAsync(ServiceAsync):
     @abstractmethod
     async def report(self, generator):
         raise NotImplementedError()
+
+
+class ConfigurationDiscoveryServiceAsync(ABC):
+    @abstractmethod
+    async def do_query(self):
+        raise NotImplementedError()
@@ -15,15 +15,20 @@
 # limitations under the License.
 #
 
+from typing import List, Tuple
+
 import grpc
 
-from skywalking import config
+from skywalking import config, dynamic_config
 from skywalking.client import ServiceManagementClient, TraceSegmentReportService, ProfileTaskChannelService, \
-    LogDataReportService, MeterReportService
+    LogDataReportService, MeterReportService, ConfigurationDiscoveryService
 from skywalking.command import command_service
 from skywalking.loggings import logger, logger_debug_enabled
 from skywalking.profile import profile_task_execution_service
 from skywalking.profile.profile_task import ProfileTask
+from skywalking.protocol.common.Command_pb2 import Commands
+from skywalking.protocol.language_agent.ConfigurationDiscoveryService_pb2 import ConfigurationSyncRequest
+from skywalking.protocol.language_agent.ConfigurationDiscoveryService_pb2_grpc import ConfigurationDiscoveryServiceStub
 from skywalking.protocol.language_agent.Tracing_pb2_grpc import TraceSegmentReportServiceStub
 from skywalking.protocol.logging.Logging_pb2_grpc import LogReportServiceStub
 from skywalking.protocol.management.Management_pb2 import InstancePingPkg, InstanceProperties
@@ -33,6 +38,38 @@ from skywalking.protocol.profile.Profile_pb2 import ProfileTaskCommandQuery, Pro
 from skywalking.protocol.profile.Profile_pb2_grpc import ProfileTaskStub
 
 
+_compressions = {
+    'gzip': grpc.Compression.Gzip,
+    'deflate': grpc.Compression.Deflate,
+}
+
+
+def channel_compression() -> grpc.Compression:
+    """
+    The compression of the channels to the OAP, shared by the sync and the asyncio protocols.
+    """
+    return _compressions.get(config.agent_grpc_compression, grpc.Compression.NoCompression)
+
+
+def channel_options() -> List[Tuple[str, int]]:
+    """
+    The options of the channels to the OAP, only the ones configured are set so gRPC defaults apply otherwise.
+    """
+    options = []
+    if config.agent_grpc_keepalive_time_ms > 0:
+        options.append(('grpc.keepalive_time_ms', config.agent_grpc_keepalive_time_ms))
+        options.append(('grpc.keepalive_timeout_ms', config.agent_grpc_keepalive_timeout_ms))
+        # reporter streams may stay idle on a quiet service, keep probing the connection anyway
+        options.append(('grpc.keepalive_permit_without_calls', 1))
+    if config.agent_grpc_idle_timeout_ms > 0:
+        options.append(('grpc.client_idle_timeout_ms', config.agent_grpc_idle_timeout_ms))
+    if config.agent_grpc_max_send_message_length > 0:
+        options.append(('grpc.max_send_message_length', config.agent_grpc_max_send_message_length))
+    if config.agent_grpc_max_receive_message_length > 0:
+        options.append(('grpc.max_receive_message_length', config.agent_grpc_max_receive_message_length))
+    return options
+
+
 class GrpcServiceManagementClient(ServiceManagementClient):
     def __init__(self, channel: grpc.Channel):
         super().__init__()
@@ -62,17 +99,30 @@ class GrpcServiceManagementClient(ServiceManagementClient):
             )
 
 
+def serialized_collect_stub(channel: grpc.Channel, service: str):
+    """
+    A client-streaming `collect` stub that sends already serialized messages as they are.
+    """
+    return channel.stream_unary(f'/skywalking.v3.{service}/collect', request_serializer=None,
+                                response_deserializer=Commands.FromString)
+
+
 class GrpcTraceSegmentReportService(TraceSegmentReportService):
     def __init__(self, channel: grpc.Channel):
         self.report_stub = TraceSegmentReportServiceStub(channel)
+        self.serialized_collect = serialized_collect_stub(channel, 'TraceSegmentReportService')
 
     def report(self, generator):
         self.report_stub.collect(generator)
 
+    def report_serialized(self, generator):
+        self.serialized_collect(generator)
+
 
 class GrpcMeterReportService(MeterReportService):
     def __init__(self, channel: grpc.Channel):
         self.report_stub = MeterReportServiceStub(channel)
+        self.serialized_collect = serialized_collect_stub(channel, 'MeterReportService')
 
     def report_batch(self, generator):
         self.report_stub.collectBatch(generator)
@@ -80,14 +130,21 @@ class GrpcMeterReportService(MeterReportService):
     def report(self, generator):
         self.report_stub.collect(generator)
 
+    def report_serialized(self, generator):
+        self.serialized_collect(generator)
+
 
 class GrpcLogDataReportService(LogDataReportService):
     def __init__(self, channel: grpc.Channel):
         self.report_stub = LogReportServiceStub(channel)
+        self.serialized_collect = serialized_collect_stub(channel, 'LogReportService')
 
     def report(self, generator):
         self.report_stub.collect(generator)
 
+    def report_serialized(self, generator):
+        self.serialized_collect(generator)
+
 
 class GrpcProfileTaskChannelService(ProfileTaskChannelService):
     def __init__(self, channel: grpc.Channel):
@@ -113,3 +170,14 @@ class GrpcProfileTaskChannelService(ProfileTaskChannelService):
             taskId=task.task_id
         )
         self.profile_stub.reportTaskFinish(finish_report)
+
+
+class GrpcConfigurationDiscoveryService(ConfigurationDiscoveryService):
+    def __init__(self, channel: grpc.Channel):
+        self.configuration_stub = ConfigurationDiscoveryServiceStub(channel)
+
+    def do_query(self):
+        request = ConfigurationSyncRequest(service=config.agent_name, uuid=dynamic_config.uuid)
+
+        commands = self.configuration_stub.fetchConfigurations(request)
+        command_service.receive_command(commands)
@@ -17,13 +17,16 @@
 
 import grpc
 
-from skywalking import config
+from skywalking import config, dynamic_config
 from skywalking.client import ServiceManagementClientAsync, TraceSegmentReportServiceAsync, \
-    ProfileTaskChannelServiceAsync, LogDataReportServiceAsync, MeterReportServiceAsync
+    ProfileTaskChannelServiceAsync, LogDataReportServiceAsync, MeterReportServiceAsync, \
+    ConfigurationDiscoveryServiceAsync
 from skywalking.command import command_service_async
 from skywalking.loggings import logger, logger_debug_enabled
 from skywalking.profile import profile_task_execution_service
 from skywalking.profile.profile_task import ProfileTask
+from skywalking.protocol.language_agent.ConfigurationDiscoveryService_pb2 import ConfigurationSyncRequest
+from skywalking.protocol.language_agent.ConfigurationDiscoveryService_pb2_grpc import ConfigurationDiscoveryServiceStub
 from skywalking.protocol.language_agent.Tracing_pb2_grpc import TraceSegmentReportServiceStub
 from skywalking.protocol.logging.Logging_pb2_grpc import LogReportServiceStub
 from skywalking.protocol.management.Management_pb2 import InstancePingPkg, InstanceProperties
@@ -116,3 +119,14 @@ class GrpcProfileTaskChannelServiceAsync(ProfileTaskChannelServiceAsync):
             taskId=task.task_id
         )
         await self.profile_stub.reportTaskFinish(finish_report)
+
+
+class GrpcConfigurationDiscoveryServiceAsync(ConfigurationDiscoveryServiceAsync):
+    def __init__(self, channel: grpc.aio.Channel):
+        self.configuration_stub = ConfigurationDiscoveryServiceStub(channel)
+
+    async def do_query(self):
+        request = ConfigurationSyncRequest(service=config.agent_name, uuid=dynamic_config.uuid)
+
+        commands = await self.configuration_stub.fetchConfigurations(request)
+        command_service_async.receive_command(commands)  # put_nowait() not need to be awaited
@@ -51,18 +51,32 @@ def __init_kafka_configs():
         else:
             raise KafkaConfigDuplicated(key)
 
+    # batching defaults tuned for telemetry, explicit SW_KAFKA_REPORTER_CONFIG_* values take precedence
+    kafka_configs.setdefault('linger_ms', config.kafka_reporter_linger_ms)
+    kafka_configs.setdefault('batch_size', config.kafka_reporter_batch_size)
+    if config.kafka_reporter_compression_type:
+        kafka_configs.setdefault('compression_type', config.kafka_reporter_compression_type)
+
 
 __init_kafka_configs()
 
 
+def create_producer() -> KafkaProducer:
+    """
+    Create the KafkaProducer shared by all the reporters of the current process,
+    one producer batches records across topics with a single sender thread and connection pool.
+    """
+    if logger_debug_enabled:
+        logger.debug('kafka reporter configs: %s', kafka_configs)
+    return KafkaProducer(**kafka_configs)
+
+
 class KafkaServiceManagementClient(ServiceManagementClient):
-    def __init__(self):
+    def __init__(self, producer: KafkaProducer):
         super().__init__()
         self.instance_properties = self.get_instance_properties_proto()
 
-        if logger_debug_enabled:
-            logger.debug('kafka reporter configs: %s', kafka_configs)
-        self.producer = KafkaProducer(**kafka_configs)
+        self.producer = producer
         self.topic_key_register = 'register-'
         self.topic = config.kafka_topic_management
 
@@ -96,15 +110,24 @@ class KafkaServiceManagementClient(ServiceManagementClient):
 
         key = bytes(instance_ping_pkg.serviceInstance, encoding='utf-8')
         value = instance_ping_pkg.SerializeToString()
+        # never block the heartbeat thread on the broker, the outcome is logged once the record is acknowledged
         future = self.producer.send(topic=self.topic, key=key, value=value)
-        res = future.get(timeout=10)
+        future.add_callback(self.__on_heartbeat_sent)
+        future.add_errback(self.__on_heartbeat_failed)
+
+    @staticmethod
+    def __on_heartbeat_sent(metadata):
         if logger_debug_enabled:
-            logger.debug('heartbeat response: %s', res)
+            logger.debug('heartbeat response: %s', metadata)
+
+    @staticmethod
+    def __on_heartbeat_failed(exc):
+        logger.warning('failed to send heartbeat to kafka: %s', exc)
 
 
 class KafkaTraceSegmentReportService(TraceSegmentReportService):
-    def __init__(self):
-        self.producer = KafkaProducer(**kafka_configs)
+    def __init__(self, producer: KafkaProducer):
+        self.producer = producer
         self.topic = config.kafka_topic_segment
 
     def report(self, generator):
@@ -115,8 +138,8 @@ class KafkaTraceSegmentReportService(TraceSegmentReportService):
 
 
 class KafkaLogDataReportService(LogDataReportService):
-    def __init__(self):
-        self.producer = KafkaProducer(**kafka_configs)
+    def __init__(self, producer: KafkaProducer):
+        self.producer = producer
         self.topic = config.kafka_topic_log
 
     def report(self, generator):
@@ -127,8 +150,8 @@ class KafkaLogDataReportService(LogDataReportService):
 
 
 class KafkaMeterDataReportService(MeterReportService):
-    def __init__(self):
-        self.producer = KafkaProducer(**kafka_configs)
+    def __init__(self, producer: KafkaProducer):
+        self.producer = producer
         self.topic = config.kafka_topic_meter
 
     def report(self, generator):
@@ -18,7 +18,8 @@
 import ast
 import os
 import asyncio
-from asyncio import Event
+from asyncio import Event, Future
+from typing import Optional, Set
 
 from aiokafka import AIOKafkaProducer
 
@@ -55,10 +56,60 @@ def __init_kafka_configs():
         else:
             raise KafkaConfigDuplicated(key)
 
+    # batches are flushed by size or after linger_ms, explicit SW_KAFKA_REPORTER_CONFIG_* values take precedence
+    kafka_configs.setdefault('linger_ms', config.kafka_reporter_linger_ms)
+    kafka_configs.setdefault('max_batch_size', config.kafka_reporter_batch_size)
+    if config.kafka_reporter_compression_type:
+        kafka_configs.setdefault('compression_type', config.kafka_reporter_compression_type)
+
 
 __init_kafka_configs()
 
 
+class DeliveryWindow:
+    """
+    Sends records without waiting for the broker acknowledgement, keeping at most `size` delivery futures in flight.
+    A failed delivery is raised by the next `send` so the reporter backs off, or by `drain` when the agent stops.
+    """
+
+    def __init__(self, producer: AIOKafkaProducer, size: int):
+        self.producer = producer
+        self.size = max(1, size)
+        self.__pending = set()  # type: Set[Future]
+        self.__failure = None  # type: Optional[BaseException]
+
+    def __len__(self):
+        return len(self.__pending)
+
+    async def send(self, topic: str, key: bytes, value: bytes) -> None:
+        self.__raise_failure()
+        while len(self.__pending) >= self.size:
+            await asyncio.wait(self.__pending, return_when=asyncio.FIRST_COMPLETED)
+            self.__raise_failure()
+
+        future = await self.producer.send(topic=topic, key=key, value=value)
+        self.__pending.add(future)
+        future.add_done_callback(self.__on_delivered)
+
+    async def drain(self) -> None:
+        """
+        Wait for all records in flight to be acknowledged.
+        """
+        if self.__pending:
+            await asyncio.wait(self.__pending)
+        self.__raise_failure()
+
+    def __on_delivered(self, future: Future) -> None:
+        self.__pending.discard(future)
+        if not future.cancelled() and future.exception() is not None and self.__failure is None:
+            self.__failure = future.exception()
+
+    def __raise_failure(self) -> None:
+        if self.__failure is not None:
+            failure, self.__failure = self.__failure, None
+            raise failure
+
+
 class KafkaServiceManagementClientAsync(ServiceManagementClientAsync):
     def __init__(self):
         super().__init__()
@@ -124,6 +175,7 @@ class KafkaTraceSegmentReportServiceAsync(TraceSegmentReportServiceAsync):
         # So we use a event to make sure producer is started on demand
         self.__producer_start_event = Event()
         self.topic = config.kafka_topic_segment
+        self.window = DeliveryWindow(self.producer, config.kafka_reporter_max_in_flight)
 
     async def report(self, generator):
         if not self.__producer_start_event.is_set():
@@ -133,7 +185,7 @@ class KafkaTraceSegmentReportServiceAsync(TraceSegmentReportServiceAsync):
         async for segment in generator:
             key = bytes(segment.traceSegmentId, encoding='utf-8')
             value = segment.SerializeToString()
-            await self.producer.send_and_wait(topic=self.topic, key=key, value=value)
+            await self.window.send(topic=self.topic, key=key, value=value)
 
 
 class KafkaLogDataReportServiceAsync(LogDataReportServiceAsync):
@@ -143,6 +195,7 @@ class KafkaLogDataReportServiceAsync(LogDataReportServiceAsync):
         # So we use a event to make sure producer is started on demand
         self.__producer_start_event = Event()
         self.topic = config.kafka_topic_log
+        self.window = DeliveryWindow(self.producer, config.kafka_reporter_max_in_flight)
 
     async def report(self, generator):
         if not self.__producer_start_event.is_set():
@@ -152,7 +205,7 @@ class KafkaLogDataReportServiceAsync(LogDataReportServiceAsync):
         async for log_data in generator:
             key = bytes(log_data.traceContext.traceSegmentId, encoding='utf-8')
             value = log_data.SerializeToString()
-            await self.producer.send_and_wait(topic=self.topic, key=key, value=value)
+            await self.window.send(topic=self.topic, key=key, value=value)
 
 
 class KafkaMeterDataReportServiceAsync(MeterReportServiceAsync):
@@ -162,6 +215,7 @@ class KafkaMeterDataReportServiceAsync(MeterReportServiceAsync):
         # So we use a event to make sure producer is started on demand
         self.__producer_start_event = Event()
         self.topic = config.kafka_topic_meter
+        self.window = DeliveryWindow(self.producer, config.kafka_reporter_max_in_flight)
 
     async def report(self, generator):
         if not self.__producer_start_event.is_set():
@@ -172,7 +226,7 @@ class KafkaMeterDataReportServiceAsync(MeterReportServiceAsync):
         collection.meterData.extend([data async for data in generator])
         key = bytes(config.agent_instance_name, encoding='utf-8')
         value = collection.SerializeToString()
-        await self.producer.send_and_wait(topic=self.topic, key=key, value=value)
+        await self.window.send(topic=self.topic, key=key, value=value)
 
 
 class KafkaConfigDuplicated(Exception):
@@ -22,7 +22,10 @@ from collections import deque
 from skywalking.protocol.common.Command_pb2 import Commands, Command
 
 from skywalking.command.base_command import BaseCommand
+from skywalking.command.configuration_discovery_command import ConfigurationDiscoveryCommand
 from skywalking.command.executors import noop_command_executor_instance
+from skywalking.command.executors.configuration_discovery_command_executor import \
+    ConfigurationDiscoveryCommandExecutor
 from skywalking.command.executors.profile_task_command_executor import ProfileTaskCommandExecutor
 from skywalking.command.profile_task_command import ProfileTaskCommand
 from skywalking.loggings import logger
@@ -37,8 +40,11 @@ class CommandService:
 
     def dispatch(self):
         while True:
-            # block until a command is available
-            command = self._commands.get()  # type: BaseCommand
+            # execute the received commands, the agent calls this after each query to the backend
+            try:
+                command = self._commands.get(block=False)  # type: BaseCommand
+            except queue.Empty:
+                return
             if not self.__is_command_executed(command):
                 command_executor_service.execute(command)
                 self._command_serial_number_cache.add(command.serial_number)
@@ -128,7 +134,8 @@ class CommandExecutorService:
     """
 
     def __init__(self):
-        self.__command_executor_map = {ProfileTaskCommand.NAME: ProfileTaskCommandExecutor()}
+        self.__command_executor_map = {ProfileTaskCommand.NAME: ProfileTaskCommandExecutor(),
+                                       ConfigurationDiscoveryCommand.NAME: ConfigurationDiscoveryCommandExecutor()}
 
     def execute(self, command: BaseCommand):
         self.__executor_for_command(command).execute(command)
@@ -148,6 +155,8 @@ class CommandDeserializer:
 
         if ProfileTaskCommand.NAME == command_name:
             return ProfileTaskCommand.deserialize(command)
+        elif ConfigurationDiscoveryCommand.NAME == command_name:
+            return ConfigurationDiscoveryCommand.deserialize(command)
         else:
             raise UnsupportedCommandException(command)
 
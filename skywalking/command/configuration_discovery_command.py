@@ -0,0 +1,55 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from typing import Dict
+
+from skywalking.protocol.common.Command_pb2 import Command
+
+from skywalking.command.base_command import BaseCommand
+from skywalking.utils.lang import tostring
+
+
+@tostring
+class ConfigurationDiscoveryCommand(BaseCommand):
+    NAME = 'ConfigurationDiscoveryCommand'
+
+    def __init__(self,
+                 serial_number: str = '',
+                 uuid: str = '',
+                 config: Dict[str, str] = None):
+
+        BaseCommand.__init__(self, self.NAME, serial_number)
+
+        self.uuid = uuid  # type: str
+        self.config = config or {}  # type: Dict[str, str]
+
+    @staticmethod
+    def deserialize(command: Command):
+        serial_number = None
+        uuid = None
+        config = {}
+
+        for pair in command.args:
+            if pair.key == 'SerialNumber':
+                serial_number = pair.value
+            elif pair.key == 'UUID':
+                uuid = pair.value
+            else:
+                config[pair.key] = pair.value
+
+        return ConfigurationDiscoveryCommand(serial_number=serial_number, uuid=uuid, config=config)
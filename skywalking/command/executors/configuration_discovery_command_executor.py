@@ -15,18 +15,14 @@
 # limitations under the License.
 #
 
-import psutil
-from skywalking.meter.pvm.data_source import DataSource
 
+from skywalking import dynamic_config
+from skywalking.command.configuration_discovery_command import ConfigurationDiscoveryCommand
+from skywalking.command.executors.command_executor import CommandExecutor
 
-class CPUUsageDataSource(DataSource):
-    def __init__(self):
-        self.cur_process = psutil.Process()
 
-    def total_cpu_utilization_generator(self):
-        while (True):
-            yield psutil.cpu_percent()
+class ConfigurationDiscoveryCommandExecutor(CommandExecutor):
 
-    def process_cpu_utilization_generator(self):
-        while (True):
-            yield self.cur_process.cpu_percent()
+    def execute(self, command: ConfigurationDiscoveryCommand):
+        dynamic_config.apply(command.config, dynamic_config.OAP)
+        dynamic_config.uuid = command.uuid
@@ -31,6 +31,7 @@ any documentation to reflect changes here, just make sure to run `make doc-gen`
 
 import os
 import re
+import tempfile
 import uuid
 import warnings
 from typing import List, Pattern
@@ -74,6 +75,19 @@ kafka_topic_meter: str = os.getenv('SW_KAFKA_TOPIC_METER', 'skywalking-meters')
 # [here](https://kafka-python.readthedocs.io/en/master/apidoc/KafkaProducer.html#kafka.KafkaProducer)
 # This config only works from env variables, each one should be passed in `SW_KAFKA_REPORTER_CONFIG_<KEY_NAME>`
 kafka_reporter_custom_configurations: str = os.getenv('SW_KAFKA_REPORTER_CUSTOM_CONFIGURATIONS', '')
+# The time in milliseconds the Kafka producer waits for more records before sending a batch, higher values trade
+# reporting latency for fewer and larger requests. Overridden by `SW_KAFKA_REPORTER_CONFIG_linger_ms` if set
+kafka_reporter_linger_ms: int = int(os.getenv('SW_KAFKA_REPORTER_LINGER_MS', '100'))
+# The maximum size in bytes of a record batch of the Kafka producer. Overridden by
+# `SW_KAFKA_REPORTER_CONFIG_batch_size` if set
+kafka_reporter_batch_size: int = int(os.getenv('SW_KAFKA_REPORTER_BATCH_SIZE', '65536'))
+# The compression type of the Kafka producer, one of `gzip`, `snappy`, `lz4`, `zstd`, or empty to disable
+# compression, codecs other than `gzip` require extra packages. Overridden by
+# `SW_KAFKA_REPORTER_CONFIG_compression_type` if set
+kafka_reporter_compression_type: str = os.getenv('SW_KAFKA_REPORTER_COMPRESSION_TYPE', 'gzip')
+# The maximum number of records the asyncio Kafka reporters keep in flight without a broker acknowledgement,
+# sending is paused only when the window is full
+kafka_reporter_max_in_flight: int = int(os.getenv('SW_KAFKA_REPORTER_MAX_IN_FLIGHT', '1024'))
 # Use TLS for communication with SkyWalking OAP (no cert required)
 agent_force_tls: bool = os.getenv('SW_AGENT_FORCE_TLS', '').lower() == 'true'
 # The authentication token to verify that the agent is trusted by the backend OAP, as for how to configure the
@@ -101,6 +115,19 @@ agent_experimental_fork_support: bool = os.getenv('SW_AGENT_EXPERIMENTAL_FORK_SU
 # DANGEROUS - This option controls the interval of each bulk report from telemetry data queues
 # Do not modify unless you have evaluated its impact given your service load.
 agent_queue_timeout: int = int(os.getenv('SW_AGENT_QUEUE_TIMEOUT', '1'))
+# The segment and log reporters sleep until this many items are queued, or until the oldest queued item has waited
+# for `agent_reporter_flush_interval_ms`, whichever comes first
+agent_reporter_flush_batch_size: int = int(os.getenv('SW_AGENT_REPORTER_FLUSH_BATCH_SIZE', '100'))
+# The longest time in milliseconds a segment or log waits in the queue before its reporter is woken up to send it
+agent_reporter_flush_interval_ms: int = int(os.getenv('SW_AGENT_REPORTER_FLUSH_INTERVAL_MS', '20'))
+# Keep one client-streaming gRPC `collect` call open per data type and feed it from the queue, instead of opening
+# a new call every `agent_queue_timeout` seconds. Only works with the `grpc` protocol.
+agent_grpc_streaming_session: bool = os.getenv('SW_AGENT_GRPC_STREAMING_SESSION', '').lower() == 'true'
+# A streaming session is closed and a new one opened after it has been open for this many seconds
+agent_grpc_streaming_session_max_age: int = int(os.getenv('SW_AGENT_GRPC_STREAMING_SESSION_MAX_AGE', '60'))
+# A streaming session is closed and a new one opened after it has sent this many messages
+agent_grpc_streaming_session_max_messages: int = int(
+    os.getenv('SW_AGENT_GRPC_STREAMING_SESSION_MAX_MESSAGES', '10000'))
 # Replace the threads to asyncio coroutines to report telemetry data to the OAP.
 # This option is experimental and may not work as expected. Not compatible with pre-forking
 # servers (`sw-python run -p`): the agent refuses to start under a Gunicorn master.
@@ -130,6 +157,25 @@ agent_ignore_suffix: str = os.getenv('SW_AGENT_IGNORE_SUFFIX', '.jpg,.jpeg,.js,.
 correlation_element_max_number: int = int(os.getenv('SW_CORRELATION_ELEMENT_MAX_NUMBER', '3'))
 # Max value length of correlation context element.
 correlation_value_max_length: int = int(os.getenv('SW_CORRELATION_VALUE_MAX_LENGTH', '128'))
+# The maximum number of upstream references a span keeps, e.g. the consumer span of a batch of messages from many
+# traces, the number of references dropped beyond it is tagged as `refs.dropped`
+agent_trace_max_refs_per_span: int = int(os.getenv('SW_AGENT_TRACE_MAX_REFS_PER_SPAN', '100'))
+# If true, a span is encoded in the protobuf wire format as soon as it finishes and the segment keeps only the encoded
+# bytes, which are reported as they are, so the spans of large segments do not stay in memory as objects until the
+# whole segment finishes. Only supported by the gRPC protocol without asyncio enhancement
+agent_trace_encode_spans: bool = os.getenv('SW_AGENT_TRACE_ENCODE_SPANS', '').lower() == 'true'
+# If true, HTTP plugins name the spans of requests not matched to a route template of the framework after their
+# path with the numbers, UUIDs and long hexadecimal ids among the path segments replaced by `{id}`, as does the
+# Elasticsearch plugin with its exit spans. It renames existing endpoints, so it is off by default
+agent_trace_endpoint_normalize: bool = os.getenv('SW_AGENT_TRACE_ENDPOINT_NORMALIZE', '').lower() == 'true'
+# Comma-separated URL path patterns, in the same Ant path style as `agent_trace_ignore_path`, e.g.
+# `/api/users/*/orders,/static/**`, the spans of requests with a path matching a pattern are named after the pattern
+agent_trace_endpoint_patterns: str = os.getenv('SW_AGENT_TRACE_ENDPOINT_PATTERNS', '')
+# The maximum number of distinct endpoint names, HTTP requests to further endpoints are named `{overflow}`,
+# 0 turns off the limit
+agent_trace_endpoint_max: int = int(os.getenv('SW_AGENT_TRACE_ENDPOINT_MAX', '3000'))
+# The number of request paths whose normalized endpoint name is cached
+agent_trace_endpoint_cache_size: int = int(os.getenv('SW_AGENT_TRACE_ENDPOINT_CACHE_SIZE', '10000'))
 
 # BEGIN: Profiling Configurations
 # If `True`, Python agent will enable profiler when user create a new profiling task.
@@ -182,10 +228,73 @@ agent_meter_reporter_period: int = int(os.getenv('SW_AGENT_METER_REPORTER_PERIOD
 # If `True`, Python agent will report collected Python Virtual Machine (PVM) meters to the OAP or Satellite.
 # Otherwise, it disables the feature.
 agent_pvm_meter_reporter_active: bool = os.getenv('SW_AGENT_PVM_METER_REPORTER_ACTIVE', '').lower() != 'false'
+# If `True`, Python agent will also report meters of its own health next to the PVM meters: depth and high-water
+# mark of each reporter queue, data dropped, report batch size, latency and serialization time, and reporter
+# backoff. Not supported with `agent_asyncio_enhancement`.
+agent_self_meter_reporter_active: bool = os.getenv('SW_AGENT_SELF_METER_REPORTER_ACTIVE', '').lower() == 'true'
+# If `True`, the asyncio event loops of the application are probed every `agent_loop_monitor_interval` seconds, the
+# delay of the probe, i.e. how long the loop was kept from running its callbacks, is reported as the histogram meter
+# `instance_pvm_event_loop_lag` in milliseconds. Loops not based on `asyncio.BaseEventLoop`, e.g. uvloop, are only
+# probed if already running when the agent starts, a warning is logged for them
+agent_loop_monitor_active: bool = os.getenv('SW_AGENT_LOOP_MONITOR_ACTIVE', '').lower() == 'true'
+# The interval in seconds between two probes of an event loop
+agent_loop_monitor_interval: float = float(os.getenv('SW_AGENT_LOOP_MONITOR_INTERVAL', '0.1'))
+# When an event loop is blocked for at least this many milliseconds, the stack of the blocking callback is sampled
+# once and logged on its active span, 0 turns off
+agent_loop_monitor_slow_callback_threshold: int = int(
+    os.getenv('SW_AGENT_LOOP_MONITOR_SLOW_CALLBACK_THRESHOLD', '200'))
+
+# BEGIN: Spool Configurations
+# If `True`, segments, logs and meters that cannot be delivered to the OAP are serialized into a size-capped,
+# memory-mapped ring file and replayed once the connection recovers. Only works with the `grpc` protocol.
+agent_spool_active: bool = os.getenv('SW_AGENT_SPOOL_ACTIVE', '').lower() == 'true'
+# The directory to keep spool files, each agent process owns one file named by the service name and process id,
+# the records left by dead processes of the same service are replayed by the next process that starts
+agent_spool_dir: str = os.getenv('SW_AGENT_SPOOL_DIR', os.path.join(tempfile.gettempdir(), 'skywalking-spool'))
+# The maximum size in bytes of the spool file of each process, the oldest records are overwritten when it is full
+agent_spool_max_size: int = int(os.getenv('SW_AGENT_SPOOL_MAX_SIZE', '67108864'))
+# The maximum number of spooled (or buffered for a retry) records to replay to the OAP in a single request
+agent_spool_replay_batch_size: int = int(os.getenv('SW_AGENT_SPOOL_REPLAY_BATCH_SIZE', '500'))
+# The maximum size in bytes of the in-memory buffer keeping the segments, logs and meters already pulled by a failed
+# gRPC stream, retried first once the connection recovers, when the spool is not active. 0 disables it
+agent_grpc_replay_buffer_size: int = int(os.getenv('SW_AGENT_GRPC_REPLAY_BUFFER_SIZE', '4194304'))
+
+# BEGIN: Local Collector Configurations
+# The Unix socket of the local collector (`python -m skywalking.agent.collector`), a process reporting to the OAP on
+# behalf of all the agent processes of a host, e.g. the workers of pre-fork servers. When set, agent processes
+# forward their serialized segments, logs, meters and heartbeats to it instead of each connecting to the OAP, and
+# report by themselves while it is not reachable. Only works with the `grpc` protocol.
+agent_local_collector_socket: str = os.getenv('SW_AGENT_LOCAL_COLLECTOR_SOCKET', '')
+# If `True`, the Gunicorn master started by `sw-python run -p` spawns the local collector, unless one is already
+# listening on `agent_local_collector_socket`
+agent_local_collector_spawn: bool = os.getenv('SW_AGENT_LOCAL_COLLECTOR_SPAWN', '').lower() == 'true'
+# The maximum number of records forwarded to the local collector in a single write
+agent_local_collector_batch_size: int = int(os.getenv('SW_AGENT_LOCAL_COLLECTOR_BATCH_SIZE', '100'))
+
+# BEGIN: gRPC Channel Configurations
+# The compression applied to all the requests sent to the OAP over gRPC, `gzip`, `deflate`, or `none` or empty to
+# disable compression. Segments are repetitive and compress to about half their size at a small CPU cost.
+agent_grpc_compression: str = os.getenv('SW_AGENT_GRPC_COMPRESSION', '').lower()
+# The interval in milliseconds between HTTP/2 keepalive pings sent on an open gRPC channel, 0 disables keepalive
+agent_grpc_keepalive_time_ms: int = int(os.getenv('SW_AGENT_GRPC_KEEPALIVE_TIME_MS', '0'))
+# The time in milliseconds to wait for a keepalive ping to be acknowledged before the connection is closed
+agent_grpc_keepalive_timeout_ms: int = int(os.getenv('SW_AGENT_GRPC_KEEPALIVE_TIMEOUT_MS', '20000'))
+# The time in milliseconds a gRPC channel stays connected without any call before it goes idle, 0 uses the
+# gRPC default
+agent_grpc_idle_timeout_ms: int = int(os.getenv('SW_AGENT_GRPC_IDLE_TIMEOUT_MS', '0'))
+# The maximum size in bytes of a message sent to the OAP, larger messages fail instead of being sent, 0 uses the
+# gRPC default (unlimited)
+agent_grpc_max_send_message_length: int = int(os.getenv('SW_AGENT_GRPC_MAX_SEND_MESSAGE_LENGTH', '0'))
+# The maximum size in bytes of a message received from the OAP, 0 uses the gRPC default (4MiB)
+agent_grpc_max_receive_message_length: int = int(os.getenv('SW_AGENT_GRPC_MAX_RECEIVE_MESSAGE_LENGTH', '0'))
 
 # BEGIN: Plugin Related configurations
 # The name patterns in comma-separated pattern, plugins whose name matches one of the pattern won't be installed
 agent_disable_plugins: List[str] = os.getenv('SW_AGENT_DISABLE_PLUGINS', '').split(',')
+# If true, measure the time each plugin spends in the library calls it instruments, excluding the time of the library
+# itself, report it as meters and log a summary at shutdown, to find out which plugins are worth disabling. It adds a
+# small cost to every instrumented call, so it is meant for diagnosis rather than to stay on
+agent_plugin_overhead_active: bool = os.getenv('SW_AGENT_PLUGIN_OVERHEAD_ACTIVE', '').lower() == 'true'
 # When `COLLECT_HTTP_PARAMS` is enabled, how many characters to keep and send to the OAP backend, use negative
 # values to keep and send the complete parameters, NB. this config item is added for the sake of performance.
 plugin_http_http_params_length_threshold: int = int(
@@ -195,6 +304,14 @@ plugin_http_ignore_method: str = os.getenv('SW_PLUGIN_HTTP_IGNORE_METHOD', '').u
 # The maximum length of the collected parameter, parameters longer than the specified length will be truncated,
 # length 0 turns off parameter tracing
 plugin_sql_parameters_max_length: int = int(os.getenv('SW_PLUGIN_SQL_PARAMETERS_MAX_LENGTH', '0'))
+# The maximum length of the collected SQL statements, statements longer than the specified length will be truncated,
+# 0 keeps the complete statements
+plugin_sql_statement_max_length: int = int(os.getenv('SW_PLUGIN_SQL_STATEMENT_MAX_LENGTH', '2048'))
+# If true, the string and number literals of the collected SQL statements are replaced by `?`, so the statements
+# carry no values and the ones differing only in values are collected as the same text
+plugin_sql_statement_fingerprint: bool = os.getenv('SW_PLUGIN_SQL_STATEMENT_FINGERPRINT', '').lower() == 'true'
+# The number of distinct queries whose collected statement is cached, so that repeated queries are not processed again
+plugin_sql_statement_cache_size: int = int(os.getenv('SW_PLUGIN_SQL_STATEMENT_CACHE_SIZE', '1024'))
 # Indicates whether to collect the filters of pymongo
 plugin_pymongo_trace_parameters: bool = os.getenv('SW_PLUGIN_PYMONGO_TRACE_PARAMETERS', '').lower() == 'true'
 # The maximum length of the collected filters, filters longer than the specified length will be truncated
@@ -215,10 +332,57 @@ plugin_bottle_collect_http_params: bool = os.getenv('SW_PLUGIN_BOTTLE_COLLECT_HT
 plugin_celery_parameters_length: int = int(os.getenv('SW_PLUGIN_CELERY_PARAMETERS_LENGTH', '512'))
 # Comma-delimited list of user-defined grpc methods to ignore, like /package.Service/Method1,/package.Service/Method2
 plugin_grpc_ignored_methods: str = os.getenv('SW_PLUGIN_GRPC_IGNORED_METHODS', '').upper()
+# Kafka, Pulsar consumers create one span per batch of messages received at once, referring to the traces of its
+# messages. A batch of at most this many messages gets one span per message instead, 0 turns off
+plugin_mq_consumer_span_per_message_max: int = int(os.getenv('SW_PLUGIN_MQ_CONSUMER_SPAN_PER_MESSAGE_MAX', '0'))
+# If true, `consume()` of confluent-kafka consumers creates one span per batch as other consumers do, following
+# `plugin_mq_consumer_span_per_message_max`, instead of one span per message
+plugin_confluent_kafka_consume_batch_span: bool = \
+    os.getenv('SW_PLUGIN_CONFLUENT_KAFKA_CONSUME_BATCH_SPAN', '').lower() == 'true'
 
 # BEGIN: Sampling Configurations
 # The number of samples to take in every 3 seconds, 0 turns off
 sample_n_per_3_secs: int = int(os.getenv('SW_SAMPLE_N_PER_3_SECS', '0'))
+# The sampler deciding whether a new trace is recorded, one of `n_per_3_secs`, `token_bucket`, `probabilistic`,
+# `endpoint_quota` and `adaptive`. Empty uses `n_per_3_secs` if `sample_n_per_3_secs` is greater than 0 and records all traces
+# otherwise. Traces continued from an upstream service always follow the decision of the upstream service.
+sample_strategy: str = os.getenv('SW_SAMPLE_STRATEGY', '')
+# The number of new traces recorded per second by the `token_bucket` sampler, per endpoint by `endpoint_quota`, and
+# initially by `adaptive`
+sample_rate_per_sec: float = float(os.getenv('SW_SAMPLE_RATE_PER_SEC', '10'))
+# The number of new traces the `token_bucket` and `endpoint_quota` samplers record in a burst, 0 uses the rate
+sample_burst: int = int(os.getenv('SW_SAMPLE_BURST', '0'))
+# The probability of a new trace to be recorded by the `probabilistic` sampler, from 0 to 1
+sample_probability: float = float(os.getenv('SW_SAMPLE_PROBABILITY', '1'))
+# The rates of the `endpoint_quota` sampler for given endpoints, i.e. operation names of the first span, that override
+# `sample_rate_per_sec`, as comma-separated `endpoint:rate` pairs, e.g. `/health:0,/api/orders:50`
+sample_endpoint_quotas: str = os.getenv('SW_SAMPLE_ENDPOINT_QUOTAS', '')
+# The maximum number of endpoints the `endpoint_quota` sampler keeps a quota for, further endpoints share one quota
+sample_endpoint_max: int = int(os.getenv('SW_SAMPLE_ENDPOINT_MAX', '1000'))
+# The share in percent of the process CPU time the `adaptive` sampler lets the agent threads use, the rate of new
+# traces is adjusted to the measured cost per trace to stay within it
+sample_adaptive_overhead_budget: float = float(os.getenv('SW_SAMPLE_ADAPTIVE_OVERHEAD_BUDGET', '2'))
+# The interval in seconds between two adjustments of the `adaptive` sampler rate
+sample_adaptive_period: int = int(os.getenv('SW_SAMPLE_ADAPTIVE_PERIOD', '10'))
+# The lowest number of new traces recorded per second by the `adaptive` sampler
+sample_adaptive_min_rate: float = float(os.getenv('SW_SAMPLE_ADAPTIVE_MIN_RATE', '1'))
+# The highest number of new traces recorded per second by the `adaptive` sampler
+sample_adaptive_max_rate: float = float(os.getenv('SW_SAMPLE_ADAPTIVE_MAX_RATE', '1000'))
+# Record the first span of a trace not sampled on its own if it ends with an error, off by default as the traces left
+# out are then tracked until they end instead of being noop
+sample_record_error_traces: bool = os.getenv('SW_SAMPLE_RECORD_ERROR_TRACES', '').lower() == 'true'
+# Record the first span of a trace not sampled on its own if it lasts at least this many milliseconds, 0 turns off
+sample_record_slow_traces_threshold: int = int(os.getenv('SW_SAMPLE_RECORD_SLOW_TRACES_THRESHOLD', '0'))
+
+# BEGIN: Dynamic Configurations
+# If `True`, the agent fetches configuration updates from the OAP configuration discovery service, and applies them
+# without a restart. Only works with the `grpc` protocol. See the dynamic configuration docs for the options that
+# can be updated.
+agent_dynamic_config_active: bool = os.getenv('SW_AGENT_DYNAMIC_CONFIG_ACTIVE', '').lower() == 'true'
+# A local file of `option=value` lines watched for configuration updates, applied like the ones from the OAP
+agent_dynamic_config_file: str = os.getenv('SW_AGENT_DYNAMIC_CONFIG_FILE', '')
+# The interval in seconds between two fetches of the configuration from the OAP, or two checks of the watched file
+agent_dynamic_config_interval: int = int(os.getenv('SW_AGENT_DYNAMIC_CONFIG_INTERVAL', '20'))
 
 # THIS MUST FOLLOW DIRECTLY AFTER LIST OF CONFIG OPTIONS!
 options = [key for key in globals() if key not in options]  # THIS MUST FOLLOW DIRECTLY AFTER LIST OF CONFIG OPTIONS!
@@ -248,7 +412,42 @@ def finalize_feature() -> None:
     """
     Examine reporter configuration and warn users about the incompatibility of protocol vs features
     """
-    global agent_profile_active, agent_meter_reporter_active
+    global agent_profile_active, agent_meter_reporter_active, agent_spool_active, agent_grpc_compression, \
+        agent_self_meter_reporter_active, sample_strategy, agent_local_collector_socket, agent_trace_encode_spans, \
+        agent_dynamic_config_active
+
+    if agent_spool_active and agent_protocol != 'grpc':
+        agent_spool_active = False
+        warnings.warn('Spool is only supported by the gRPC protocol, it is disabled for the current protocol.')
+
+    if agent_local_collector_socket and (agent_protocol != 'grpc' or agent_asyncio_enhancement):
+        agent_local_collector_socket = ''
+        warnings.warn('The local collector is only supported by the gRPC protocol without asyncio enhancement, '
+                      'agent processes report by themselves.')
+
+    if agent_trace_encode_spans and (agent_protocol != 'grpc' or agent_asyncio_enhancement):
+        agent_trace_encode_spans = False
+        warnings.warn('Encoding spans as they finish is only supported by the gRPC protocol without asyncio '
+                      'enhancement, it is disabled.')
+
+    if agent_self_meter_reporter_active and agent_asyncio_enhancement:
+        agent_self_meter_reporter_active = False
+        warnings.warn('Agent health meters are not supported with asyncio enhancement, they are disabled.')
+
+    if agent_dynamic_config_active and agent_protocol != 'grpc':
+        agent_dynamic_config_active = False
+        warnings.warn('Configuration discovery is only supported by the gRPC protocol, it is disabled, '
+                      'use agent_dynamic_config_file instead.')
+
+    if sample_strategy not in ('', 'n_per_3_secs', 'token_bucket', 'probabilistic', 'endpoint_quota', 'adaptive'):
+        warnings.warn(f'Unknown sampling strategy {sample_strategy}, all traces are recorded.')
+        sample_strategy = ''
+
+    if agent_grpc_compression == 'none':
+        agent_grpc_compression = ''
+    elif agent_grpc_compression not in ('', 'gzip', 'deflate'):
+        warnings.warn(f'Unknown gRPC compression {agent_grpc_compression}, compression is disabled.')
+        agent_grpc_compression = ''
 
     if agent_protocol == 'http' and (agent_profile_active or agent_meter_reporter_active):
         agent_profile_active = False
@@ -288,18 +487,7 @@ def finalize_regex() -> None:
     suffix = r'^.+(?:' + '|'.join(reesc.sub(r'\\\1', s.strip()) for s in agent_ignore_suffix.split(',')) + ')$'
     method = r'^' + '|'.join(s.strip() for s in plugin_http_ignore_method.split(',')) + '$'
     grpc_method = r'^' + '|'.join(s.strip() for s in plugin_grpc_ignored_methods.split(',')) + '$'
-    path = '^(?:' + \
-           '|'.join(  # replaces ","
-               '/(?:[^/]*/)*'.join(  # replaces "/**/"
-                   '(?:(?:[^/]+/)*[^/]+)?'.join(  # replaces "**"
-                       '[^/]*'.join(  # replaces "*"
-                           '[^/]'.join(  # replaces "?"
-                               reesc.sub(r'\\\1', s) for s in p3.split('?')
-                           ) for p3 in p2.split('*')
-                       ) for p2 in p1.strip().split('**')
-                   ) for p1 in p0.split('/**/')
-               ) for p0 in agent_trace_ignore_path.split(',')
-           ) + ')$'
+    path = '^(?:' + '|'.join(ant_path_regex(p0) for p0 in agent_trace_ignore_path.split(',')) + ')$'
 
     global RE_IGNORE_PATH, RE_HTTP_IGNORE_METHOD, RE_GRPC_IGNORED_METHODS
     RE_IGNORE_PATH = re.compile(f'{suffix}|{path}')
@@ -307,6 +495,22 @@ def finalize_regex() -> None:
     RE_GRPC_IGNORED_METHODS = re.compile(grpc_method, re.IGNORECASE)
 
 
+def ant_path_regex(pattern: str) -> str:
+    """
+    Translate an Ant style path pattern, like /path/*, /path/**, /path/?, into a regular expression
+    """
+    reesc = re.compile(r'([.*+?^=!:${}()|\[\]\\])')
+    return '/(?:[^/]*/)*'.join(  # replaces "/**/"
+        '(?:(?:[^/]+/)*[^/]+)?'.join(  # replaces "**"
+            '[^/]*'.join(  # replaces "*"
+                '[^/]'.join(  # replaces "?"
+                    reesc.sub(r'\\\1', s) for s in p3.split('?')
+                ) for p3 in p2.split('*')
+            ) for p2 in p1.strip().split('**')
+        ) for p1 in pattern.split('/**/')
+    )
+
+
 def ignore_http_method_check(method: str):
     return RE_HTTP_IGNORE_METHOD.match(method)
 
@@ -0,0 +1,181 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Configuration options updated while the agent runs, from the OAP configuration discovery service or from a watched
+local file. An update lists the options that differ from the startup configuration, an option it leaves out goes
+back to its startup value unless the other source sets it. The last update of each source is kept and they are merged
+on every update, the file taking precedence over the OAP.
+
+The matchers, samplers and caches built from the options are rebuilt by the refresh function of their options and
+swapped in with a single assignment, so the code on the span path reads them without a lock. A refresh that fails,
+e.g. on an invalid pattern, rolls the whole update back.
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from skywalking import config
+from skywalking.loggings import logger
+
+OAP = 'OAP'
+FILE = 'file'
+
+_refreshers: Dict[str, Callable[[], None]] = {}
+_startup: Dict[str, Any] = {}
+_sources: Dict[str, Dict[str, Any]] = {}  # source -> the options of its last update, parsed
+_lock = threading.Lock()  # serializes updates, never taken by readers
+
+uuid: str = ''  # of the last configuration received from the OAP, sent back so unchanged ones are not resent
+_file_mtime: Optional[float] = None
+
+
+def register(options: Iterable[str], refresh: Callable[[], None] = lambda: None) -> None:
+    """
+    Make options dynamic, `refresh` rebuilds what depends on them once they are updated.
+    """
+    for option in options:
+        if option not in config.options:
+            raise KeyError(f'Invalid configuration option {option}')
+        _refreshers[option] = refresh
+
+
+def dynamic_options() -> List[str]:
+    return sorted(_refreshers)
+
+
+def parse(option: str, value: Any) -> Any:
+    """
+    Convert a value received as text to the type of the option.
+    """
+    _, option_type = config.options_with_default_value_and_type[option]
+    if not isinstance(value, str) or option_type is str:
+        return value
+    if option_type is bool:
+        return value.strip().lower() == 'true'
+    if option_type is list:
+        return value.split(',')
+    return option_type(value.strip())
+
+
+def apply(values: Dict[str, Any], source: str) -> bool:
+    """
+    Apply a configuration update, returns whether any option changed.
+    """
+    with _lock:
+        if not _startup:
+            _startup.update((option, getattr(config, option)) for option in _refreshers)
+
+        parsed = {}
+        for option, value in values.items():
+            if option not in _refreshers:
+                logger.warning('ignored configuration option %s from %s, it is not dynamic', option, source)
+                continue
+            try:
+                parsed[option] = parse(option, value)
+            except ValueError:
+                logger.warning('ignored configuration update from %s, invalid %s: %r', source, option, value)
+                return False
+
+        sources = {**_sources, source: parsed}
+        updated = dict(_startup)
+        for name in sorted(sources, key=lambda name: name == FILE):  # stable, the file last
+            updated.update(sources[name])
+
+        changed = {option: value for option, value in updated.items() if getattr(config, option) != value}
+        if not changed:
+            _sources[source] = parsed
+            return False
+
+        previous = {option: getattr(config, option) for option in changed}
+        refreshers = list(dict.fromkeys(_refreshers[option] for option in changed))
+        try:
+            _assign(changed, refreshers)
+        except Exception:  # noqa
+            logger.exception('failed to apply configuration update from %s, rolled back', source)
+            _assign(previous, refreshers)
+            return False
+
+        _sources[source] = parsed
+        logger.info('applied configuration update from %s: %s', source, changed)
+        return True
+
+
+def _assign(values: Dict[str, Any], refreshers: List[Callable[[], None]]) -> None:
+    for option, value in values.items():
+        setattr(config, option, value)
+    for refresh in refreshers:
+        refresh()
+
+
+def check_file() -> None:
+    """
+    Apply the watched file if it changed since the last check.
+    """
+    global _file_mtime
+
+    try:
+        mtime = os.stat(config.agent_dynamic_config_file).st_mtime
+    except FileNotFoundError:
+        mtime = None
+    if mtime == _file_mtime:
+        return
+    _file_mtime = mtime
+
+    values = {}
+    if mtime is not None:
+        with open(config.agent_dynamic_config_file, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    option, _, value = line.partition('=')
+                    values[option.strip()] = value.strip()
+    apply(values, FILE)
+
+
+def _refresh_endpoint():
+    from skywalking.trace import endpoint
+    endpoint.init()
+
+
+def _refresh_statement():
+    from skywalking.trace import statement
+    statement.init()
+
+
+def _refresh_sampling():
+    from skywalking import sampling
+    sampling.reload()
+
+
+def _refresh_plugins():
+    from skywalking import plugins
+    plugins.toggle()
+
+
+register(['agent_trace_ignore_path', 'agent_ignore_suffix', 'plugin_http_ignore_method',
+          'plugin_grpc_ignored_methods'], config.finalize_regex)
+register(['sample_n_per_3_secs', 'sample_strategy', 'sample_rate_per_sec', 'sample_burst', 'sample_probability',
+          'sample_endpoint_quotas', 'sample_endpoint_max', 'sample_adaptive_overhead_budget', 'sample_adaptive_period',
+          'sample_adaptive_min_rate', 'sample_adaptive_max_rate'], _refresh_sampling)
+register(['sample_record_error_traces', 'sample_record_slow_traces_threshold'])
+register(['agent_trace_endpoint_normalize', 'agent_trace_endpoint_patterns', 'agent_trace_endpoint_max'],
+         _refresh_endpoint)
+register(['plugin_sql_statement_max_length', 'plugin_sql_statement_fingerprint'], _refresh_statement)
+register(['agent_disable_plugins'], _refresh_plugins)
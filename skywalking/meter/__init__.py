@@ -32,7 +32,6 @@ def init(force: bool = False):
         return
 
     _meter_service = MeterService()
-    _meter_service.start()
 
 
 async def init_async(async_event: asyncio.Event = None):
@@ -0,0 +1,134 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Optional
+
+import skywalking.meter as meter
+from skywalking.agent.reporter_queue import ReporterQueue
+from skywalking.meter.gauge import Gauge
+from skywalking.meter.histogram import Histogram
+from skywalking.utils.counter import LockFreeCounter
+
+BATCH_SIZE_STEPS = [1, 5, 10, 50, 100, 500, 1000, 5000, 10000]
+LATENCY_MS_STEPS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000]
+SERIALIZATION_MS_STEPS = [0.01, 0.05, 0.1, 0.25, 0.5, 1, 5, 10]
+
+
+class MeteredQueue(ReporterQueue):
+    """
+    A reporter queue publishing the agent's own health meters. The depth and high-water mark are maintained in
+    `_put`/`_get`, which already run under the queue's mutex, and drops are counted without a lock, so archiving
+    from application threads takes no extra lock.
+    """
+
+    def __init__(self, name: str, maxsize: int = 0):
+        super().__init__(maxsize)
+        self.name = name
+        self.high_water_mark = 0
+        self.gets = 0
+        self.dropped = LockFreeCounter()
+
+        # only touched by the reporter thread consuming the queue
+        self.last_get: Optional[float] = None
+        self.busy = 0.0
+
+        prefix = f'instance_agent_{name}'
+        self.report_batch_size = Histogram(f'{prefix}_report_batch_size', BATCH_SIZE_STEPS)
+        self.latency = Histogram(f'{prefix}_report_latency', LATENCY_MS_STEPS)
+        self.serialization_time = Histogram(f'{prefix}_serialization_time', SERIALIZATION_MS_STEPS)
+
+    def _put(self, item):
+        super()._put(item)
+        if len(self.queue) > self.high_water_mark:
+            self.high_water_mark = len(self.queue)
+
+    def _get(self):
+        self.gets += 1
+        return super()._get()
+
+    def get(self, block=True, timeout=None):
+        if self.last_get is not None:  # the reporter was busy with the previous item until now
+            self.busy += perf_counter() - self.last_get
+        try:
+            return super().get(block, timeout)
+        finally:
+            self.last_get = perf_counter()
+
+    @contextmanager
+    def measure(self):
+        """
+        Measure one report: the number of items taken from the queue, the time spent per item between taking it
+        and asking for the next one (converting, serializing and handing it to the transport), and the time from
+        the last item taken until the report completed, i.e. the time waiting for the backend to accept the batch.
+        """
+        gets, self.busy, self.last_get = self.gets, 0.0, None
+        try:
+            yield
+        finally:
+            batch = self.gets - gets
+            if batch:
+                self.report_batch_size.add_value(batch)
+                self.serialization_time.add_value(self.busy / batch * 1000)
+            if self.last_get is not None:
+                self.latency.add_value((perf_counter() - self.last_get) * 1000)
+
+    def depth_generator(self):
+        while True:
+            yield self.qsize()
+
+    def high_water_mark_generator(self):
+        while True:
+            with self.mutex:  # report the peak since the last report, then start over from the current depth
+                high_water_mark, self.high_water_mark = self.high_water_mark, len(self.queue)
+            yield high_water_mark
+
+    def dropped_generator(self):
+        while True:
+            yield self.dropped.get()
+
+    def register(self) -> None:
+        prefix = f'instance_agent_{self.name}'
+        Gauge.Builder(f'{prefix}_queue_depth', self.depth_generator()).build()
+        Gauge.Builder(f'{prefix}_queue_high_water_mark', self.high_water_mark_generator()).build()
+        Gauge.Builder(f'{prefix}_dropped_queue_full', self.dropped_generator()).build()
+        for histogram in (self.report_batch_size, self.latency, self.serialization_time):
+            meter._meter_service.register(histogram)
+
+
+def register_backoff(reporter_backoff: dict, reporter_name: str) -> None:
+    """
+    Publish the current backoff in seconds of a reporter, 0 while it works normally.
+    """
+    def generator():
+        while True:
+            yield reporter_backoff.get(reporter_name, 0)
+
+    Gauge.Builder(f'instance_agent_{reporter_name}_backoff', generator()).build()
+
+
+def register_spool(spool) -> None:
+    """
+    Publish the number of spooled records overwritten before they could be replayed.
+    """
+    def generator():
+        while True:
+            yield spool.dropped
+
+    Gauge.Builder('instance_agent_spool_dropped_overwritten', generator()).build()
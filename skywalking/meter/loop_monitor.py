@@ -0,0 +1,201 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Measures how long the asyncio event loops of the application are kept from running their callbacks. Every loop runs
+a probe scheduled every interval, the delay between the time the probe was due and the time it ran is the lag of the
+loop. A check on an agent thread finds the loops whose probe is late beyond the slow callback threshold, i.e. loops
+blocked by a callback right now, samples the stack of the loop thread once and logs it on the active span of the
+blocking callback.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from asyncio import events
+from time import monotonic
+from typing import Dict, Optional
+
+import skywalking.meter as meter
+from skywalking import Log, LogItem
+from skywalking.loggings import logger, logger_debug_enabled
+from skywalking.meter.histogram import Histogram
+from skywalking.profile.profile_context import dump_stack
+from skywalking.trace.context import spans_of
+from skywalking.trace.span import Span
+
+LAG_MS_STEPS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000]
+AGENT_LOOP_THREAD = 'event_loop_thread'
+
+
+class LoopProbe:
+    def __init__(self, loop: asyncio.AbstractEventLoop, monitor: 'LoopMonitor'):
+        self.loop = loop
+        self.monitor = monitor
+        self.thread_id = threading.get_ident()
+        self.due: Optional[float] = None
+        self.beat = monotonic()
+        self.sampled = False
+        self.handle: Optional[asyncio.TimerHandle] = None
+
+    def probe(self):
+        now = self.loop.time()
+        if self.due is not None:
+            self.monitor.lag.add_value(max(0.0, now - self.due) * 1000)
+        self.beat = monotonic()
+        self.sampled = False
+        self.due = now + self.monitor.interval
+        self.handle = self.loop.call_at(self.due, self.probe)
+
+    def cancel(self):
+        if self.handle is not None:
+            self.handle.cancel()
+
+
+class LoopMonitor:
+    def __init__(self, interval: float, threshold: float):
+        self.interval = interval
+        self.threshold = threshold  # seconds, 0 turns off stack sampling
+        self.probes: Dict[asyncio.AbstractEventLoop, LoopProbe] = {}
+        self.lag = Histogram('instance_pvm_event_loop_lag', LAG_MS_STEPS)
+
+    def register(self):
+        if meter._meter_service is not None:
+            meter._meter_service.register(self.lag)
+
+    def watch(self, loop: asyncio.AbstractEventLoop):
+        """
+        Probe a loop about to run in the current thread.
+        """
+        probe = self.probes[loop] = LoopProbe(loop, self)
+        loop.call_soon(probe.probe)
+
+    def unwatch(self, loop: asyncio.AbstractEventLoop):
+        probe = self.probes.pop(loop, None)
+        if probe is not None:
+            probe.cancel()
+
+    def check(self):
+        """
+        Sample the stacks of the loops blocked for at least the threshold, once per blocking callback.
+        """
+        if not self.threshold:
+            return
+        now = monotonic()
+        for probe in list(self.probes.values()):
+            blocked = now - probe.beat - self.interval
+            if blocked >= self.threshold and not probe.sampled:
+                probe.sampled = True
+                self.sample(probe, blocked)
+
+    def sample(self, probe: LoopProbe, blocked: float):
+        frame = sys._current_frames().get(probe.thread_id)
+        if frame is None:
+            return
+        span = active_span(frame)
+        if span is None:
+            if logger_debug_enabled:
+                logger.debug('event loop blocked for %dms outside of any span', blocked * 1000)
+            return
+        span.logs.append(Log(time.time(), [
+            LogItem(key='event', val='event loop blocked'),
+            LogItem(key='blocked_ms', val=str(int(blocked * 1000))),
+            LogItem(key='stack', val='\n'.join(dump_stack(frame))),
+        ]))
+
+
+def active_span(frame) -> Optional[Span]:
+    """
+    The active span of the callback running in a frame of a loop thread: the innermost `Handle._run` frame runs the
+    callback in its context, where the spans of the task are.
+    """
+    while frame is not None:
+        if frame.f_code is events.Handle._run.__code__:
+            handle = frame.f_locals.get('self')
+            spans = spans_of(handle._context) if handle is not None else []
+            return spans[-1] if spans else None
+        frame = frame.f_back
+    return None
+
+
+monitor: Optional[LoopMonitor] = None
+_unprobed_types = set()
+
+
+def warn_unprobed(loop: asyncio.AbstractEventLoop):
+    """
+    Warn once per type about the loops not running `BaseEventLoop.run_forever`, e.g. uvloop, which are not probed.
+    """
+    from asyncio import base_events
+
+    if isinstance(loop, base_events.BaseEventLoop) or type(loop) in _unprobed_types:
+        return
+    _unprobed_types.add(type(loop))
+    logger.warning('the loop monitor does not probe event loops of type %s.%s, except one already running when the '
+                   'agent starts', type(loop).__module__, type(loop).__qualname__)
+
+
+def install(interval: float, threshold: float) -> LoopMonitor:
+    """
+    Probe every asyncio loop the application runs from now on, and the loop of the current thread if running. Loops
+    not based on `BaseEventLoop`, e.g. uvloop, are detected as they are created or set by the event loop policy.
+    """
+    from asyncio import base_events
+
+    global monitor
+    monitor = LoopMonitor(interval, threshold)
+
+    _run_forever = base_events.BaseEventLoop.run_forever
+
+    def _sw_run_forever(this):
+        if threading.current_thread().name == AGENT_LOOP_THREAD:  # the loop of the agent itself
+            return _run_forever(this)
+        monitor.watch(this)
+        try:
+            return _run_forever(this)
+        finally:
+            monitor.unwatch(this)
+
+    base_events.BaseEventLoop.run_forever = _sw_run_forever
+
+    policy = getattr(events, '_BaseDefaultEventLoopPolicy', None) or events.BaseDefaultEventLoopPolicy
+    _new_event_loop = policy.new_event_loop
+    _set_event_loop = policy.set_event_loop
+
+    def _sw_new_event_loop(this):
+        loop = _new_event_loop(this)
+        warn_unprobed(loop)
+        return loop
+
+    def _sw_set_event_loop(this, loop):
+        _set_event_loop(this, loop)
+        if loop is not None:
+            warn_unprobed(loop)
+
+    policy.new_event_loop = _sw_new_event_loop
+    policy.set_event_loop = _sw_set_event_loop
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:  # no loop running in the current thread
+        pass
+    else:
+        monitor.watch(loop)
+        warn_unprobed(loop)
+    return monitor
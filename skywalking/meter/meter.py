@@ -75,6 +75,14 @@ class MeterId():
     def get_type(self):
         return self.type
 
+    def get_series_key(self):
+        """
+        The key of the meter in the meter service, meters of the same name are told apart by their tags.
+        """
+        if not self.tags:
+            return self.name
+        return self.name, tuple((tag.key, tag.value) for tag in self.tags)
+
     def __hash__(self):
         return hash((self.name, self.type, tuple(self.tags)))
 
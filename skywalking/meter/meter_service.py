@@ -14,11 +14,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-import time
 import asyncio
 
-from concurrent.futures import ThreadPoolExecutor
-from threading import Thread
 from skywalking import config
 from skywalking.agent import agent
 from skywalking.meter.meter import BaseMeter
@@ -26,47 +23,56 @@ from skywalking.utils.time import current_milli_time
 from skywalking.loggings import logger
 
 
-class MeterService(Thread):
+class MeterService():
+    """
+    Holds the registered meters, the agent scheduler calls `send` every `agent_meter_reporter_period`.
+    """
+
     def __init__(self):
-        super().__init__(name='meterService', daemon=True)
         logger.debug('Started meter service')
         self.meter_map = {}
+        self.meter_names = {}  # name -> the last meter registered under it, for the decorators
 
     def register(self, meter: BaseMeter):
-        self.meter_map[meter.get_id().get_name()] = meter
+        self.meter_map[meter.get_id().get_series_key()] = meter
+        self.meter_names[meter.get_name()] = meter
 
     def get_meter(self, name: str):
-        return self.meter_map.get(name)
+        return self.meter_names.get(name)
 
-    def send(self):
+    def send(self, archive_meter=None):
+        """
+        Archive the data of every meter, with the agent's `archive_meter` unless another is given.
+        """
+        archive_meter = archive_meter or agent.archive_meter
 
         def archive(meterdata):
             meterdata = meterdata.transform()
             meterdata.service = config.agent_name
             meterdata.serviceInstance = config.agent_instance_name
             meterdata.timestamp = current_milli_time()
-            agent.archive_meter(meterdata)
-
-        with ThreadPoolExecutor(thread_name_prefix='meter_service_pool_worker', max_workers=1) as executor:
-            executor.map(archive, self.meter_map.values())
+            archive_meter(meterdata)
 
-    def run(self):
-        while True:
-            time.sleep(config.agent_meter_reporter_period)
-            self.send()
+        for m in list(self.meter_map.values()):
+            try:
+                archive(m)
+            except Exception:  # noqa
+                logger.exception('Failed to collect meter %s', m.get_name())
 
 
 class MeterServiceAsync():
     def __init__(self):
         self.meter_map = {}
+        self.meter_names = {}  # name -> the last meter registered under it, for the decorators
         # strong reference to asyncio.Task to prevent garbage collection
         self.strong_ref_set = set()
 
     def register(self, meter: BaseMeter):
-        self.meter_map[meter.get_id().get_name()] = meter
+        self.meter_map[meter.get_id().get_series_key()] = meter
+        self.meter_names[meter.get_name()] = meter
 
     def get_meter(self, name: str):
-        return self.meter_map.get(name)
+        return self.meter_names.get(name)
 
     async def send(self):
 
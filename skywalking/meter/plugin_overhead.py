@@ -0,0 +1,211 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Measures the time the agent itself spends in instrumented library calls. Every `_sw_*` function a plugin installed
+is wrapped to measure its total time, and the original callable it delegates to is wrapped to measure the time
+spent in the library, the difference is the self time of the plugin, i.e. its overhead.
+
+Only synchronous functions installed as module or class attributes are tracked, and only originals kept in the
+closure of the `_sw_*` function are told apart, the time of an original reached in any other way counts as overhead.
+"""
+
+import inspect
+import sys
+import threading
+from functools import wraps
+from time import perf_counter
+from types import FunctionType, ModuleType
+from typing import Dict, List, Tuple
+
+from skywalking.loggings import logger, logger_debug_enabled
+from skywalking.meter.gauge import Gauge
+
+Key = Tuple[str, str]  # (plugin, method)
+
+_local = threading.local()
+_lock = threading.Lock()
+_threads: Dict[threading.Thread, Dict[Key, List]] = {}  # per-thread accumulators of [calls, self time]
+_retired: Dict[Key, List] = {}  # accumulators folded in from threads that have exited
+_keys: List[Key] = []
+
+
+def _state():
+    try:
+        return _local.stack, _local.stats
+    except AttributeError:
+        _local.stack, _local.stats = [], {}
+        with _lock:
+            _threads[threading.current_thread()] = _local.stats
+        return _local.stack, _local.stats
+
+
+def _track(func, key: Key):
+    @wraps(func)
+    def tracked(*args, **kwargs):
+        stack, stats = _state()
+        inner = [0.0]  # time spent in the original callable(s)
+        stack.append(inner)
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            stack.pop()
+            stat = stats.get(key)
+            if stat is None:
+                stat = stats[key] = [0, 0.0]
+            stat[0] += 1
+            stat[1] += elapsed - inner[0]
+
+    return tracked
+
+
+def _track_original(func):
+    @wraps(func)
+    def original(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stack = getattr(_local, 'stack', None)
+            if stack:  # called from a tracked function
+                stack[-1][0] += perf_counter() - start
+
+    return original
+
+
+def _is_original(value, plugin_file: str) -> bool:
+    if isinstance(value, type) or not callable(value):
+        return False
+    code = getattr(value, '__code__', None)
+    if code is not None and code.co_filename == plugin_file:
+        return False
+    return not (getattr(value, '__module__', None) or '').startswith('skywalking')
+
+
+def _is_trackable(value, plugins: Dict[str, str]) -> bool:
+    return isinstance(value, FunctionType) and value.__name__.startswith('_sw_') \
+        and value.__code__.co_filename in plugins
+
+
+def _patch_sites(plugins: Dict[str, str]):
+    """
+    Yield the (owner, attribute, function) of every `_sw_*` function installed on a module or a class.
+    """
+    seen = set()
+    for module in list(sys.modules.values()):
+        if not isinstance(module, ModuleType):
+            continue
+        try:
+            namespace = list(vars(module).items())
+        except TypeError:
+            continue
+        for name, value in namespace:
+            if _is_trackable(value, plugins):
+                yield module, name, value
+            elif isinstance(value, type) and id(value) not in seen:
+                seen.add(id(value))
+                for attr, member in list(vars(value).items()):
+                    if _is_trackable(member, plugins):
+                        yield value, attr, member
+
+
+def track(plugins: Dict[str, str]) -> None:
+    """
+    Wrap the `_sw_*` functions installed by the given plugins, a mapping from plugin source file to plugin name.
+    """
+    tracked = {}
+    for owner, attr, func in _patch_sites(plugins):
+        if inspect.iscoroutinefunction(func) or inspect.isgeneratorfunction(func) \
+                or inspect.isasyncgenfunction(func):
+            continue
+
+        if id(func) not in tracked:
+            plugin_file = func.__code__.co_filename
+            for cell in func.__closure__ or ():
+                try:
+                    value = cell.cell_contents
+                except ValueError:  # empty cell
+                    continue
+                if _is_original(value, plugin_file):
+                    cell.cell_contents = _track_original(value)
+
+            key = (plugins[plugin_file], func.__name__[len('_sw_'):])
+            if key not in _keys:
+                _keys.append(key)
+            tracked[id(func)] = _track(func, key)
+
+        setattr(owner, attr, tracked[id(func)])
+        if logger_debug_enabled:
+            logger.debug('tracking the overhead of %s.%s', getattr(owner, '__name__', owner), attr)
+
+
+def _retire_exited() -> None:
+    for thread in [thread for thread in _threads if not thread.is_alive()]:
+        for key, (calls, self_time) in _threads.pop(thread).items():
+            retired = _retired.setdefault(key, [0, 0.0])
+            retired[0] += calls
+            retired[1] += self_time
+
+
+def snapshot() -> Dict[Key, Tuple[int, float]]:
+    """
+    The number of calls and the self time in seconds of every tracked method since the start, across all threads.
+    """
+    with _lock:
+        _retire_exited()
+        totals = {key: list(stat) for key, stat in _retired.items()}
+        for stats in _threads.values():
+            for key, (calls, self_time) in stats.copy().items():
+                total = totals.setdefault(key, [0, 0.0])
+                total[0] += calls
+                total[1] += self_time
+    return {key: (calls, self_time) for key, (calls, self_time) in totals.items()}
+
+
+def dump() -> str:
+    """
+    A table of the tracked methods, the most expensive first.
+    """
+    totals = snapshot()
+    rows = sorted(((plugin, method, *totals.get((plugin, method), (0, 0.0))) for plugin, method in _keys),
+                  key=lambda row: row[3], reverse=True)
+    lines = [f'{"plugin":<24} {"method":<32} {"calls":>12} {"self time(ms)":>14} {"avg(us)":>10}']
+    for plugin, method, calls, self_time in rows:
+        lines.append(f'{plugin:<24} {method:<32} {calls:>12} {self_time * 1000:>14.3f} '
+                     f'{self_time / calls * 1000000 if calls else 0:>10.2f}')
+    return '\n'.join(lines)
+
+
+def _delta_generator(key: Key, index: int, scale: float):
+    last = 0
+    while True:
+        value = snapshot().get(key, (0, 0.0))[index]
+        yield (value - last) * scale
+        last = value
+
+
+def register() -> None:
+    """
+    Publish the calls and the self time in milliseconds of every tracked method during the last period.
+    """
+    for plugin, method in _keys:
+        prefix = f'instance_agent_plugin_{plugin}_{method}'
+        Gauge.Builder(f'{prefix}_calls', _delta_generator((plugin, method), 0, 1)).build()
+        Gauge.Builder(f'{prefix}_self_time', _delta_generator((plugin, method), 1, 1000)).build()
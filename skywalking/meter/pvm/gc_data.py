@@ -15,36 +15,75 @@
 # limitations under the License.
 #
 
+
 import gc
-import time
+from time import perf_counter
 
+import skywalking.meter as meter
+from skywalking.meter.counter import Counter, CounterMode
+from skywalking.meter.histogram import Histogram
 from skywalking.meter.pvm.data_source import DataSource
 
+PAUSE_MS_STEPS = [0.1, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000]
+
+_callback = None  # the callback of the last registered source, replaced after fork()
+
 
 class GCDataSource(DataSource):
+    """
+    Records every collection from a `gc.callbacks` hook: its pause in a histogram per generation, the total pause
+    per meter period, and the objects it collected, on top of a single `gc.get_stats()` snapshot of the collections
+    before. The gen0 count at the start of each collection, i.e. the container objects allocated and not freed since
+    the last one, approximates the allocations per period.
+    """
+
+    def __init__(self):
+        stats = gc.get_stats()
+        self.collected = [generation['collected'] for generation in stats]
+        self.uncollectable = [generation['uncollectable'] for generation in stats]
+        self.pauses = [Histogram('instance_pvm_gc_pause', PAUSE_MS_STEPS, tags=(('generation', f'g{i}'),))
+                       for i in range(len(stats))]
+        self.gc_time = Counter('instance_pvm_gc_time', CounterMode.RATE)
+        self.allocated = Counter('instance_pvm_gc_allocated', CounterMode.RATE)
+        self.start = None
+
+    def register(self):
+        global _callback
+
+        super().register()
+        for m in (*self.pauses, self.gc_time, self.allocated):
+            meter._meter_service.register(m)
+
+        if _callback in gc.callbacks:
+            gc.callbacks.remove(_callback)
+        _callback = self.gc_callback
+        gc.callbacks.append(_callback)
+
+    def gc_callback(self, phase, info):
+        # meters only lock around arithmetic on numbers, which never triggers a collection
+        if phase == 'start':
+            self.start = perf_counter()
+            self.allocated.increment(gc.get_count()[0])
+        elif phase == 'stop' and self.start is not None:
+            pause = (perf_counter() - self.start) * 1000
+            generation = info['generation']
+            self.pauses[generation].add_value(pause)
+            self.gc_time.increment(pause)
+            self.collected[generation] += info['collected']
+            self.uncollectable[generation] += info['uncollectable']
+
     def gc_g0_generator(self):
         while (True):
-            yield gc.get_stats()[0]['collected']
+            yield self.collected[0]
 
     def gc_g1_generator(self):
         while (True):
-            yield gc.get_stats()[1]['collected']
+            yield self.collected[1]
 
     def gc_g2_generator(self):
         while (True):
-            yield gc.get_stats()[2]['collected']
-
-    def gc_time_generator(self):
-        self.gc_time = 0
-
-        def gc_callback(phase, info):
-            if phase == 'start':
-                self.start_time = time.time()
-            elif phase == 'stop':
-                self.gc_time = (time.time() - self.start_time) * 1000
-
-        if hasattr(gc, 'callbacks'):
-            gc.callbacks.append(gc_callback)
+            yield self.collected[2]
 
+    def gc_uncollectable_generator(self):
         while (True):
-            yield self.gc_time
+            yield sum(self.uncollectable)
@@ -0,0 +1,174 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Process and host meters from one snapshot per meter period. On Linux the snapshot reads `/proc` directly, a few
+small files per period, elsewhere it falls back to psutil, which is only imported then.
+"""
+
+import os
+from time import monotonic
+from typing import Dict, Optional
+
+from skywalking.meter.pvm.data_source import DataSource
+
+# all the gauges of one report read the same snapshot, a new report takes a new one
+SNAPSHOT_MAX_AGE = 1.0
+
+
+class ProcReader:
+    """
+    Reads `/proc/self/stat`, `/proc/self/status`, `/proc/self/fd`, `/proc/stat` and `/proc/meminfo`.
+    """
+
+    def __init__(self):
+        self.clock_ticks = os.sysconf('SC_CLK_TCK')
+        self.last_process_ticks = None
+        self.last_wall = None
+        self.last_total = None
+        self.last_idle = None
+
+    @staticmethod
+    def available() -> bool:
+        return os.path.exists('/proc/self/stat')
+
+    def read(self) -> Dict[str, float]:
+        snapshot = {}
+
+        with open('/proc/self/stat', 'rb') as f:
+            # the command may contain spaces and parentheses, the fields after it start at field 3 (state)
+            fields = f.read().rsplit(b')', 1)[1].split()
+        process_ticks = int(fields[11]) + int(fields[12])  # utime + stime
+        wall = monotonic()
+        if self.last_process_ticks is not None and wall > self.last_wall:
+            cpu_seconds = (process_ticks - self.last_process_ticks) / self.clock_ticks
+            snapshot['process_cpu_utilization'] = cpu_seconds / (wall - self.last_wall) * 100
+        self.last_process_ticks, self.last_wall = process_ticks, wall
+
+        with open('/proc/self/status', 'rb') as f:
+            for line in f:
+                key, _, value = line.partition(b':')
+                if key == b'VmRSS':
+                    snapshot['process_rss'] = int(value.split()[0]) * 1024
+                elif key == b'Threads':
+                    snapshot['thread_active_count'] = int(value)
+                elif key == b'voluntary_ctxt_switches':
+                    snapshot['voluntary_context_switches'] = int(value)
+                elif key == b'nonvoluntary_ctxt_switches':
+                    snapshot['involuntary_context_switches'] = int(value)
+
+        snapshot['open_fds'] = len(os.listdir('/proc/self/fd'))
+
+        with open('/proc/stat', 'rb') as f:
+            # cpu user nice system idle iowait irq softirq steal, guest time is already counted in user
+            times = [int(t) for t in f.readline().split()[1:9]]
+        total, idle = sum(times), times[3] + times[4]
+        if self.last_total is not None and total > self.last_total:
+            busy = (total - self.last_total) - (idle - self.last_idle)
+            snapshot['total_cpu_utilization'] = busy / (total - self.last_total) * 100
+        self.last_total, self.last_idle = total, idle
+
+        meminfo = {}
+        with open('/proc/meminfo', 'rb') as f:
+            for line in f:
+                key, _, value = line.partition(b':')
+                if key in (b'MemTotal', b'MemAvailable'):
+                    meminfo[key] = int(value.split()[0]) * 1024
+        mem_total = meminfo.get(b'MemTotal')
+        if mem_total:
+            snapshot['total_mem_utilization'] = (mem_total - meminfo.get(b'MemAvailable', 0)) / mem_total * 100
+            if 'process_rss' in snapshot:
+                snapshot['process_mem_utilization'] = snapshot['process_rss'] / mem_total
+
+        return snapshot
+
+
+class PsutilReader:
+    """
+    The same snapshot through psutil, on systems without `/proc`.
+    """
+
+    def __init__(self):
+        import psutil
+
+        self.psutil = psutil
+        self.process = psutil.Process()
+
+    def read(self) -> Dict[str, float]:
+        psutil = self.psutil
+        memory = psutil.virtual_memory()
+        with self.process.oneshot():
+            rss = self.process.memory_info().rss
+            ctx_switches = self.process.num_ctx_switches()
+            return {
+                'total_cpu_utilization': psutil.cpu_percent(),
+                'process_cpu_utilization': self.process.cpu_percent(),
+                'total_mem_utilization': memory.percent,
+                'process_mem_utilization': rss / memory.total,
+                'process_rss': rss,
+                'thread_active_count': self.process.num_threads(),
+                'open_fds': self.process.num_fds() if hasattr(self.process, 'num_fds')
+                else self.process.num_handles(),
+                'voluntary_context_switches': ctx_switches.voluntary,
+                'involuntary_context_switches': ctx_switches.involuntary,
+            }
+
+
+class ProcessDataSource(DataSource):
+    def __init__(self):
+        self.reader = ProcReader() if ProcReader.available() else PsutilReader()
+        self.snapshot: Dict[str, float] = {}
+        self.taken: Optional[float] = None
+
+    def get(self, key: str) -> float:
+        now = monotonic()
+        if self.taken is None or now - self.taken >= SNAPSHOT_MAX_AGE:
+            self.snapshot = self.reader.read()
+            self.taken = now
+        return self.snapshot.get(key, 0)
+
+    def values(self, key: str):
+        while (True):
+            yield self.get(key)
+
+    def total_cpu_utilization_generator(self):
+        return self.values('total_cpu_utilization')
+
+    def process_cpu_utilization_generator(self):
+        return self.values('process_cpu_utilization')
+
+    def total_mem_utilization_generator(self):
+        return self.values('total_mem_utilization')
+
+    def process_mem_utilization_generator(self):
+        return self.values('process_mem_utilization')
+
+    def process_rss_generator(self):
+        return self.values('process_rss')
+
+    def thread_active_count_generator(self):
+        return self.values('thread_active_count')
+
+    def open_fds_generator(self):
+        return self.values('open_fds')
+
+    def voluntary_context_switches_generator(self):
+        return self.values('voluntary_context_switches')
+
+    def involuntary_context_switches_generator(self):
+        return self.values('involuntary_context_switches')
@@ -1,37 +0,0 @@
-#
-# Licensed to the Apache Software Foundation (ASF) under one or more
-# contributor license agreements.  See the NOTICE file distributed with
-# this work for additional information regarding copyright ownership.
-# The ASF licenses this file to You under the Apache License, Version 2.0
-# (the "License"); you may not use this file except in compliance with
-# the License.  You may obtain a copy of the License at
-#
-#     http://www.apache.org/licenses/LICENSE-2.0
-#
-# Unless required by applicable law or agreed to in writing, software
-# distributed under the License is distributed on an "AS IS" BASIS,
-# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
-# See the License for the specific language governing permissions and
-# limitations under the License.
-#
-
-import psutil
-from skywalking.meter.pvm.data_source import DataSource
-
-
-class ThreadDataSource(DataSource):
-    def __init__(self):
-        self.cur_process = psutil.Process()
-
-    def thread_active_count_generator(self):
-        while (True):
-            ps = [self.cur_process]
-            count = 0
-
-            while len(ps) > 0:
-                p = ps[0]
-                ps.pop(0)
-                count += p.num_threads()
-                ps += p.children()
-
-            yield count
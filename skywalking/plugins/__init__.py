@@ -18,9 +18,13 @@ import importlib.metadata
 import importlib.util
 import inspect
 import logging
+import os
 import pkgutil
 import re
+import sys
+import threading
 import traceback
+from typing import Any, Dict, List, Set
 
 from packaging import version
 
@@ -33,16 +37,115 @@ from skywalking.utils.exception import VersionRuleException
 PackageNotFoundException = importlib.metadata.PackageNotFoundError
 
 
+_MISSING = object()  # the original of an attribute the owner inherited or did not have
+
+
+class Patch:
+    """
+    An attribute a plugin replaced, with the value it replaced, to restore it when the plugin is uninstalled.
+    """
+    __slots__ = ('owner', 'attr', 'original', 'patched')
+
+    def __init__(self, owner: Any, attr: str, original: Any, patched: Any):
+        self.owner = owner
+        self.attr = attr
+        self.original = original
+        self.patched = patched
+
+
+_patches: Dict[str, List[Patch]] = {}  # plugin name -> its patches, in the order they were applied
+_uninstalled: Set[str] = set()
+_lock = threading.Lock()
+
+
 def get_pkg_version(pkg_name):
     return importlib.metadata.version(pkg_name)
 
 
+def patch(owner: Any, attr: str, value: Any) -> None:
+    """
+    Replace an attribute of a module or a class on behalf of the calling plugin, and record the original.
+    """
+    plugin = os.path.splitext(os.path.basename(sys._getframe(1).f_globals['__file__']))[0]
+    with _lock:
+        _patches.setdefault(plugin, []).append(Patch(owner, attr, vars(owner).get(attr, _MISSING), value))
+        setattr(owner, attr, value)
+
+
+def _is_current(p: Patch) -> bool:
+    current = vars(p.owner).get(p.attr, _MISSING)
+    # wrapped since, e.g. to measure the plugin overhead
+    return current is p.patched or getattr(current, '__wrapped__', None) is p.patched
+
+
+def uninstall(plugin: str) -> bool:
+    """
+    Restore the originals of the attributes a plugin replaced, returns whether it was installed. Calls made afterwards
+    are not traced, objects the plugin already wrapped, e.g. connections, stay instrumented.
+    """
+    with _lock:
+        if plugin not in _patches or plugin in _uninstalled:
+            return False
+        for p in reversed(_patches[plugin]):
+            if not _is_current(p):
+                logger.warning('%s.%s was replaced after plugin %s patched it, it is left as is',
+                               getattr(p.owner, '__name__', p.owner), p.attr, plugin)
+                continue
+            p.patched = vars(p.owner)[p.attr]
+            if p.original is _MISSING:
+                delattr(p.owner, p.attr)
+            else:
+                setattr(p.owner, p.attr, p.original)
+        _uninstalled.add(plugin)
+    logger.info('plugin %s is uninstalled', plugin)
+    return True
+
+
+def reinstall(plugin: str) -> bool:
+    """
+    Apply again the patches of a plugin uninstalled before, returns whether it was uninstalled.
+    """
+    with _lock:
+        if plugin not in _uninstalled:
+            return False
+        for p in _patches[plugin]:
+            if vars(p.owner).get(p.attr, _MISSING) is p.original:
+                setattr(p.owner, p.attr, p.patched)
+        _uninstalled.discard(plugin)
+    logger.info('plugin %s is reinstalled', plugin)
+    return True
+
+
+def installed_plugins() -> List[str]:
+    """
+    The plugins whose patches are applied.
+    """
+    return [plugin for plugin in _patches if plugin not in _uninstalled]
+
+
+def _disable_patterns() -> List[re.Pattern]:
+    patterns = config.agent_disable_plugins
+    if isinstance(patterns, str):
+        patterns = patterns.split(',')
+    return [re.compile(p.strip()) for p in patterns if p.strip()]
+
+
+def toggle() -> None:
+    """
+    Uninstall the plugins `agent_disable_plugins` now matches and reinstall the ones it no longer matches, e.g. after
+    a dynamic configuration update. Plugins disabled at startup were never loaded and cannot be installed later.
+    """
+    patterns = _disable_patterns()
+    for plugin in list(_patches):
+        if any(pattern.match(plugin) for pattern in patterns):
+            uninstall(plugin)
+        else:
+            reinstall(plugin)
+
+
 def install():
-    disable_patterns = config.agent_disable_plugins
-    if isinstance(disable_patterns, str):
-        disable_patterns = [re.compile(p.strip()) for p in disable_patterns.split(',') if p.strip()]
-    else:
-        disable_patterns = [re.compile(p.strip()) for p in disable_patterns if p.strip()]
+    disable_patterns = _disable_patterns()
+    installed = {}
     for importer, modname, _ispkg in pkgutil.iter_modules(skywalking.plugins.__path__):
         if any(pattern.match(modname) for pattern in disable_patterns):
             logger.info("plugin %s is disabled and thus won't be installed", modname)
@@ -66,6 +169,7 @@ def install():
         # noinspection PyBroadException
         try:
             plugin.install()
+            installed[plugin.__file__] = modname
             logger.debug('Successfully installed plugin %s', modname)
         except Exception:
             logger.warning(
@@ -75,6 +179,10 @@ def install():
             )
             traceback.print_exc() if logger.isEnabledFor(logging.DEBUG) else None
 
+    if config.agent_plugin_overhead_active:
+        from skywalking.meter import plugin_overhead
+        plugin_overhead.track(installed)
+
 
 def pkg_version_check(plugin):
     supported = True
@@ -16,6 +16,8 @@
 #
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
+from skywalking.trace import endpoint
 from skywalking.trace.carrier import Carrier
 from skywalking.trace.context import get_context, NoopContext
 from skywalking.trace.span import NoopSpan
@@ -77,7 +79,7 @@ def install():
 
             return res
 
-    ClientSession._request = _sw_request
+    patch(ClientSession, '_request', _sw_request)
 
     _handle_request = RequestHandler._handle_request
 
@@ -97,7 +99,7 @@ def install():
                 item.val = val
 
         span = NoopSpan(NoopContext()) if config.ignore_http_method_check(method) \
-            else get_context().new_entry_span(op=request.path, carrier=carrier)
+            else get_context().new_entry_span(op=endpoint.normalize(request.path), carrier=carrier)
 
         with span:
             span.layer = Layer.Http
@@ -124,4 +126,4 @@ def install():
 
         return resp, reset
 
-    RequestHandler._handle_request = _sw_handle_request
+    patch(RequestHandler, '_handle_request', _sw_handle_request)
@@ -16,6 +16,7 @@
 #
 
 from skywalking import Layer, Component
+from skywalking.plugins import patch
 from skywalking.trace.context import get_context
 from skywalking.trace.tags import TagDbType, TagDbInstance, TagDbStatement
 
@@ -46,7 +47,7 @@ def install():
             return await _execute_command(self, op, *args, **kwargs)
 
     _execute_command = Redis.execute_command
-    Redis.execute_command = _sw_execute_command
+    patch(Redis, 'execute_command', _sw_execute_command)
 
 
 # Example code for someone who might want to make tests:
@@ -16,6 +16,7 @@
 #
 
 from skywalking import Layer, Component
+from skywalking.plugins import patch
 from skywalking.trace.carrier import Carrier
 from skywalking.trace.context import get_context
 from skywalking.trace.tags import TagMqBroker, TagMqTopic, TagMqQueue
@@ -95,5 +96,5 @@ def install():
 
     _basic_publish = Channel.basic_publish
     _basic_consume = Channel.basic_consume
-    Channel.basic_publish = _sw_basic_publish
-    Channel.basic_consume = _sw_basic_consume
+    patch(Channel, 'basic_publish', _sw_basic_publish)
+    patch(Channel, 'basic_consume', _sw_basic_consume)
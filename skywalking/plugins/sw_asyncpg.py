@@ -16,7 +16,9 @@
 #
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
 from skywalking.trace.context import get_context
+from skywalking.trace.statement import statement
 from skywalking.trace.tags import TagDbType, TagDbInstance, TagDbStatement, TagDbSqlParameters
 
 link_vector = ['https://github.com/MagicStack/asyncpg']
@@ -46,7 +48,7 @@ def install():
 
             span.tag(TagDbType('PostgreSQL'))
             span.tag(TagDbInstance(getattr(proto, '_database', '<unavailable>')))
-            span.tag(TagDbStatement(query))
+            span.tag(TagDbStatement(statement(query)))
 
             if config.plugin_sql_parameters_max_length and params is not None:
                 if not is_many:
@@ -100,11 +102,11 @@ def install():
     # _execute = Protocol.execute
     # _prepare = Protocol.prepare
 
-    Connection.__init__ = _sw_init
-    Protocol.bind = _sw_bind
-    Protocol.bind_execute = _sw_bind_execute
-    Protocol.bind_execute_many = _sw_bind_execute_many
-    Protocol.query = _sw_query
+    patch(Connection, '__init__', _sw_init)
+    patch(Protocol, 'bind', _sw_bind)
+    patch(Protocol, 'bind_execute', _sw_bind_execute)
+    patch(Protocol, 'bind_execute_many', _sw_bind_execute_many)
+    patch(Protocol, 'query', _sw_query)
     # Protocol.execute = _sw_execute
     # Protocol.prepare = _sw_prepare
 
@@ -16,6 +16,8 @@
 #
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
+from skywalking.trace import endpoint
 from skywalking.trace.carrier import Carrier
 from skywalking.trace.context import get_context, NoopContext
 from skywalking.trace.span import NoopSpan
@@ -60,7 +62,7 @@ def install():
                 item.val = request.headers[item.key.capitalize()]
 
         span = NoopSpan(NoopContext()) if config.ignore_http_method_check(method) \
-            else get_context().new_entry_span(op=request.path, carrier=carrier, inherit=Component.General)
+            else get_context().new_entry_span(op=endpoint.normalize(request.path), carrier=carrier, inherit=Component.General)
 
         with span:
             span.layer = Layer.Http
@@ -81,5 +83,5 @@ def install():
 
             return res
 
-    Bottle.__call__ = sw_app_call
-    WSGIRequestHandler.get_environ = sw_get_environ
+    patch(Bottle, '__call__', sw_app_call)
+    patch(WSGIRequestHandler, 'get_environ', sw_get_environ)
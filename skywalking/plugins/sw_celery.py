@@ -16,6 +16,7 @@
 #
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
 from skywalking.trace.carrier import Carrier
 from skywalking.trace.context import get_context
 from skywalking.trace.tags import TagMqBroker, TagCeleryParameters
@@ -74,7 +75,7 @@ def install():
             return _send_task(self, name, args, kwargs, **options)
 
     _send_task = Celery.send_task
-    Celery.send_task = send_task
+    patch(Celery, 'send_task', send_task)
 
     def task_from_fun(self, _fun, name=None, **options):
         def fun(*args, **kwargs):
@@ -121,4 +122,4 @@ def install():
         return task
 
     _task_from_fun = Celery._task_from_fun
-    Celery._task_from_fun = task_from_fun
+    patch(Celery, '_task_from_fun', task_from_fun)
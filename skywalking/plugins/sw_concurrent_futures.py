@@ -0,0 +1,109 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+
+import re
+import threading
+from time import perf_counter
+from typing import Dict, Optional, Tuple
+
+from skywalking import Layer, Component
+import skywalking.meter as meter
+from skywalking.meter.histogram import Histogram
+from skywalking.plugins import patch
+from skywalking.trace.context import get_context
+from skywalking.trace.tags import TagExecutorQueueWait, TagExecutorRunTime
+
+link_vector = ['https://docs.python.org/3/library/concurrent.futures.html']
+support_matrix = {
+    'concurrent_futures': {
+        '>=3.7': ['*']
+    }
+}
+note = """The tasks submitted to a `ThreadPoolExecutor`, including those of `loop.run_in_executor`, continue the trace
+of the submitting thread."""
+
+TIME_MS_STEPS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000]
+MAX_EXECUTORS = 100
+
+_histograms: Dict[str, Tuple[Histogram, Histogram]] = {}
+_lock = threading.Lock()
+
+
+def executor_name(executor) -> str:
+    # executors named by default, e.g. ThreadPoolExecutor-3, share their meters
+    return re.sub(r'-\d+$', '', getattr(executor, '_thread_name_prefix', '') or 'ThreadPoolExecutor')
+
+
+def histograms(name: str) -> Optional[Tuple[Histogram, Histogram]]:
+    """
+    The queue wait and run time histograms of an executor, None while meters are not reported.
+    """
+    pair = _histograms.get(name)
+    if pair is None and meter._meter_service is not None:
+        with _lock:
+            pair = _histograms.get(name)
+            if pair is None and len(_histograms) < MAX_EXECUTORS:
+                tags = (('executor', name),)
+                pair = (Histogram('thread_pool_queue_wait_time', TIME_MS_STEPS, tags=tags),
+                        Histogram('thread_pool_run_time', TIME_MS_STEPS, tags=tags))
+                for histogram in pair:
+                    meter._meter_service.register(histogram)
+                _histograms[name] = pair
+    return pair
+
+
+def install():
+    from concurrent.futures import ThreadPoolExecutor
+
+    _submit = ThreadPoolExecutor.submit
+
+    def _sw_submit(this: ThreadPoolExecutor, fn, /, *args, **kwargs):
+        snapshot = get_context().capture()
+        if snapshot is not None and not snapshot.is_valid():  # the submitting trace is ignored or not sampled
+            snapshot = None
+        meters = histograms(executor_name(this))
+        if snapshot is None and meters is None:
+            return _submit(this, fn, *args, **kwargs)
+
+        submitted = perf_counter()
+
+        def _sw_run(*args, **kwargs):
+            started = perf_counter()
+            queue_wait = (started - submitted) * 1000
+            try:
+                if snapshot is None:
+                    return fn(*args, **kwargs)
+
+                op = f"ThreadPoolExecutor/{getattr(fn, '__qualname__', None) or type(fn).__name__}"
+                with get_context().new_local_span(op=op) as span:
+                    span.context.continued(snapshot)
+                    span.layer = Layer.Unknown
+                    span.component = Component.General
+                    span.tag(TagExecutorQueueWait(round(queue_wait, 3)))
+                    try:
+                        return fn(*args, **kwargs)
+                    finally:
+                        span.tag(TagExecutorRunTime(round((perf_counter() - started) * 1000, 3)))
+            finally:
+                if meters is not None:
+                    meters[0].add_value(queue_wait)
+                    meters[1].add_value((perf_counter() - started) * 1000)
+
+        return _submit(this, _sw_run, *args, **kwargs)
+
+    patch(ThreadPoolExecutor, 'submit', _sw_submit)
@@ -15,7 +15,8 @@
 # limitations under the License.
 #
 
-from skywalking import Layer, Component
+from skywalking import Layer, Component, config
+from skywalking.plugins import patch
 from skywalking.trace.carrier import Carrier
 from skywalking.trace.context import get_context
 from skywalking.trace.tags import TagMqBroker, TagMqTopic, TagMqQueue
@@ -76,7 +77,7 @@ def install():
                 return _producer.produce(self._self_producer, topic, *args, **kwargs)
 
     _producer = confluent_kafka.Producer
-    confluent_kafka.Producer = ProxyProducer
+    patch(confluent_kafka, 'Producer', ProxyProducer)
 
     class ProxyConsumer(wrapt.ObjectProxy):
         def __init__(self, *args, **kwargs):
@@ -94,43 +95,43 @@ def install():
                 context = get_context()
                 topic = msg.topic()
                 key = msg.key()
-                headers = dict(msg.headers() or ())
 
                 if isinstance(key, bytes):
                     key = key.decode('utf-8')
 
-                with context.new_entry_span(
-                        op=f"Kafka/{topic or ''}/{key or ''}/Consumer/{self._self_group_id}") as span:
-
-                    span.layer = Layer.MQ
-                    span.component = Component.KafkaConsumer
-                    carrier = Carrier()
-
-                    for item in carrier:
-                        val = headers.get(item.key)
-
-                        if val is not None:
-                            item.val = val.decode('utf-8')
-
-                    span.extract(carrier)
-                    span.tag(TagMqBroker(self._self_peer))
-                    span.tag(TagMqTopic(topic))
-
-                    if key is not None:
-                        span.tag(TagMqQueue(key))
+                with context.new_entry_span(op=f"Kafka/{topic or ''}/{key or ''}/Consumer/{self._self_group_id}",
+                                            carrier=Carrier.from_headers(dict(msg.headers() or ()))) as span:
+                    self.tag_span(span, topic, key)
 
             return msg
 
+        def tag_span(self, span, topic, key=None):
+            span.layer = Layer.MQ
+            span.component = Component.KafkaConsumer
+            span.tag(TagMqBroker(self._self_peer))
+            span.tag(TagMqTopic(topic))
+            if key is not None:
+                span.tag(TagMqQueue(key))
+
         def poll(self, *args, **kwargs):
             return self.message(_consumer.poll(self._self_consumer, *args, **kwargs))
 
         def consume(self, *args, **kwargs):
             msgs = _consumer.consume(self._self_consumer, *args, **kwargs)
-
-            for msg in msgs:
-                self.message(msg)
+            msgs_ok = [msg for msg in msgs if msg is not None and not msg.error()]
+
+            if not config.plugin_confluent_kafka_consume_batch_span or \
+                    len(msgs_ok) <= config.plugin_mq_consumer_span_per_message_max:
+                for msg in msgs_ok:
+                    self.message(msg)
+            elif msgs_ok:  # one span for the batch, referring to the traces of all its messages
+                topics = ';'.join(sorted({msg.topic() or '' for msg in msgs_ok}))
+                with get_context().new_entry_span(op=f'Kafka/{topics}/Consumer/{self._self_group_id}') as span:
+                    for msg in msgs_ok:
+                        span.extract(Carrier.from_headers(dict(msg.headers() or ())))
+                    self.tag_span(span, topics)
 
             return msgs
 
     _consumer = confluent_kafka.Consumer
-    confluent_kafka.Consumer = ProxyConsumer
+    patch(confluent_kafka, 'Consumer', ProxyConsumer)
@@ -16,6 +16,8 @@
 #
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
+from skywalking.trace import endpoint
 from skywalking.trace.carrier import Carrier
 from skywalking.trace.context import get_context, NoopContext
 from skywalking.trace.span import NoopSpan
@@ -55,7 +57,7 @@ def install():
                 item.val = request.META[sw_http_header_key]
 
         span = NoopSpan(NoopContext()) if config.ignore_http_method_check(method) \
-            else get_context().new_entry_span(op=request.path, carrier=carrier)
+            else get_context().new_entry_span(op=_endpoint(request), carrier=carrier)
 
         with span:
             span.layer = Layer.Http
@@ -83,8 +85,22 @@ def install():
 
         return _handle_uncaught_exception(request, resolver, exc_info)
 
-    BaseHandler.get_response = _sw_get_response
-    exception.handle_uncaught_exception = _sw_handle_uncaught_exception
+    patch(BaseHandler, 'get_response', _sw_get_response)
+    patch(exception, 'handle_uncaught_exception', _sw_handle_uncaught_exception)
+
+
+def _endpoint(request) -> str:
+    """
+    The endpoint name of the request, after the url pattern it resolves to, resolved ahead of the handler so that the
+    entry span has its final name when ignoring, sampling and profiling look at it.
+    """
+    from django.urls import get_resolver
+
+    try:
+        route = get_resolver(getattr(request, 'urlconf', None)).resolve(request.path_info).route
+    except Exception:  # noqa, e.g. Resolver404, left to the handler
+        route = None
+    return endpoint.route(route) if route else endpoint.normalize(request.path)
 
 
 def params_tostring(params):
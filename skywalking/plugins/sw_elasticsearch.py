@@ -15,8 +15,12 @@
 # limitations under the License.
 #
 
+import re
+
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
 from skywalking.trace.context import get_context
+from skywalking.trace.endpoint import RE_ID_SEGMENT
 from skywalking.trace.tags import TagDbType, TagDbStatement
 
 link_vector = ['https://github.com/elastic/elasticsearch-py']
@@ -27,6 +31,10 @@ support_matrix = {
 }
 note = """"""
 
+# the document id following the document APIs in a url, e.g. /index/_doc/{id}, /index/_update/{id}, other numeric ids
+# are collapsed as in endpoint names
+RE_DOCUMENT_ID = re.compile(r'(/(?:_doc|_create|_update|_source|_explain|_termvectors)/)[^/]+')
+
 
 def install():
     from elasticsearch import Transport
@@ -35,7 +43,9 @@ def install():
     def _sw_perform_request(this: Transport, method, url, headers=None, params=None, body=None):
         context = get_context()
         peer = ','.join([f"{host['host']}:{str(host['port'])}" for host in this.hosts])
-        with context.new_exit_span(op=f'Elasticsearch/{method}{url}', peer=peer,
+        path = RE_ID_SEGMENT.sub('{id}', RE_DOCUMENT_ID.sub(r'\1{id}', url)) \
+            if config.agent_trace_endpoint_normalize else url
+        with context.new_exit_span(op=f'Elasticsearch/{method}{path}', peer=peer,
                                    component=Component.Elasticsearch) as span:
             span.layer = Layer.Database
             res = _perform_request(this, method, url, headers=headers, params=params, body=body)
@@ -46,4 +56,4 @@ def install():
 
             return res
 
-    Transport.perform_request = _sw_perform_request
+    patch(Transport, 'perform_request', _sw_perform_request)
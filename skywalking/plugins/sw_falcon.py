@@ -16,6 +16,8 @@
 #
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
+from skywalking.trace import endpoint
 from skywalking.trace.carrier import Carrier
 from skywalking.trace.context import get_context, NoopContext
 from skywalking.trace.span import NoopSpan
@@ -52,7 +54,7 @@ def install():
                 item.val = headers[key]
 
         span = NoopSpan(NoopContext()) if config.ignore_http_method_check(method) \
-            else context.new_entry_span(op=req.path, carrier=carrier)
+            else context.new_entry_span(op=endpoint.normalize(req.path), carrier=carrier)
 
         with span:
             span.layer = Layer.Http
@@ -88,4 +90,4 @@ def install():
 
                 raise
 
-    API.__call__ = _sw_falcon_api
+    patch(API, '__call__', _sw_falcon_api)
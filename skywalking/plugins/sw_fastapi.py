@@ -15,6 +15,8 @@
 # limitations under the License.
 #
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
+from skywalking.trace import endpoint
 from skywalking.trace.carrier import Carrier
 from skywalking.trace.context import get_context, NoopContext
 from skywalking.trace.span import NoopSpan
@@ -29,6 +31,40 @@ support_matrix = {
 note = """"""
 
 
+def endpoint_of(scope):
+    """
+    The endpoint name of the request, after the path format of the route the router will match. Matched ahead of the
+    router so that the entry span has its final name when ignoring, sampling and profiling look at it.
+    """
+    path_format = route_format(getattr(getattr(scope.get('app'), 'router', None), 'routes', ()), scope)
+    return endpoint.route(path_format) if path_format else endpoint.normalize(scope['path'])
+
+
+def route_format(routes, scope):
+    """
+    The path format of the first full match among the routes, or of the first partial match, e.g. of another method.
+    Mounted applications and hosts are descended into with their child scope, a mount without routes of its own, e.g.
+    static files, has no path format.
+    """
+    from starlette.routing import Host, Match, Mount
+
+    matched = None
+    for route in routes:
+        match, child_scope = route.matches(scope)
+        if isinstance(route, (Mount, Host)):
+            if match is not Match.FULL:
+                continue
+            path_format = route_format(route.routes, {**scope, **child_scope})
+            if path_format and isinstance(route, Mount):
+                path_format = route.path_format[:-len('/{path}')] + path_format
+            return path_format
+        if match is Match.FULL:
+            return route.path_format
+        if match is Match.PARTIAL and matched is None:
+            matched = route.path_format
+    return matched
+
+
 def install():
     from starlette.types import Receive, Scope, Send, Message
     try:
@@ -51,7 +87,7 @@ def install():
                 item.val = req.headers[item.key.capitalize()]
 
         span = NoopSpan(NoopContext()) if config.ignore_http_method_check(method) \
-            else get_context().new_entry_span(op=dict(scope)['path'], carrier=carrier, inherit=Component.General)
+            else get_context().new_entry_span(op=endpoint_of(scope), carrier=carrier, inherit=Component.General)
 
         with span:
             span.layer = Layer.Http
@@ -97,4 +133,4 @@ def install():
         else:
             await _original_fast_api(self, scope, receive, send)
 
-    ExceptionMiddleware.__call__ = _sw_fast_api
+    patch(ExceptionMiddleware, '__call__', _sw_fast_api)
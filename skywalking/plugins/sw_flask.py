@@ -16,6 +16,8 @@
 #
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
+from skywalking.trace import endpoint
 from skywalking.trace.carrier import Carrier
 from skywalking.trace.context import get_context, NoopContext
 from skywalking.trace.span import NoopSpan
@@ -51,8 +53,10 @@ def install():
             if item.key.capitalize() in req.headers:
                 item.val = req.headers[item.key.capitalize()]
 
+        # the request is matched to a url rule before it is dispatched
+        op = endpoint.route(req.url_rule.rule) if req.url_rule is not None else endpoint.normalize(req.path)
         span = NoopSpan(NoopContext()) if config.ignore_http_method_check(method) \
-            else get_context().new_entry_span(op=req.path, carrier=carrier, inherit=Component.General)
+            else get_context().new_entry_span(op=op, carrier=carrier, inherit=Component.General)
 
         with span:
             span.layer = Layer.Http
@@ -87,6 +91,6 @@ def install():
 
         return _handle_exception(this, e)
 
-    Flask.full_dispatch_request = _sw_full_dispatch_request
-    Flask.handle_user_exception = _sw_handle_user_exception
-    Flask.handle_exception = _sw_handle_exception
+    patch(Flask, 'full_dispatch_request', _sw_full_dispatch_request)
+    patch(Flask, 'handle_user_exception', _sw_handle_user_exception)
+    patch(Flask, 'handle_exception', _sw_handle_exception)
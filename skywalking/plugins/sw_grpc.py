@@ -20,6 +20,7 @@ from concurrent.futures import Executor
 from typing import Any, Awaitable, Callable, List, NamedTuple, Optional, Sequence, Tuple, Union
 
 from skywalking import Component, Layer, config
+from skywalking.plugins import patch
 from skywalking.trace.carrier import Carrier
 from skywalking.trace.context import NoopContext, get_context
 from skywalking.trace.span import NoopSpan
@@ -169,7 +170,7 @@ def install_sync() -> None:
                 xds,
             )
 
-        grpc.server = _sw_grpc_server
+        patch(grpc, 'server', _sw_grpc_server)
 
     def install_client() -> None:
         _grpc_channel = _channel.Channel
@@ -241,7 +242,7 @@ def install_sync() -> None:
                 return c
             return grpc.intercept_channel(c, _ClientInterceptor(target))
 
-        _channel.Channel = _sw_grpc_channel_factory
+        patch(_channel, 'Channel', _sw_grpc_channel_factory)
 
     install_client()
     install_server()
@@ -353,7 +354,7 @@ def install_async() -> None:
                 compression,
             )
 
-        grpc.aio.server = _sw_grpc_aio_server
+        patch(grpc.aio, 'server', _sw_grpc_aio_server)
 
     def install_async_client() -> None:
         _aio_grpc_channel = _aio_channel.Channel
@@ -474,7 +475,7 @@ def install_async() -> None:
                     interceptors = _sw_interceptors
                 super().__init__(target, options, credentials, compression, interceptors)
 
-        _aio_channel.Channel = _SWAioChannel
+        patch(_aio_channel, 'Channel', _SWAioChannel)
 
     install_async_client()
     install_async_server()
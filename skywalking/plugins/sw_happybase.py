@@ -16,6 +16,7 @@
 #
 
 from skywalking import Layer, Component
+from skywalking.plugins import patch
 from skywalking.trace.context import get_context
 from skywalking.trace.tags import TagDbType, TagDbStatement
 
@@ -121,10 +122,10 @@ def install():
 
         _sw_hbase_opt(this, 'delete', __sw_delete, row, False)
 
-    Table.row = _sw_row
-    Table.rows = _sw_rows
-    Table.cells = _sw_cells
-    Table.scan = _sw_scan
-    Table.put = _sw_put
-    Table.delete = _sw_delete
-    Connection.create_table = _sw_create_table
+    patch(Table, 'row', _sw_row)
+    patch(Table, 'rows', _sw_rows)
+    patch(Table, 'cells', _sw_cells)
+    patch(Table, 'scan', _sw_scan)
+    patch(Table, 'put', _sw_put)
+    patch(Table, 'delete', _sw_delete)
+    patch(Connection, 'create_table', _sw_create_table)
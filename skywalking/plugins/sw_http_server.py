@@ -18,6 +18,8 @@
 import inspect
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
+from skywalking.trace import endpoint
 from skywalking.trace.carrier import Carrier
 from skywalking.trace.context import get_context, NoopContext
 from skywalking.trace.span import NoopSpan
@@ -49,7 +51,7 @@ def install():
             wrap_default_request_handler(handler)
         _handle(handler)
 
-    BaseHTTPRequestHandler.handle = _sw_handle
+    patch(BaseHTTPRequestHandler, 'handle', _sw_handle)
 
     def _sw_send_response_only(self, code, *args, **kwargs):
         self._status_code = code
@@ -57,7 +59,7 @@ def install():
         return _send_response_only(self, code, *args, **kwargs)
 
     _send_response_only = BaseHTTPRequestHandler.send_response_only
-    BaseHTTPRequestHandler.send_response_only = _sw_send_response_only
+    patch(BaseHTTPRequestHandler, 'send_response_only', _sw_send_response_only)
 
 
 def wrap_werkzeug_request_handler(handler):
@@ -75,7 +77,7 @@ def wrap_werkzeug_request_handler(handler):
         path = handler.path or '/'
 
         span = NoopSpan(NoopContext()) if config.ignore_http_method_check(method) \
-            else get_context().new_entry_span(op=path.split('?')[0], carrier=carrier)
+            else get_context().new_entry_span(op=endpoint.normalize(path.split('?')[0]), carrier=carrier)
 
         with span:
             url = f"http://{handler.headers['Host']}{path}" if 'Host' in handler.headers else path
@@ -106,8 +108,8 @@ def wrap_werkzeug_request_handler(handler):
 
     if not getattr(WSGIRequestHandler, '_sw_wrapped', False):
         _send_response = WSGIRequestHandler.send_response
-        WSGIRequestHandler.send_response = _sw_send_response
-        WSGIRequestHandler._sw_wrapped = True
+        patch(WSGIRequestHandler, 'send_response', _sw_send_response)
+        patch(WSGIRequestHandler, '_sw_wrapped', True)
 
 
 def wrap_default_request_handler(handler):
@@ -127,7 +129,7 @@ def _wrap_do_method(handler, method):
             path = handler.path or '/'
 
             span = NoopSpan(NoopContext()) if config.ignore_http_method_check(method) \
-                else get_context().new_entry_span(op=path.split('?')[0], carrier=carrier)
+                else get_context().new_entry_span(op=endpoint.normalize(path.split('?')[0]), carrier=carrier)
 
             with span:
                 url = f"http://{handler.headers['Host']}{path}" if 'Host' in handler.headers else path
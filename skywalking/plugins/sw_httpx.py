@@ -16,6 +16,7 @@
 #
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
 from skywalking.trace.context import get_context, NoopContext
 from skywalking.trace.span import NoopSpan
 from skywalking.trace.tags import TagHttpMethod, TagHttpURL, TagHttpStatusCode
@@ -69,7 +70,7 @@ def install():
 
             return res
 
-    _client.AsyncClient.send = _sw_async_send
+    patch(_client.AsyncClient, 'send', _sw_async_send)
 
     def _sw_send(self, request, *, stream=False, auth=USE_CLIENT_DEFAULT, follow_redirects=USE_CLIENT_DEFAULT, ):
         url_object = request.url
@@ -101,4 +102,4 @@ def install():
 
             return res
 
-    _client.Client.send = _sw_send
+    patch(_client.Client, 'send', _sw_send)
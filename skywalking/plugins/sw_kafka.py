@@ -17,6 +17,7 @@
 
 from skywalking import Layer, Component
 from skywalking import config
+from skywalking.plugins import patch
 from skywalking.trace.carrier import Carrier
 from skywalking.trace.context import get_context
 from skywalking.trace.tags import TagMqBroker, TagMqTopic
@@ -38,8 +39,8 @@ def install():
 
     _send = KafkaProducer.send
     __poll_once = KafkaConsumer._poll_once
-    KafkaProducer.send = _sw_send_func(_send)
-    KafkaConsumer._poll_once = _sw__poll_once_func(__poll_once)
+    patch(KafkaProducer, 'send', _sw_send_func(_send))
+    patch(KafkaConsumer, '_poll_once', _sw__poll_once_func(__poll_once))
 
 
 def _sw__poll_once_func(__poll_once):
@@ -47,31 +48,35 @@ def _sw__poll_once_func(__poll_once):
         res = __poll_once(this, timeout_ms, max_records, update_offsets=update_offsets)
         if res:
             brokers = ';'.join(this.config['bootstrap_servers'])
-            context = get_context()
             topics = ';'.join(this._subscription.subscription
                               or [t.topic for t in this._subscription._user_assignment])
 
-            with context.new_entry_span(
-                    op=f"Kafka/{topics}/Consumer/{this.config['group_id'] or ''}") as span:
-                for consumer_records in res.values():
-                    for record in consumer_records:
-                        carrier = Carrier()
-                        for item in carrier:
-                            for header in record.headers:
-                                if item.key == header[0]:
-                                    item.val = str(header[1])
-
-                        span.extract(carrier)
-                    span.tag(TagMqBroker(brokers))
-                    span.tag(TagMqTopic(topics))
-                    span.layer = Layer.MQ
-                    span.component = Component.KafkaConsumer
+            op = f"Kafka/{topics}/Consumer/{this.config['group_id'] or ''}"
+            records = [record for consumer_records in res.values() for record in consumer_records]
+
+            if len(records) <= config.plugin_mq_consumer_span_per_message_max:
+                for record in records:
+                    with get_context().new_entry_span(op=op, carrier=Carrier.from_headers(dict(record.headers))) \
+                            as span:
+                        _tag_consumer_span(span, brokers, topics)
+            else:
+                with get_context().new_entry_span(op=op) as span:
+                    for record in records:
+                        span.extract(Carrier.from_headers(dict(record.headers)))
+                    _tag_consumer_span(span, brokers, topics)
 
         return res
 
     return _sw__poll_once
 
 
+def _tag_consumer_span(span, brokers, topics):
+    span.tag(TagMqBroker(brokers))
+    span.tag(TagMqTopic(topics))
+    span.layer = Layer.MQ
+    span.component = Component.KafkaConsumer
+
+
 def _sw_send_func(_send):
     def _sw_send(this, topic, value=None, key=None, headers=None, partition=None, timestamp_ms=None):
         # ignore trace, log and meter reporter - skywalking self request
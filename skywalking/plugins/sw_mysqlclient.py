@@ -16,7 +16,9 @@
 #
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
 from skywalking.trace.context import get_context
+from skywalking.trace.statement import statement
 from skywalking.trace.tags import TagDbType, TagDbInstance, TagDbStatement, TagDbSqlParameters
 
 link_vector = ['https://mysqlclient.readthedocs.io/']
@@ -62,7 +64,7 @@ def install():
                 span.layer = Layer.Database
                 span.tag(TagDbType('mysql'))
                 span.tag(TagDbInstance((self.connection.db or '')))
-                span.tag(TagDbStatement(query))
+                span.tag(TagDbStatement(statement(query)))
 
                 if config.plugin_sql_parameters_max_length and args:
                     parameter = ','.join([str(arg) for arg in args])
@@ -84,4 +86,4 @@ def install():
         def cursor(self, cursorclass=None):
             return ProxyCursor(self._self_conn.cursor(cursorclass))
 
-    MySQLdb.connect = _sw_connect
+    patch(MySQLdb, 'connect', _sw_connect)
@@ -18,6 +18,7 @@
 import json
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
 from skywalking.trace.context import get_context
 from skywalking.trace.tags import TagDbType, TagDbInstance, TagDbStatement, TagDbSqlParameters
 
@@ -90,7 +91,7 @@ def install():
             _archive_span(span, self._database, query, parameters, **kwargs)
             return await _async_transaction_run(self, query, parameters, **kwargs)
 
-    Session.run = _sw_session_run
-    AsyncSession.run = _sw_async_session_run
-    TransactionBase.run = _sw_transaction_run
-    AsyncTransactionBase.run = _sw_async_transaction_run
+    patch(Session, 'run', _sw_session_run)
+    patch(AsyncSession, 'run', _sw_async_session_run)
+    patch(TransactionBase, 'run', _sw_transaction_run)
+    patch(AsyncTransactionBase, 'run', _sw_async_transaction_run)
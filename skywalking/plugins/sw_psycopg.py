@@ -16,7 +16,9 @@
 #
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
 from skywalking.trace.context import get_context
+from skywalking.trace.statement import statement
 from skywalking.trace.tags import TagDbType, TagDbInstance, TagDbStatement, TagDbSqlParameters
 
 link_vector = ['https://www.psycopg.org/']
@@ -56,7 +58,7 @@ def install_sync():
 
                 span.tag(TagDbType('PostgreSQL'))
                 span.tag(TagDbInstance(dsn['dbname']))
-                span.tag(TagDbStatement(query))
+                span.tag(TagDbStatement(statement(query)))
 
                 if config.plugin_sql_parameters_max_length and vars is not None:
                     text = ','.join(str(v) for v in vars)
@@ -79,7 +81,7 @@ def install_sync():
 
                 span.tag(TagDbType('PostgreSQL'))
                 span.tag(TagDbInstance(dsn['dbname']))
-                span.tag(TagDbStatement(query))
+                span.tag(TagDbStatement(statement(query)))
 
                 if config.plugin_sql_parameters_max_length:
                     max_len = config.plugin_sql_parameters_max_length
@@ -112,7 +114,7 @@ def install_sync():
 
                 span.tag(TagDbType('PostgreSQL'))
                 span.tag(TagDbInstance(dsn['dbname']))
-                span.tag(TagDbStatement(query))
+                span.tag(TagDbStatement(statement(query)))
 
                 if config.plugin_sql_parameters_max_length and vars is not None:
                     text = ','.join(str(v) for v in vars)
@@ -140,8 +142,8 @@ def install_sync():
         return ProxyConnection(_connect(*args, **kwargs))
 
     _connect = psycopg.Connection.connect
-    psycopg.Connection.connect = connect
-    psycopg.connect = connect
+    patch(psycopg.Connection, 'connect', connect)
+    patch(psycopg, 'connect', connect)
 
 
 def install_async():
@@ -171,7 +173,7 @@ def install_async():
 
                 span.tag(TagDbType('PostgreSQL'))
                 span.tag(TagDbInstance(dsn['dbname']))
-                span.tag(TagDbStatement(query))
+                span.tag(TagDbStatement(statement(query)))
 
                 if config.plugin_sql_parameters_max_length and vars is not None:
                     text = ','.join(str(v) for v in vars)
@@ -194,7 +196,7 @@ def install_async():
 
                 span.tag(TagDbType('PostgreSQL'))
                 span.tag(TagDbInstance(dsn['dbname']))
-                span.tag(TagDbStatement(query))
+                span.tag(TagDbStatement(statement(query)))
 
                 if config.plugin_sql_parameters_max_length:
                     max_len = config.plugin_sql_parameters_max_length
@@ -227,7 +229,7 @@ def install_async():
 
                 span.tag(TagDbType('PostgreSQL'))
                 span.tag(TagDbInstance(dsn['dbname']))
-                span.tag(TagDbStatement(query))
+                span.tag(TagDbStatement(statement(query)))
 
                 if config.plugin_sql_parameters_max_length and vars is not None:
                     text = ','.join(str(v) for v in vars)
@@ -259,7 +261,7 @@ def install_async():
         return ProxyAsyncConnection(await _aconnect(*args, **kwargs))
 
     _aconnect = psycopg.AsyncConnection.connect
-    psycopg.AsyncConnection.connect = aconnect
+    patch(psycopg.AsyncConnection, 'connect', aconnect)
 
 
 def install():
@@ -16,7 +16,9 @@
 #
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
 from skywalking.trace.context import get_context
+from skywalking.trace.statement import statement
 from skywalking.trace.tags import TagDbType, TagDbInstance, TagDbStatement, TagDbSqlParameters
 
 link_vector = ['https://www.psycopg.org/']
@@ -51,7 +53,7 @@ def install():
 
                 span.tag(TagDbType('PostgreSQL'))
                 span.tag(TagDbInstance(dsn['dbname']))
-                span.tag(TagDbStatement(query))
+                span.tag(TagDbStatement(statement(query)))
 
                 if config.plugin_sql_parameters_max_length and vars is not None:
                     text = ','.join(str(v) for v in vars)
@@ -73,7 +75,7 @@ def install():
 
                 span.tag(TagDbType('PostgreSQL'))
                 span.tag(TagDbInstance(dsn['dbname']))
-                span.tag(TagDbStatement(query))
+                span.tag(TagDbStatement(statement(query)))
 
                 if config.plugin_sql_parameters_max_length:
                     max_len = config.plugin_sql_parameters_max_length
@@ -126,7 +128,7 @@ def install():
         return ProxyConnection(_connect(*args, **kwargs))
 
     _connect = psycopg2.connect
-    psycopg2.connect = connect
+    patch(psycopg2, 'connect', connect)
 
     try:  # try to instrument register_type which will fail if it gets a wrapped cursor or connection
         from psycopg2._psycopg import register_type as _register_type
@@ -143,7 +145,7 @@ def install():
             import psycopg2._ipaddress
 
             if psycopg2._ipaddress.register_type is _register_type:
-                psycopg2._ipaddress.register_type = register_type
+                patch(psycopg2._ipaddress, 'register_type', register_type)
 
         except Exception:
             pass
@@ -152,7 +154,7 @@ def install():
             import psycopg2._ipaddress
 
             if psycopg2._json.register_type is _register_type:
-                psycopg2._json.register_type = register_type
+                patch(psycopg2._json, 'register_type', register_type)
 
         except Exception:
             pass
@@ -161,7 +163,7 @@ def install():
             import psycopg2._ipaddress
 
             if psycopg2._range.register_type is _register_type:
-                psycopg2._range.register_type = register_type
+                patch(psycopg2._range, 'register_type', register_type)
 
         except Exception:
             pass
@@ -170,7 +172,7 @@ def install():
             import psycopg2._ipaddress
 
             if psycopg2.extensions.register_type is _register_type:
-                psycopg2.extensions.register_type = register_type
+                patch(psycopg2.extensions, 'register_type', register_type)
 
         except Exception:
             pass
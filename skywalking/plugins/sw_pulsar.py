@@ -14,7 +14,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-from skywalking import Layer, Component
+from skywalking import Layer, Component, config
+from skywalking.plugins import patch
 from skywalking.trace.carrier import Carrier
 from skywalking.trace.context import get_context
 from skywalking.trace.tags import TagMqTopic, TagMqBroker
@@ -86,23 +87,41 @@ def install():
             res = _receive(this, timeout_millis=timeout_millis)
             if res:
                 topic = res.topic_name().split('/')[-1]
-                properties = res.properties()
-                carrier = Carrier()
-                for item in carrier:
-                    if item.key in properties.keys():
-                        val = res.properties().get(item.key)
-                        if val is not None:
-                            item.val = val
-
-                with get_context().new_entry_span(op=f'Pulsar/Topic/{topic}/Consumer', carrier=carrier) as span:
-                    span.tag(TagMqTopic(topic))
-                    span.tag(TagMqBroker(get_peer()))
-                    span.layer = Layer.MQ
-                    span.component = Component.PulsarConsumer
+                with get_context().new_entry_span(op=f'Pulsar/Topic/{topic}/Consumer',
+                                                  carrier=Carrier.from_headers(res.properties())) as span:
+                    _tag_consumer_span(span, topic)
             return res
 
         return _sw_receive
 
-    Client.__init__ = _sw_init
-    Producer.send = _sw_send_func(_send)
-    Consumer.receive = _sw_receive_func(_receive)
+    def _sw_batch_receive_func(_batch_receive):
+        def _sw_batch_receive(this):
+            res = _batch_receive(this)
+            messages = list(res or ())
+            if len(messages) <= config.plugin_mq_consumer_span_per_message_max:
+                for message in messages:
+                    topic = message.topic_name().split('/')[-1]
+                    with get_context().new_entry_span(op=f'Pulsar/Topic/{topic}/Consumer',
+                                                      carrier=Carrier.from_headers(message.properties())) as span:
+                        _tag_consumer_span(span, topic)
+            else:  # one span for the batch, referring to the traces of all its messages
+                topic = ';'.join(sorted({message.topic_name().split('/')[-1] for message in messages}))
+                with get_context().new_entry_span(op=f'Pulsar/Topic/{topic}/Consumer') as span:
+                    for message in messages:
+                        span.extract(Carrier.from_headers(message.properties()))
+                    _tag_consumer_span(span, topic)
+            return res
+
+        return _sw_batch_receive
+
+    def _tag_consumer_span(span, topic):
+        span.tag(TagMqTopic(topic))
+        span.tag(TagMqBroker(get_peer()))
+        span.layer = Layer.MQ
+        span.component = Component.PulsarConsumer
+
+    patch(Client, '__init__', _sw_init)
+    patch(Producer, 'send', _sw_send_func(_send))
+    patch(Consumer, 'receive', _sw_receive_func(_receive))
+    if hasattr(Consumer, 'batch_receive'):
+        patch(Consumer, 'batch_receive', _sw_batch_receive_func(Consumer.batch_receive))
@@ -16,6 +16,7 @@
 #
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
 from skywalking.trace.context import get_context
 from skywalking.trace.tags import TagDbType, TagDbInstance, TagDbStatement
 
@@ -79,7 +80,7 @@ def inject_socket_info(SocketInfo): # noqa
 
         return result
 
-    SocketInfo.command = _sw_command
+    patch(SocketInfo, 'command', _sw_command)
 
 
 def _get_filter(request_type, spec):
@@ -130,7 +131,7 @@ def inject_bulk_write(_Bulk, bulk_op_map): # noqa
 
             return bulk_result
 
-    _Bulk.execute = _sw_execute
+    patch(_Bulk, 'execute', _sw_execute)
 
 
 def inject_cursor(Cursor): # noqa
@@ -160,4 +161,4 @@ def inject_cursor(Cursor): # noqa
 
             return
 
-    Cursor._Cursor__send_message = _sw_send_message
+    patch(Cursor, '_Cursor__send_message', _sw_send_message)
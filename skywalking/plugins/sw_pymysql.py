@@ -16,7 +16,9 @@
 #
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
 from skywalking.trace.context import get_context
+from skywalking.trace.statement import statement
 from skywalking.trace.tags import TagDbType, TagDbInstance, TagDbStatement, TagDbSqlParameters
 
 link_vector = ['https://pymysql.readthedocs.io/en/latest/']
@@ -43,7 +45,7 @@ def install():
 
             span.tag(TagDbType('mysql'))
             span.tag(TagDbInstance((this.connection.db or b'').decode('utf-8')))
-            span.tag(TagDbStatement(query))
+            span.tag(TagDbStatement(statement(query)))
 
             if config.plugin_sql_parameters_max_length and args:
                 parameter = ','.join([str(arg) for arg in args])
@@ -53,4 +55,4 @@ def install():
 
             return res
 
-    Cursor.execute = _sw_execute
+    patch(Cursor, 'execute', _sw_execute)
@@ -16,6 +16,8 @@
 #
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
+from skywalking.trace import endpoint
 from skywalking.trace.carrier import Carrier
 from skywalking.trace.context import get_context, NoopContext
 from skywalking.trace.span import NoopSpan
@@ -45,7 +47,7 @@ def install():
                 item.val = val
 
         span = NoopSpan(NoopContext()) if config.ignore_http_method_check(method) \
-            else get_context().new_entry_span(op=request.path, carrier=carrier)
+            else get_context().new_entry_span(op=endpoint.normalize(request.path), carrier=carrier)
 
         with span:
             span.layer = Layer.Http
@@ -65,4 +67,4 @@ def install():
         return resp
 
     _invoke_request = Router.invoke_request
-    Router.invoke_request = _sw_invoke_request
+    patch(Router, 'invoke_request', _sw_invoke_request)
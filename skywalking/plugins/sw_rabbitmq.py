@@ -16,6 +16,7 @@
 #
 
 from skywalking import Layer, Component
+from skywalking.plugins import patch
 from skywalking.trace.carrier import Carrier
 from skywalking.trace.context import get_context
 from skywalking.trace.tags import TagMqBroker, TagMqTopic, TagMqQueue
@@ -33,11 +34,11 @@ def install():
     from pika.channel import Channel
     from pika.adapters.blocking_connection import BlockingChannel
 
-    Channel.basic_publish = _sw_basic_publish_func(Channel.basic_publish)
-    Channel._on_deliver = _sw__on_deliver_func(Channel._on_deliver)
-    BlockingChannel.basic_consume = _sw_blocking_basic_consume_func(BlockingChannel.basic_consume)
-    BlockingChannel.basic_get = _sw_blocking_basic_get_func(BlockingChannel.basic_get)
-    BlockingChannel.consume = _sw_blocking_consume_func(BlockingChannel.consume)
+    patch(Channel, 'basic_publish', _sw_basic_publish_func(Channel.basic_publish))
+    patch(Channel, '_on_deliver', _sw__on_deliver_func(Channel._on_deliver))
+    patch(BlockingChannel, 'basic_consume', _sw_blocking_basic_consume_func(BlockingChannel.basic_consume))
+    patch(BlockingChannel, 'basic_get', _sw_blocking_basic_get_func(BlockingChannel.basic_get))
+    patch(BlockingChannel, 'consume', _sw_blocking_consume_func(BlockingChannel.consume))
 
 
 def _sw_basic_publish_func(_basic_publish):
@@ -104,13 +105,7 @@ def _sw__on_deliver_func(__on_deliver):
         context = get_context()
         exchange = method_frame.method.exchange
         routing_key = method_frame.method.routing_key
-        carrier = Carrier()
-        for item in carrier:
-            try:
-                if item.key in header_frame.properties.headers:
-                    item.val = header_frame.properties.headers[item.key]
-            except TypeError:
-                pass
+        carrier = Carrier.from_headers(header_frame.properties.headers)
 
         with context.new_entry_span(op='RabbitMQ/Topic/' + exchange + '/Queue/' + routing_key
                                        + '/Consumer' or '', carrier=carrier) as span:
@@ -135,13 +130,7 @@ def _sw_callback_func(callback):
         context = get_context()
         exchange = method.exchange
         routing_key = method.routing_key
-        carrier = Carrier()
-        for item in carrier:
-            try:
-                if item.key in properties.headers:
-                    item.val = properties.headers[item.key]
-            except TypeError:
-                pass
+        carrier = Carrier.from_headers(properties.headers)
 
         with context.new_entry_span(op='RabbitMQ/Topic/' + exchange + '/Queue/' + routing_key
                                     + '/Consumer' or '', carrier=carrier) as span:
@@ -16,6 +16,7 @@
 #
 
 from skywalking import Layer, Component
+from skywalking.plugins import patch
 from skywalking.trace.context import get_context
 from skywalking.trace.tags import TagCacheType, TagCacheOp, TagCacheCmd, TagCacheKey
 
@@ -77,4 +78,4 @@ def install():
 
             return res
 
-    Connection.send_command = _sw_send_command
+    patch(Connection, 'send_command', _sw_send_command)
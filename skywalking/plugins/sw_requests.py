@@ -16,6 +16,7 @@
 #
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
 from skywalking.trace.context import get_context, NoopContext
 from skywalking.trace.span import NoopSpan
 from skywalking.trace.tags import TagHttpMethod, TagHttpURL, TagHttpStatusCode
@@ -76,4 +77,4 @@ def install():
 
             return res
 
-    Session.request = _sw_request
+    patch(Session, 'request', _sw_request)
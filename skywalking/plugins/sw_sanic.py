@@ -17,6 +17,8 @@
 import logging
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
+from skywalking.trace import endpoint
 from skywalking.trace.carrier import Carrier
 from skywalking.trace.context import get_context, NoopContext
 from skywalking.trace.span import NoopSpan
@@ -65,9 +67,9 @@ def install():
 
         return _handlers_ErrorHandler_response(self, req, e)
 
-    response.format_http1_response = _sw_format_http1_response
-    Sanic.handle_request = _gen_sw_handle_request(_handle_request)
-    handlers.ErrorHandler.response = _sw_handlers_ErrorHandler_response
+    patch(response, 'format_http1_response', _sw_format_http1_response)
+    patch(Sanic, 'handle_request', _gen_sw_handle_request(_handle_request))
+    patch(handlers.ErrorHandler, 'response', _sw_handlers_ErrorHandler_response)
 
 
 def _gen_sw_handle_request(_handle_request):
@@ -86,7 +88,7 @@ def _gen_sw_handle_request(_handle_request):
                 item.val = req.headers[item.key.capitalize()]
 
         span = NoopSpan(NoopContext()) if config.ignore_http_method_check(method) \
-            else get_context().new_entry_span(op=req.path, carrier=carrier)
+            else get_context().new_entry_span(op=endpoint.normalize(req.path), carrier=carrier)
 
         with span:
             span.layer = Layer.Http
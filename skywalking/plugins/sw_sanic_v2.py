@@ -18,6 +18,8 @@
 import logging
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
+from skywalking.trace import endpoint
 from skywalking.trace.carrier import Carrier
 from skywalking.trace.context import get_context, NoopContext
 from skywalking.trace.span import NoopSpan
@@ -53,7 +55,7 @@ def install():
         _original_init(self, *args, **kwargs)
         _register_listeners(self)
 
-    Sanic.__init__ = _sw_init
+    patch(Sanic, '__init__', _sw_init)
 
 
 def _register_listeners(app):
@@ -71,7 +73,7 @@ def _register_listeners(app):
                 item.val = request.headers[item.key.capitalize()]
 
         span = NoopSpan(NoopContext()) if config.ignore_http_method_check(method) \
-            else get_context().new_entry_span(op=request.path, carrier=carrier)
+            else get_context().new_entry_span(op=endpoint.normalize(request.path), carrier=carrier)
 
         span.start()
         span.layer = Layer.Http
@@ -18,6 +18,8 @@
 from inspect import iscoroutinefunction, isawaitable
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
+from skywalking.trace import endpoint
 from skywalking.trace.carrier import Carrier
 from skywalking.trace.context import get_context, NoopContext
 from skywalking.trace.span import NoopSpan
@@ -41,7 +43,7 @@ def install():
     from tornado.web import RequestHandler
     old_execute = RequestHandler._execute
     old_log_exception = RequestHandler.log_exception
-    RequestHandler._execute = _gen_sw_get_response_func(old_execute)
+    patch(RequestHandler, '_execute', _gen_sw_get_response_func(old_execute))
 
     def _sw_handler_uncaught_exception(self: RequestHandler, ty, value, tb, *args, **kwargs):
         if value is not None:
@@ -51,7 +53,7 @@ def install():
 
         return old_log_exception(self, ty, value, tb, *args, **kwargs)
 
-    RequestHandler.log_exception = _sw_handler_uncaught_exception
+    patch(RequestHandler, 'log_exception', _sw_handler_uncaught_exception)
 
 
 def _gen_sw_get_response_func(old_execute):
@@ -71,7 +73,7 @@ def _gen_sw_get_response_func(old_execute):
                     item.val = request.headers[item.key.capitalize()]
 
             span = NoopSpan(NoopContext()) if config.ignore_http_method_check(method) \
-                else get_context().new_entry_span(op=request.path, carrier=carrier)
+                else get_context().new_entry_span(op=endpoint.normalize(request.path), carrier=carrier)
 
             with span:
                 span.layer = Layer.Http
@@ -105,7 +107,7 @@ def _gen_sw_get_response_func(old_execute):
                     item.val = request.headers[item.key.capitalize()]
 
             span = NoopSpan(NoopContext()) if config.ignore_http_method_check(method) \
-                else get_context().new_entry_span(op=request.path, carrier=carrier)
+                else get_context().new_entry_span(op=endpoint.normalize(request.path), carrier=carrier)
 
             with span:
                 span.layer = Layer.Http
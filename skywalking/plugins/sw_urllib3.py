@@ -16,6 +16,7 @@
 #
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
 from skywalking.trace.context import get_context, NoopContext
 from skywalking.trace.span import NoopSpan
 from skywalking.trace.tags import TagHttpMethod, TagHttpURL, TagHttpStatusCode
@@ -64,4 +65,4 @@ def install():
 
             return res
 
-    RequestMethods.request = _sw_request
+    patch(RequestMethods, 'request', _sw_request)
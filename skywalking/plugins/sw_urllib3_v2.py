@@ -16,6 +16,7 @@
 #
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
 from skywalking.trace.context import get_context, NoopContext
 from skywalking.trace.span import NoopSpan
 from skywalking.trace.tags import TagHttpMethod, TagHttpURL, TagHttpStatusCode
@@ -74,4 +75,4 @@ def install():
 
             return res
 
-    PoolManager.request = _sw_request
+    patch(PoolManager, 'request', _sw_request)
@@ -18,6 +18,7 @@
 from urllib.request import Request
 
 from skywalking import Layer, Component, config
+from skywalking.plugins import patch
 from skywalking.trace.context import get_context, NoopContext
 from skywalking.trace.span import NoopSpan
 from skywalking.trace.tags import TagHttpMethod, TagHttpURL, TagHttpStatusCode
@@ -74,4 +75,4 @@ def install():
 
             return res
 
-    OpenerDirector.open = _sw_open
+    patch(OpenerDirector, 'open', _sw_open)
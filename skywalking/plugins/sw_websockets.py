@@ -15,6 +15,7 @@
 # limitations under the License.
 #
 from skywalking import Layer, Component
+from skywalking.plugins import patch
 from skywalking.trace.context import get_context
 from skywalking.trace.tags import TagHttpMethod, TagHttpURL, TagHttpStatusMsg
 
@@ -91,7 +92,7 @@ def _install_legacy_client(WebSocketClientProtocol):  # noqa
             finally:
                 span.tag(TagHttpStatusMsg(status_msg))
 
-    WebSocketClientProtocol.handshake = _sw_protocol_handshake_client
+    patch(WebSocketClientProtocol, 'handshake', _sw_protocol_handshake_client)
 
 
 def _install_new_client(ClientConnection):  # noqa
@@ -131,7 +132,7 @@ def _install_new_client(ClientConnection):  # noqa
             finally:
                 span.tag(TagHttpStatusMsg(status_msg))
 
-    ClientConnection.handshake = _sw_connection_handshake
+    patch(ClientConnection, 'handshake', _sw_connection_handshake)
 
     # To trace per message transactions
     # _send = WebSocketCommonProtocol.send
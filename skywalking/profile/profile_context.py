@@ -19,8 +19,8 @@ import sys
 import time
 import traceback
 
-from threading import Thread, Event, current_thread
-from typing import Optional
+from threading import Thread, Event, current_thread, get_ident
+from typing import Dict, List, Optional
 
 from skywalking.agent import agent
 from skywalking import config
@@ -30,8 +30,6 @@ from skywalking.profile.profile_status import ProfileStatusReference, ProfileSta
 from skywalking.profile.profile_task import ProfileTask
 from skywalking.profile.snapshot import TracingThreadSnapshot
 from skywalking.trace.context import SpanContext
-from skywalking.utils.array import AtomicArray
-from skywalking.utils.integer import AtomicInteger
 from skywalking.utils.time import current_milli_time
 
 
@@ -50,12 +48,31 @@ except ImportError:
     logger.debug("Gevent does\'t exist, using threading model")
 
 
+def dump_stack(frame) -> List[str]:
+    """
+    The code signatures of the frames of a stack, from the outermost one, as profile snapshots report them.
+    """
+    stack_list = []
+    for idx, item in enumerate(traceback.extract_stack(frame)):
+        if idx > config.agent_profile_dump_max_stack_depth:
+            break
+
+        stack_list.append(f'{item.filename}.{item.name}: {item.lineno}')
+    return stack_list
+
+
+def _slot_key() -> int:
+    return id(greenlet.getcurrent()) if THREAD_MODEL == 'greenlet' else get_ident()
+
+
 class ProfileTaskExecutionContext:
     def __init__(self, task: ProfileTask):
         self.task = task  # type: ProfileTask
-        self._current_profiling_cnt = AtomicInteger(var=0)
-        self._total_started_profiling_cnt = AtomicInteger(var=0)
-        self.profiling_segment_slots = AtomicArray(length=config.agent_profile_max_parallel)
+        # only incremented by the thread taking the snapshots, or by greenlets of a single thread
+        self._total_started_profiling_cnt = 0
+        # the profilers keyed by the ident of the thread (or greenlet) they profile, single dict operations are
+        # atomic so no lock is taken, and a thread profiles at most one trace at a time
+        self.profiling_segment_slots: Dict[int, 'ThreadProfiler'] = {}
         self._profiling_thread = None  # type: Optional[Thread]
         self._profiling_stop_event = None  # type: Optional[Event]
 
@@ -73,8 +90,8 @@ class ProfileTaskExecutionContext:
 
     def stop_profiling(self):
         if THREAD_MODEL == 'greenlet':
-            for profiler in self.profiling_segment_slots:
-                if profiler and isinstance(profiler, GreenletProfiler):
+            for profiler in list(self.profiling_segment_slots.values()):
+                if isinstance(profiler, GreenletProfiler):
                     profiler.stop_profiling()
 
         else:
@@ -91,8 +108,8 @@ class ProfileTaskExecutionContext:
         """
 
         # check has available slot
-        using_slot_cnt = self._current_profiling_cnt.get()
-        if using_slot_cnt >= config.agent_profile_max_parallel:
+        slots = self.profiling_segment_slots
+        if len(slots) >= config.agent_profile_max_parallel:
             return ProfileStatusReference.create_with_none()
 
         # check first operation name matches
@@ -100,12 +117,11 @@ class ProfileTaskExecutionContext:
             return ProfileStatusReference.create_with_none()
 
         # if out limit started profiling count then stop add profiling
-        if self._total_started_profiling_cnt.get() > self.task.max_sampling_count:
+        if self._total_started_profiling_cnt > self.task.max_sampling_count:
             return ProfileStatusReference.create_with_none()
 
-        # try to occupy slot
-        if not self._current_profiling_cnt.compare_and_set(using_slot_cnt,
-                                                           using_slot_cnt + 1):
+        key = _slot_key()
+        if key in slots:  # this thread is already profiled for another trace
             return ProfileStatusReference.create_with_none()
 
         if THREAD_MODEL == 'greenlet':
@@ -116,7 +132,6 @@ class ProfileTaskExecutionContext:
                 profiling_thread=curr,
                 profile_context=self,
             )
-            thread_profiler.start_profiling(self)
 
         else:
             # default is thread
@@ -127,15 +142,20 @@ class ProfileTaskExecutionContext:
                 profile_context=self,
             )
 
-        slot_length = self.profiling_segment_slots.length()
-        for idx in range(slot_length):
-            # occupy slot success
-            if self.profiling_segment_slots.compare_and_set(idx, None, thread_profiler):
-                return thread_profiler.profile_status
+        # try to occupy slot, give it back if other threads took the last ones meanwhile
+        slots[key] = thread_profiler
+        if len(slots) > config.agent_profile_max_parallel:
+            slots.pop(key, None)
+            return ProfileStatusReference.create_with_none()
+
+        if THREAD_MODEL == 'greenlet':
+            thread_profiler.start_profiling(self)
 
-        return ProfileStatusReference.create_with_none()
+        return thread_profiler.profile_status
 
     def profiling_recheck(self, trace_context: SpanContext, segment_id: str, first_span_opname: str):
+        if trace_context.profile_status is None:  # the task started after the first entry span of the trace
+            trace_context.profile_status = ProfileStatusReference.create_with_none()
         if trace_context.profile_status.is_being_watched():
             return
 
@@ -148,15 +168,17 @@ class ProfileTaskExecutionContext:
         """
         find tracing context and clear on slot
         """
-        for idx, profiler in enumerate(self.profiling_segment_slots):
-            if profiler and profiler.matches(trace_context):
-                self.profiling_segment_slots.set(idx, None)
-                profiler.stop_profiling()
-                self._current_profiling_cnt.add_and_get(-1)
-                break
+        slots = self.profiling_segment_slots
+        key = _slot_key()  # a trace mostly ends on the thread it was profiled on
+        profiler = slots.get(key)
+        if profiler is None or not profiler.matches(trace_context):
+            key, profiler = next(((k, p) for k, p in list(slots.items()) if p.matches(trace_context)), (None, None))
+        if profiler is not None and slots.pop(key, None) is profiler:
+            profiler.stop_profiling()
 
     def is_start_profileable(self):
-        return self._total_started_profiling_cnt.add_and_get(1) <= self.task.max_sampling_count
+        self._total_started_profiling_cnt += 1
+        return self._total_started_profiling_cnt <= self.task.max_sampling_count
 
 
 class ProfileThread:
@@ -180,10 +202,10 @@ class ProfileThread:
 
         while not self._stop_event.is_set():
             current_loop_start_time = current_milli_time()
-            profilers = self._task_execution_context.profiling_segment_slots
+            profilers = list(self._task_execution_context.profiling_segment_slots.values())
 
             for profiler in profilers:  # type: ThreadProfiler
-                if profiler is None or isinstance(profiler, GreenletProfiler):
+                if isinstance(profiler, GreenletProfiler):
                     continue
                 if profiler.profile_status.get() is ProfileStatus.PENDING:
                     profiler.start_profiling_if_need()
@@ -235,20 +257,12 @@ class ThreadProfiler:
 
         current_time = current_milli_time()
 
-        stack_list = []
-
         # get thread stack of target thread
         stack = sys._current_frames().get(int(self._profiling_thread.ident))
         if not stack:
             return None
 
-        extracted = traceback.extract_stack(stack)
-        for idx, item in enumerate(extracted):
-            if idx > config.agent_profile_dump_max_stack_depth:
-                break
-
-            code_sig = f'{item.filename}.{item.name}: {item.lineno}'
-            stack_list.append(code_sig)
+        stack_list = dump_stack(stack)
 
         # if is first dump, check is can start profiling
         if self.dump_sequence == 0 and not self._profile_context.is_start_profileable():
@@ -293,14 +307,7 @@ class GreenletProfiler:
         self.profile_status.update_status(ProfileStatus.STOPPED)
 
     def build_snapshot(self) -> Optional[TracingThreadSnapshot]:
-        stack_list = []
-        extracted = traceback.extract_stack(self._profiling_thread.gr_frame)
-        for idx, item in enumerate(extracted):
-            if idx > config.agent_profile_dump_max_stack_depth:
-                break
-
-            code_sig = f'{item.filename}.{item.name}: {item.lineno}'
-            stack_list.append(code_sig)
+        stack_list = dump_stack(self._profiling_thread.gr_frame)
 
         # if is first dump, check is can start profiling
         if (
@@ -16,9 +16,10 @@
 #
 
 from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from queue import Queue
 from threading import Timer, RLock, Lock
-from typing import Tuple
+from typing import Optional, Tuple
 
 from skywalking.agent import agent
 from skywalking.loggings import logger, logger_debug_enabled
@@ -27,19 +28,20 @@ from skywalking.profile.profile_context import ProfileTaskExecutionContext
 from skywalking.profile.profile_status import ProfileStatusReference
 from skywalking.profile.profile_task import ProfileTask
 from skywalking.trace.context import SpanContext
-from skywalking.utils.atomic_ref import AtomicRef
 from skywalking.utils.time import current_milli_time
 
 
 class Scheduler:
 
     @staticmethod
-    def schedule(milliseconds, func, *args, **kwargs):
-        seconds = milliseconds / 1000
-        if seconds < 0:
-            seconds = 0
+    def schedule(milliseconds, func, args=None, kwargs=None):
+        scheduler = getattr(agent, 'scheduler', None)
+        if scheduler is not None:  # runs once on the agent scheduler thread
+            scheduler.schedule(milliseconds / 1000, partial(func, *(args or ()), **(kwargs or {})))
+            return
 
-        t = Timer(seconds, func, *args, **kwargs)
+        # the asyncio agent has no scheduler thread
+        t = Timer(max(0.0, milliseconds / 1000), func, args, kwargs)
         t.daemon = True
         t.start()
 
@@ -56,7 +58,8 @@ class ProfileTaskExecutionService:
         self._last_command_create_time = -1  # type: int
         # single thread executor
         self.profile_executor = ThreadPoolExecutor(thread_name_prefix='profile-executor', max_workers=1)
-        self.task_execution_context = AtomicRef(None)
+        # only replaced under self._rlock, read without a lock by every entry span
+        self.task_execution_context: Optional[ProfileTaskExecutionContext] = None
 
         self.profile_task_scheduler = Scheduler()
 
@@ -107,7 +110,7 @@ class ProfileTaskExecutionService:
         self.profile_task_scheduler.schedule(delay_millis, self.process_profile_task, [task])
 
     def add_profiling(self, context: SpanContext, segment_id: str, first_span_opname: str) -> ProfileStatusReference:
-        execution_context = self.task_execution_context.get()  # type: ProfileTaskExecutionContext
+        execution_context = self.task_execution_context
         if execution_context is None:
             return ProfileStatusReference.create_with_none()
 
@@ -117,21 +120,29 @@ class ProfileTaskExecutionService:
         """
         Re-check current trace need profiling, in case that third-party plugins change the operation name.
         """
-        execution_context = self.task_execution_context.get()  # type: ProfileTaskExecutionContext
+        execution_context = self.task_execution_context
         if execution_context is None:
             return
         execution_context.profiling_recheck(trace_context, segment_id, first_span_opname)
 
+    def stop_tracing_profile(self, trace_context: SpanContext):
+        """
+        Release the slot of a finished trace, so that its thread is no longer dumped.
+        """
+        execution_context = self.task_execution_context
+        if execution_context is not None:
+            execution_context.stop_tracing_profile(trace_context)
+
     # using reentrant lock for process_profile_task and stop_current_profile_task,
     # to make sure thread safe.
     def process_profile_task(self, task: ProfileTask):
         with self._rlock:
             # make sure prev profile task already stopped
-            self.stop_current_profile_task(self.task_execution_context.get())
+            self.stop_current_profile_task(self.task_execution_context)
 
             # make stop task schedule and task context
             current_context = ProfileTaskExecutionContext(task)
-            self.task_execution_context.set(current_context)
+            self.task_execution_context = current_context
 
             # start profiling this task
             current_context.start_profiling()
@@ -144,8 +155,9 @@ class ProfileTaskExecutionService:
     def stop_current_profile_task(self, need_stop: ProfileTaskExecutionContext):
         with self._rlock:
             # need_stop is None or task_execution_context is not need_stop context
-            if need_stop is None or not self.task_execution_context.compare_and_set(need_stop, None):
+            if need_stop is None or self.task_execution_context is not need_stop:
                 return
+            self.task_execution_context = None
 
             need_stop.stop_profiling()
             if logger_debug_enabled:
@@ -21,6 +21,37 @@ from typing import Optional
 sampling_service = None
 
 
+def strategy() -> str:
+    """
+    The effective sampling strategy, empty if all traces are sampled.
+    """
+    from skywalking import config
+
+    return config.sample_strategy or ('n_per_3_secs' if config.sample_n_per_3_secs > 0 else '')
+
+
+def create_sampler():
+    """
+    Create the sampler of a strategy that needs no background work, None for `n_per_3_secs` or no sampling.
+    """
+    from skywalking import config
+    from skywalking.sampling.sampler import AdaptiveSampler, EndpointQuotaSampler, ProbabilisticSampler, \
+        TokenBucketSampler, parse_quotas
+
+    if strategy() == 'token_bucket':
+        return TokenBucketSampler(config.sample_rate_per_sec, config.sample_burst)
+    if strategy() == 'probabilistic':
+        return ProbabilisticSampler(config.sample_probability)
+    if strategy() == 'endpoint_quota':
+        return EndpointQuotaSampler(config.sample_rate_per_sec, parse_quotas(config.sample_endpoint_quotas),
+                                    config.sample_endpoint_max, config.sample_burst)
+    if strategy() == 'adaptive':
+        return AdaptiveSampler(config.sample_adaptive_overhead_budget / 100, config.sample_rate_per_sec,
+                               config.sample_adaptive_min_rate, config.sample_adaptive_max_rate,
+                               config.sample_adaptive_period)
+    return None
+
+
 def init(force: bool = False):
     """
     If the sampling service is not initialized, initialize it.
@@ -33,9 +64,25 @@ def init(force: bool = False):
     if sampling_service and not force:
         return
 
-    logger.debug('Initializing sampling service')
-    sampling_service = SamplingService()
-    sampling_service.start()
+    logger.debug('Initializing sampling service with strategy %s', strategy())
+    sampling_service = SamplingService() if strategy() == 'n_per_3_secs' else create_sampler()
+
+
+def reload():
+    """
+    Swap in a sampler built from the current configuration, e.g. after a dynamic configuration update. Readers take
+    `sampling_service` once per decision without a lock, so they see either the old sampler or the new one.
+    """
+    from skywalking import config
+    from skywalking.sampling.sampling_service import SamplingService
+
+    global sampling_service
+
+    if config.sample_strategy not in ('', 'n_per_3_secs', 'token_bucket', 'probabilistic', 'endpoint_quota',
+                                      'adaptive'):
+        raise ValueError(f'Unknown sampling strategy {config.sample_strategy}')
+    # the n_per_3_secs service resets its window lazily, in any thread or event loop
+    sampling_service = SamplingService() if strategy() == 'n_per_3_secs' else create_sampler()
 
 
 async def init_async(async_event: Optional[asyncio.Event] = None):
@@ -43,6 +90,12 @@ async def init_async(async_event: Optional[asyncio.Event] = None):
 
     global sampling_service
 
+    if strategy() != 'n_per_3_secs':
+        sampling_service = create_sampler()
+        if async_event is not None:
+            async_event.set()
+        return
+
     sampling_service = SamplingServiceAsync()
     if async_event is not None:
         async_event.set()
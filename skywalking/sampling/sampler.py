@@ -0,0 +1,213 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    from skywalking.trace.carrier import Carrier
+
+
+class Sampler(ABC):
+    """
+    Decides whether a new trace is recorded, when its first span is created.
+    """
+
+    def sample(self, op: str, carrier: Optional['Carrier'] = None) -> bool:
+        if carrier is not None and carrier.is_valid:  # the trace continues an upstream one, follow its decision
+            if carrier.sampled:
+                self.force_sampled(op)
+            return carrier.sampled
+        return self.try_sampling(op)
+
+    @abstractmethod
+    def try_sampling(self, op: Optional[str] = None) -> bool:
+        """
+        Whether a new trace starting with the operation op is sampled.
+        """
+
+    def force_sampled(self, op: Optional[str] = None) -> None:
+        """
+        Account for a trace sampled regardless of this sampler, e.g. because the upstream service sampled it.
+        """
+
+
+class TokenBucket:
+    """
+    A token bucket refilled lazily when tokens are taken, so it needs neither a thread nor a timer.
+    It takes no lock either: under contention a few more tokens than the rate may be handed out.
+    """
+
+    def __init__(self, rate: float, burst: float = 0):
+        self.rate = rate
+        self.capacity = burst or (max(1.0, rate) if rate > 0 else 0)
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+
+    def take(self, force: bool = False) -> bool:
+        now = time.monotonic()
+        tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        if tokens >= 1 or force:  # forced tokens are borrowed from the next refills
+            self.tokens = tokens - 1
+            return True
+        self.tokens = tokens
+        return False
+
+
+class TokenBucketSampler(Sampler):
+    def __init__(self, rate: float, burst: float = 0):
+        self.bucket = TokenBucket(rate, burst)
+
+    def try_sampling(self, op: Optional[str] = None) -> bool:
+        return self.bucket.take()
+
+    def force_sampled(self, op: Optional[str] = None) -> None:
+        self.bucket.take(force=True)
+
+
+class ProbabilisticSampler(Sampler):
+    def __init__(self, probability: float):
+        self.probability = probability
+
+    def try_sampling(self, op: Optional[str] = None) -> bool:
+        return random.random() < self.probability
+
+
+class EndpointQuotaSampler(Sampler):
+    """
+    Gives every endpoint, i.e. the operation name of the first span of a trace, a token bucket of its own, so hot
+    endpoints cannot use up the quota of rare ones. Endpoints beyond max_endpoints share a single bucket.
+    """
+
+    def __init__(self, rate: float, quotas: Dict[str, float], max_endpoints: int, burst: float = 0):
+        self.rate = rate
+        self.quotas = quotas
+        self.max_endpoints = max_endpoints
+        self.burst = burst
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.overflow = TokenBucket(rate, burst)
+
+    def bucket(self, op: Optional[str]) -> TokenBucket:
+        bucket = self.buckets.get(op)
+        if bucket is None:
+            if len(self.buckets) >= self.max_endpoints and op not in self.quotas:
+                return self.overflow
+            bucket = self.buckets.setdefault(op, TokenBucket(self.quotas.get(op, self.rate), self.burst))
+        return bucket
+
+    def try_sampling(self, op: Optional[str] = None) -> bool:
+        return self.bucket(op).take()
+
+    def force_sampled(self, op: Optional[str] = None) -> None:
+        self.bucket(op).take(force=True)
+
+
+class AdaptiveSampler(Sampler):
+    """
+    Admits new traces through a token bucket whose rate is adjusted every period, so that the CPU time used by the
+    agent threads (reporting and serializing the admitted traces) stays within a budget, a fraction of the CPU time
+    of the whole process. The rate moves smoothly towards the number of traces per second that fit in the budget
+    at the cost per trace measured over the last period.
+    """
+
+    AGENT_THREADS = ('SegmentReportThread', 'LogReportThread', 'SkyWalkingScheduler', 'event_loop_thread')
+    SMOOTHING = 0.3  # weight of the newly computed rate against the current one
+
+    def __init__(self, budget: float, rate: float, min_rate: float, max_rate: float, period: float):
+        self.budget = budget
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.period = period
+        self.bucket = TokenBucket(rate)
+        self.admitted = 0
+        self.adjusting = threading.Lock()
+        self.thread_cpu = {}
+        self.last = time.monotonic()
+        self.last_process_cpu = time.process_time()
+        self.agent_cpu_delta()
+
+    def try_sampling(self, op: Optional[str] = None) -> bool:
+        if time.monotonic() - self.last >= self.period and self.adjusting.acquire(blocking=False):
+            try:  # adjusted lazily by the first decision of a new period, so that an idle process does nothing
+                self.adjust()
+            finally:
+                self.adjusting.release()
+
+        if self.bucket.take():
+            self.admitted += 1
+            return True
+        return False
+
+    def force_sampled(self, op: Optional[str] = None) -> None:
+        self.bucket.take(force=True)
+        self.admitted += 1
+
+    def agent_cpu_delta(self) -> Optional[float]:
+        """
+        The CPU time used by the agent threads since the last call, None if per-thread CPU clocks are unavailable.
+        """
+        if not hasattr(time, 'pthread_getcpuclockid'):
+            return None
+
+        delta = 0.0
+        thread_cpu = {}
+        for thread in threading.enumerate():
+            if thread.name in self.AGENT_THREADS and thread.ident is not None:
+                try:
+                    cpu = time.clock_gettime(time.pthread_getcpuclockid(thread.ident))
+                except OSError:  # the thread has just exited
+                    continue
+                thread_cpu[thread.ident] = cpu
+                delta += cpu - self.thread_cpu.get(thread.ident, 0.0)
+        self.thread_cpu = thread_cpu
+        return delta
+
+    def adjust(self) -> None:
+        now, process_cpu = time.monotonic(), time.process_time()
+        elapsed, process_cpu_delta = now - self.last, process_cpu - self.last_process_cpu
+        agent_cpu_delta = self.agent_cpu_delta()
+        admitted, self.admitted = self.admitted, 0
+        self.last, self.last_process_cpu = now, process_cpu
+
+        if agent_cpu_delta is None:  # the cost of the agent cannot be measured, keep the configured rate
+            return
+        rate = self.bucket.rate
+        if admitted and agent_cpu_delta > 0:
+            cost = agent_cpu_delta / admitted  # CPU seconds per admitted trace
+            target = self.budget * process_cpu_delta / cost / elapsed
+        else:
+            target = rate * 2  # nothing measured in this period, open up
+        target = min(self.max_rate, max(self.min_rate, target))
+        self.bucket.rate = rate + self.SMOOTHING * (target - rate)
+        self.bucket.capacity = max(1.0, self.bucket.rate)
+
+
+def parse_quotas(quotas: str) -> Dict[str, float]:
+    """
+    Parse comma-separated `op:rate` pairs, the operation name may contain colons itself.
+    """
+    result = {}
+    for quota in quotas.split(','):
+        op, _, rate = quota.strip().rpartition(':')
+        if op:
+            result[op] = float(rate)
+    return result
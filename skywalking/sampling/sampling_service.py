@@ -15,17 +15,18 @@
 # limitations under the License.
 #
 
-from threading import Lock, Thread
+from threading import Lock
 
 import time
-from typing import Set
+from typing import Optional, Set
 from skywalking import config
 from skywalking.log import logger
+from skywalking.sampling.sampler import Sampler
 
 import asyncio
 
 
-class SamplingServiceBase:
+class SamplingServiceBase(Sampler):
 
     def __init__(self):
         self.sampling_factor = 0
@@ -53,24 +54,27 @@ class SamplingServiceBase:
         self.sampling_factor += 1
 
 
-class SamplingService(Thread, SamplingServiceBase):
+class SamplingService(SamplingServiceBase):
+    """
+    Resets the sampling factor lazily when a sampling decision is first taken in a new window,
+    so no thread has to wake up every few seconds while the application is idle.
+    """
 
     def __init__(self):
-        Thread.__init__(self, name='SamplingService', daemon=True)
-        SamplingServiceBase.__init__(self)
+        super().__init__()
         self.lock = Lock()
-
-    def run(self):
+        self.window_end = time.monotonic() + self.reset_sampling_factor_interval
         logger.debug('Started sampling service sampling_n_per_3_secs: %d', config.sample_n_per_3_secs)
-        while True:
-            self.reset_sampling_factor()
-            time.sleep(self.reset_sampling_factor_interval)
 
-    def try_sampling(self) -> bool:
+    def try_sampling(self, op: Optional[str] = None) -> bool:
         with self.lock:
+            now = time.monotonic()
+            if now >= self.window_end:
+                super()._set_sampling_factor(0)
+                self.window_end = now + self.reset_sampling_factor_interval
             return super()._try_sampling()
 
-    def force_sampled(self) -> None:
+    def force_sampled(self, op: Optional[str] = None) -> None:
         with self.lock:
             super()._incr_sampling_factor()
 
@@ -91,10 +95,10 @@ class SamplingServiceAsync(SamplingServiceBase):
             await self.reset_sampling_factor()
             await asyncio.sleep(self.reset_sampling_factor_interval)
 
-    def try_sampling(self) -> bool:
+    def try_sampling(self, op: Optional[str] = None) -> bool:
         return super()._try_sampling()
 
-    def force_sampled(self):
+    def force_sampled(self, op: Optional[str] = None):
         super()._incr_sampling_factor()
 
     async def reset_sampling_factor(self):
@@ -15,7 +15,7 @@
 # limitations under the License.
 #
 
-from typing import List
+from typing import List, Mapping, Optional
 
 from skywalking import config
 from skywalking.utils.lang import b64encode, b64decode
@@ -56,12 +56,26 @@ class Carrier(CarrierItem):
         self.service_instance = service_instance  # type: str
         self.endpoint = endpoint  # type: str
         self.client_address = client_address  # type: str
+        self.sampled = True  # type: bool
         self.correlation_carrier = SW8CorrelationCarrier()
         self.items = [self.correlation_carrier, self]  # type: List[CarrierItem]
         self.__iter_index = 0  # type: int
         if correlation is not None:
             self.correlation_carrier.correlation = correlation
 
+    @classmethod
+    def from_headers(cls, headers: Optional[Mapping]) -> 'Carrier':
+        """
+        A carrier extracted from the headers (or properties) of a message, looked up once per carrier item.
+        """
+        carrier = cls()
+        if headers:
+            for item in carrier.items:
+                val = headers.get(item.key)
+                if val is not None:
+                    item.val = val.decode('utf-8') if isinstance(val, bytes) else val
+        return carrier
+
     @property
     def val(self) -> str:
         return '-'.join([
@@ -83,6 +97,7 @@ class Carrier(CarrierItem):
         parts = val.split('-')
         if len(parts) != 8:
             return
+        self.sampled = parts[0] != '0'
         self.trace_id = b64decode(parts[1])
         self.segment_id = b64decode(parts[2])
         self.span_id = parts[3]
@@ -14,7 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-from typing import Optional
+from typing import List, Optional
 
 from skywalking import Component, config
 from skywalking import profile
@@ -54,6 +54,12 @@ try:  # attempt to use async-local instead of thread-local context and spans
 
         return spans
 
+    def spans_of(context: contextvars.Context) -> List[Span]:
+        """
+        The spans of another context, e.g. the one an asyncio callback runs in, without entering it.
+        """
+        return context.get(__spans, None) or []
+
     __spans.set([])
 
 except ImportError:
@@ -73,6 +79,9 @@ except ImportError:
 
     _spans_dup = _spans
 
+    def spans_of(context) -> List[Span]:
+        return []
+
 
 class PrimaryEndpoint:
     """
@@ -149,8 +158,9 @@ class SpanContext:
             return span
 
         parent = self.peek()
-        # start profiling if profile_context is set
-        if config.agent_profile_active and self.profile_status is None:
+        # start profiling if profile_context is set, a single attribute read while no profile task is running
+        if config.agent_profile_active and self.profile_status is None and \
+                profile.profile_task_execution_service.task_execution_context is not None:
             self.profile_status = profile.profile_task_execution_service.add_profiling(self,
                                                                                        self.segment.segment_id,
                                                                                        op)
@@ -222,6 +232,8 @@ class SpanContext:
 
         self._nspans -= 1
         if self._nspans == 0:
+            if self.profile_status is not None and self.profile_status.is_being_watched():
+                profile.profile_task_execution_service.stop_tracing_profile(self)
             self.segment.is_size_limited = agent.is_segment_queue_full()
             agent.archive_segment(self.segment)
             return True
@@ -329,13 +341,123 @@ class NoopContext(SpanContext):
         self._correlation.update(snapshot.correlation)
 
 
+class UnsampledContext(NoopContext):
+    """
+    The context of a trace rejected by the sampler. Its spans cost as little as those of a `NoopContext`, but its
+    first span is kept so that, if it ends with an error or lasts too long, it is still reported on its own.
+    """
+
+    def __init__(self, carrier: Optional[Carrier] = None):
+        super().__init__()
+        self.carrier = carrier
+        self.root: Optional[Span] = None
+
+    def __span(self, op: str, kind: Kind, peer: Optional[str] = None, component: Optional[Component] = None) -> Span:
+        span = NoopSpan(self)
+        if self.root is None:
+            span.op, span.kind, span.peer = op, kind, peer
+            if component is not None:
+                span.component = component
+            self.root = span
+        return span
+
+    def new_local_span(self, op: str) -> Span:
+        return self.__span(op, Kind.Local)
+
+    def new_entry_span(self, op: str, carrier: Optional[Carrier] = None, inherit: Optional[Component] = None) -> Span:
+        return self.__span(op, Kind.Entry)
+
+    def new_exit_span(self, op: str, peer: str,
+                      component: Optional[Component] = None, inherit: Optional[Component] = None) -> Span:
+        return self.__span(op, Kind.Exit, peer, component)
+
+    def stop(self, span: Span) -> bool:
+        if span is self.root:
+            threshold = config.sample_record_slow_traces_threshold
+            if config.sample_record_error_traces and span.error_occurred or \
+                    0 < threshold <= current_milli_time() - span.start_time:
+                self.__record(span)
+        return super().stop(span)
+
+    def __record(self, root: Span):
+        context = SpanContext()
+        context._correlation.update(self._correlation)
+        span = Span(context, sid=0, pid=-1, op=root.op, peer=root.peer, kind=root.kind, component=root.component,
+                    layer=root.layer)
+        span.tags, span.logs, span.error_occurred = root.tags, root.logs, root.error_occurred
+        span.start_time = root.start_time
+        if root.kind.is_entry and self.carrier is not None:
+            span.extract(self.carrier)
+        span.finish(context.segment)
+        agent.archive_segment(context.segment)
+
+
+class SamplingContext(NoopContext):
+    """
+    The context of a new trace while sampling is enabled. The sampling decision is deferred to the first span, when
+    its operation name and the carrier of an entry span are known, and a trace not sampled costs no segment.
+    Callers may keep this context after opening a span, it then forwards to the context the decision chose.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chosen: Optional[SpanContext] = None
+
+    def __sampled(self, op: str, carrier: Optional[Carrier] = None) -> SpanContext:
+        if self._chosen is not None:
+            return self._chosen
+        if self.ignore_check(op, carrier) is not None:
+            context = NoopContext()
+        else:
+            sampler = sampling.sampling_service  # may be swapped meanwhile by a dynamic configuration update
+            if sampler is None or sampler.sample(op, carrier):
+                context = SpanContext()
+            elif config.sample_record_error_traces or config.sample_record_slow_traces_threshold > 0:
+                context = UnsampledContext(carrier)
+            else:
+                context = NoopContext()
+        context._correlation.update(self._correlation)
+        self._chosen = context
+        return context
+
+    def new_local_span(self, op: str) -> Span:
+        return self.__sampled(op).new_local_span(op)
+
+    def new_entry_span(self, op: str, carrier: Optional[Carrier] = None, inherit: Optional[Component] = None) -> Span:
+        return self.__sampled(op, carrier).new_entry_span(op, carrier, inherit)
+
+    def new_exit_span(self, op: str, peer: str,
+                      component: Optional[Component] = None, inherit: Optional[Component] = None) -> Span:
+        return self.__sampled(op).new_exit_span(op, peer, component, inherit)
+
+    def get_correlation(self, key):
+        if self._chosen is not None:
+            return self._chosen.get_correlation(key)
+        return super().get_correlation(key)
+
+    def put_correlation(self, key, value):
+        if self._chosen is not None:
+            return self._chosen.put_correlation(key, value)
+        return super().put_correlation(key, value)
+
+    def capture(self):
+        if self._chosen is not None:
+            return self._chosen.capture()
+        return super().capture()
+
+    def continued(self, snapshot: 'Snapshot'):
+        if self._chosen is not None:
+            return self._chosen.continued(snapshot)
+        return super().continued(snapshot)
+
+
 def get_context() -> SpanContext:
     spans = _spans()
 
     if spans:
         return spans[-1].context
 
-    if sampling.sampling_service and not sampling.sampling_service.try_sampling():
-        return NoopContext()
+    if sampling.sampling_service:
+        return SamplingContext()
 
     return SpanContext()
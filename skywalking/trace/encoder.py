@@ -0,0 +1,86 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from typing import TYPE_CHECKING
+
+from skywalking import config
+from skywalking.protocol.common.Common_pb2 import KeyStringValuePair
+from skywalking.protocol.language_agent.Tracing_pb2 import SegmentObject, SpanObject, Log, SegmentReference
+
+if TYPE_CHECKING:
+    from skywalking.trace.segment import Segment
+    from skywalking.trace.span import Span
+
+
+def span_object(span: 'Span') -> SpanObject:
+    return SpanObject(
+        spanId=span.sid,
+        parentSpanId=span.pid,
+        startTime=span.start_time,
+        endTime=span.end_time,
+        operationName=span.op,
+        peer=span.peer,
+        spanType=span.kind.name,
+        spanLayer=span.layer.name,
+        componentId=span.component.value,
+        isError=span.error_occurred,
+        logs=[Log(
+            time=int(log.timestamp * 1000),
+            data=[KeyStringValuePair(key=item.key, value=item.val) for item in log.items],
+        ) for log in span.logs],
+        tags=[KeyStringValuePair(
+            key=tag.key,
+            value=tag.val,
+        ) for tag in span.iter_tags()],
+        refs=[SegmentReference(
+            refType=0 if ref.ref_type == 'CrossProcess' else 1,
+            traceId=ref.trace_id,
+            parentTraceSegmentId=ref.segment_id,
+            parentSpanId=ref.span_id,
+            parentService=ref.service,
+            parentServiceInstance=ref.service_instance,
+            parentEndpoint=ref.endpoint,
+            networkAddressUsedAtPeer=ref.client_address,
+        ) for ref in span.refs if ref.trace_id],
+    )
+
+
+def segment_object(segment: 'Segment') -> SegmentObject:
+    return SegmentObject(
+        traceId=str(segment.related_traces[0]),
+        traceSegmentId=str(segment.segment_id),
+        service=config.agent_name,
+        serviceInstance=config.agent_instance_name,
+        isSizeLimited=segment.is_size_limited,
+        spans=[span_object(span) for span in segment.spans],
+    )
+
+
+def encode_span(span: 'Span') -> bytes:
+    """
+    The span as the `spans` field of a SegmentObject in the wire format. Serialized messages concatenated are parsed
+    as one message with their repeated fields appended, so the encoded spans of a segment only need to be joined.
+    """
+    return SegmentObject(spans=[span_object(span)]).SerializeToString()
+
+
+def encode_segment(segment: 'Segment') -> bytes:
+    """
+    The serialized SegmentObject of a segment whose spans were encoded as they finished.
+    """
+    return segment_object(segment).SerializeToString() + bytes(segment.encoded)
@@ -0,0 +1,93 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import re
+from typing import Dict, List, Optional, Set
+
+from skywalking import config
+
+OVERFLOW = '{overflow}'
+
+# numbers, UUIDs and hexadecimal ids of at least 16 digits, e.g. MongoDB ObjectIds, as whole path segments
+RE_ID_SEGMENT = re.compile(r'(?<=/)(?:\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
+                           r'|[0-9a-fA-F]{16,})(?=/|$)')
+
+
+class EndpointNormalizer:
+    """
+    Turns request paths into endpoint names of bounded cardinality: a path matching one of the patterns is named
+    after the pattern, otherwise the ids among its segments are replaced by `{id}`. Once max_endpoints distinct
+    names are known, further ones are named `{overflow}`.
+    """
+
+    def __init__(self, patterns: List[str], collapse_ids: bool, max_endpoints: int, cache_size: int):
+        self.patterns = [(pattern, re.compile(f'^(?:{config.ant_path_regex(pattern)})$')) for pattern in patterns]
+        self.collapse_ids = collapse_ids
+        self.max_endpoints = max_endpoints
+        self.cache_size = cache_size
+        self.cache: Dict[str, str] = {}
+        self.endpoints: Set[str] = set()
+
+    def normalize(self, path: str) -> str:
+        name = self.cache.get(path)
+        if name is None:
+            name = self.admit(self.collapse(path))
+            if len(self.cache) >= self.cache_size:
+                self.cache.clear()
+            self.cache[path] = name
+        return name
+
+    def collapse(self, path: str) -> str:
+        for pattern, regex in self.patterns:
+            if regex.match(path):
+                return pattern
+        return RE_ID_SEGMENT.sub('{id}', path) if self.collapse_ids else path
+
+    def admit(self, name: str) -> str:
+        if name not in self.endpoints:
+            if 0 < self.max_endpoints <= len(self.endpoints):
+                return OVERFLOW
+            self.endpoints.add(name)
+        return name
+
+
+normalizer: Optional[EndpointNormalizer] = None
+
+
+def init() -> EndpointNormalizer:
+    global normalizer
+    normalizer = EndpointNormalizer([p.strip() for p in config.agent_trace_endpoint_patterns.split(',') if p.strip()],
+                                    config.agent_trace_endpoint_normalize, config.agent_trace_endpoint_max,
+                                    config.agent_trace_endpoint_cache_size)
+    return normalizer
+
+
+def normalize(path: str) -> str:
+    """
+    The endpoint name of a request path with no route template known.
+    """
+    return (normalizer or init()).normalize(path)
+
+
+def route(template: str) -> str:
+    """
+    The endpoint name of a request matched to a route template of the web framework, e.g. `/users/<int:id>`.
+    """
+    if not template.startswith('/'):
+        template = f'/{template}'
+    return (normalizer or init()).admit(template)
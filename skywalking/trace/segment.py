@@ -16,10 +16,11 @@
 #
 
 import time
-from typing import List, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 
 from skywalking import config
 from skywalking.trace import ID
+from skywalking.trace.encoder import encode_span
 from skywalking.utils.lang import tostring
 
 if TYPE_CHECKING:
@@ -51,6 +52,9 @@ class SegmentRef(object):
             self.endpoint == other.endpoint and \
             self.client_address == other.client_address
 
+    def __hash__(self):
+        return hash((self.trace_id, self.segment_id, self.span_id))
+
     @classmethod
     def build_ref(cls, snapshot: 'Snapshot'):
         from skywalking.trace.carrier import Carrier
@@ -82,9 +86,14 @@ class Segment(object):
         self.timestamp = int(time.time() * 1000)  # type: int
         self.related_traces = [_NewID()]  # type: List[ID]
         self.is_size_limited = False  # type: bool
+        # the spans encoded as they finish, instead of being kept in spans
+        self.encoded = bytearray() if config.agent_trace_encode_spans else None  # type: Optional[bytearray]
 
     def archive(self, span: 'Span'):
-        self.spans.append(span)
+        if self.encoded is not None:
+            self.encoded += encode_span(span)
+        else:
+            self.spans.append(span)
 
     def relate(self, trace_id: ID):
         if isinstance(self.related_traces[0], _NewID):
@@ -98,3 +107,4 @@ class NoopSegment(Segment):
         self.spans = []
         self.timestamp = 0
         self.related_traces = [_NewNoopID()]
+        self.encoded = None
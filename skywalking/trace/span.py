@@ -17,14 +17,14 @@
 
 import time
 from collections import defaultdict
-from typing import List, Union, DefaultDict
+from typing import List, Optional, Set, Union, DefaultDict
 from typing import TYPE_CHECKING
 
 from skywalking import Kind, Layer, Log, Component, LogItem, config
 from skywalking.trace import ID
 from skywalking.trace.carrier import Carrier
 from skywalking.trace.segment import SegmentRef, Segment
-from skywalking.trace.tags import Tag
+from skywalking.trace.tags import Tag, TagRefsDropped
 from skywalking.utils.lang import tostring
 from skywalking.utils.exception import IllegalStateError
 
@@ -59,6 +59,8 @@ class Span:
         self.tags = defaultdict(list)  # type: DefaultDict[str, Union[Tag, List[Tag]]]
         self.logs = []  # type: List[Log]
         self.refs = []  # type: List[SegmentRef]
+        self.refs_dropped = 0  # type: int
+        self._refs_seen = None  # type: Optional[Set[SegmentRef]]
         self.start_time = 0  # type: int
         self.end_time = 0  # type: int
         self.error_occurred = False  # type: bool
@@ -133,8 +135,19 @@ class Span:
 
         ref = SegmentRef(carrier=carrier)
 
-        if ref not in self.refs:
-            self.refs.append(ref)
+        # a consumer span of a batch of messages may extract hundreds of carriers
+        seen = self._refs_seen
+        if seen is None:
+            seen = self._refs_seen = set(self.refs)
+        if ref in seen:
+            return self
+        seen.add(ref)
+        if len(self.refs) >= config.agent_trace_max_refs_per_span:
+            self.refs_dropped += 1
+            self.tag(TagRefsDropped(self.refs_dropped))
+            return self
+
+        self.refs.append(ref)
 
         return self
 
@@ -0,0 +1,63 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import re
+import sys
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from skywalking import config
+
+RE_LITERAL = re.compile(r"'(?:[^']|'')*'|(?<![\w$.:])\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+RE_LITERAL_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+
+
+def fingerprint(sql: str) -> str:
+    """
+    Replace the string and number literals of a statement by `?`, and lists of them by a single `(?)`.
+    """
+    return RE_LITERAL_LIST.sub('(?)', RE_LITERAL.sub('?', sql))
+
+
+def process(query: Any) -> str:
+    sql = query.decode('utf-8', 'replace') if isinstance(query, (bytes, bytearray)) else str(query)
+    if config.plugin_sql_statement_fingerprint:
+        sql = fingerprint(sql)
+    max_len = config.plugin_sql_statement_max_length
+    if 0 < max_len < len(sql):
+        sql = f'{sql[:max_len]}...'
+    return sys.intern(sql)
+
+
+cached: Optional[Callable[[Any], str]] = None
+
+
+def init() -> Callable[[Any], str]:
+    global cached
+    cached = lru_cache(maxsize=config.plugin_sql_statement_cache_size)(process)
+    return cached
+
+
+def statement(query: Any) -> str:
+    """
+    The text a DB plugin tags as the statement of a query, repeated queries get the same string from a cache.
+    """
+    try:
+        return (cached or init())(query)
+    except TypeError:  # not hashable, e.g. psycopg sql.Composed
+        return process(query)
@@ -92,6 +92,10 @@ class TagMqQueue(Tag):
     key = 'mq.queue'
 
 
+class TagRefsDropped(Tag):
+    key = 'refs.dropped'
+
+
 class TagCeleryParameters(Tag):
     key = 'celery.parameters'
 
@@ -106,3 +110,11 @@ class TagGrpcUrl(Tag):
 
 class TagGrpcStatusCode(Tag):
     key = 'grpc.status_code'
+
+
+class TagExecutorQueueWait(Tag):
+    key = 'executor.queue_wait_ms'
+
+
+class TagExecutorRunTime(Tag):
+    key = 'executor.run_time_ms'
@@ -15,6 +15,7 @@
 # limitations under the License.
 #
 
+import itertools
 import threading
 
 
@@ -38,3 +39,22 @@ class AtomicCounter(Counter):
     def next(self) -> int:
         with self._lock:
             return Counter.next(self)
+
+
+class LockFreeCounter:
+    """
+    A counter that can be incremented from any thread without a lock, `next()` on `itertools.count` is atomic.
+    Reading advances the underlying count too, so the value must be read by a single thread.
+    """
+
+    def __init__(self):
+        self._count = itertools.count()
+        self._reads = 0
+
+    def increment(self) -> None:
+        next(self._count)
+
+    def get(self) -> int:
+        value = next(self._count) - self._reads
+        self._reads += 1
+        return value
@@ -15,18 +15,22 @@
 # limitations under the License.
 #
 
-from skywalking.meter.pvm.data_source import DataSource
-import psutil
+from unittest import mock
 
+import pytest
 
-class MEMUsageDataSource(DataSource):
-    def __init__(self):
-        self.cur_process = psutil.Process()
+from skywalking import config
+from skywalking.agent import agent
 
-    def total_mem_utilization_generator(self):
-        while (True):
-            yield psutil.virtual_memory().percent
 
-    def process_mem_utilization_generator(self):
-        while (True):
-            yield self.cur_process.memory_info().rss / psutil.virtual_memory().total
+@pytest.fixture
+def reporting_agent():
+    """
+    Let spans, segments and logs go through their real code paths without a running agent,
+    finished segments and logs are discarded instead of being queued for reporting. Profiling is measured apart.
+    """
+    with mock.patch.object(config, 'agent_profile_active', False), \
+            mock.patch.object(agent, 'is_segment_queue_full', lambda: False), \
+            mock.patch.object(agent, 'archive_segment', lambda segment: None), \
+            mock.patch.object(agent, 'archive_log', lambda log_data: None):
+        yield agent
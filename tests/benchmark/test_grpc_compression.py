@@ -0,0 +1,148 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import socket
+import threading
+import time
+from concurrent import futures
+from queue import Queue
+from typing import Any
+
+import grpc
+import pytest
+
+from skywalking import Component, Layer, config
+from skywalking.protocol.common.Command_pb2 import Commands
+from skywalking.protocol.language_agent.Tracing_pb2_grpc import TraceSegmentReportServiceServicer, \
+    add_TraceSegmentReportServiceServicer_to_server
+from skywalking.trace.segment import Segment
+from skywalking.trace.span import EntrySpan, ExitSpan
+from skywalking.trace.context import SpanContext
+
+SEGMENTS = 200
+
+
+class SegmentCounter(TraceSegmentReportServiceServicer):
+    def __init__(self):
+        self.count = 0
+
+    def collect(self, request_iterator, context):
+        self.count += sum(1 for _ in request_iterator)
+        return Commands()
+
+
+class CountingRelay:
+    """
+    A TCP relay between the agent and the stand-in OAP counting the bytes sent by the agent.
+    """
+
+    def __init__(self, upstream_port: int):
+        self.upstream_port = upstream_port
+        self.sent = 0
+        self.listener = socket.socket()
+        self.listener.bind(('localhost', 0))
+        self.listener.listen()
+        self.port = self.listener.getsockname()[1]
+        threading.Thread(target=self.__accept, daemon=True).start()
+
+    def __accept(self):
+        while True:
+            try:
+                downstream, _ = self.listener.accept()
+            except OSError:
+                return
+            upstream = socket.create_connection(('localhost', self.upstream_port))
+            threading.Thread(target=self.__pipe, args=(downstream, upstream, True), daemon=True).start()
+            threading.Thread(target=self.__pipe, args=(upstream, downstream, False), daemon=True).start()
+
+    def __pipe(self, src, dst, count):
+        try:
+            while True:
+                data = src.recv(65536)
+                if not data:
+                    break
+                if count:
+                    self.sent += len(data)
+                dst.sendall(data)
+        except OSError:
+            pass
+        finally:
+            src.close()
+            dst.close()
+
+    def close(self):
+        self.listener.close()
+
+
+def make_segment() -> Segment:
+    """
+    A segment resembling a typical web request calling a database and another service.
+    """
+    context = SpanContext()
+    segment = context.segment
+    entry = EntrySpan(context=context, op='/api/v1/orders/{id}', peer='10.0.0.1:8080', sid=0, pid=-1,
+                      component=Component.Flask, layer=Layer.Http)
+    segment.spans.append(entry)
+    for sid in range(1, 6):
+        segment.spans.append(ExitSpan(context=context, op='Mysql/PyMsql/execute', peer='mysql.internal:3306',
+                                      sid=sid, pid=0, component=Component.PyMysql, layer=Layer.Database))
+    return segment
+
+
+@pytest.fixture(scope='module')
+def oap():
+    collector = SegmentCounter()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    add_TraceSegmentReportServiceServicer_to_server(collector, server)
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+    yield collector, port
+    server.stop(None)
+
+
+@pytest.mark.parametrize('compression', ['', 'gzip', 'deflate'])
+def test_report_segments(benchmark: Any, oap, compression: str):
+    from skywalking.agent.protocol.grpc import GrpcProtocol
+
+    collector, port = oap
+    relay = CountingRelay(port)
+    backend, config.agent_collector_backend_services = config.agent_collector_backend_services, f'localhost:{relay.port}'
+    config.agent_grpc_compression = compression
+    protocol = GrpcProtocol()
+    segments = [make_segment() for _ in range(SEGMENTS)]
+
+    def report():
+        queue = Queue()
+        for segment in segments:
+            queue.put(segment)
+        protocol.report_segment(queue, block=False)
+
+    report()  # warm up the connection so its setup is not counted
+    sent, cpu = relay.sent, time.process_time()
+    rounds = 10
+    benchmark.pedantic(report, rounds=rounds, iterations=1)
+
+    benchmark.extra_info['bytes_on_wire_per_segment'] = (relay.sent - sent) / (rounds * SEGMENTS)
+    benchmark.extra_info['cpu_seconds_per_round'] = (time.process_time() - cpu) / rounds
+    assert collector.count > 0
+
+    protocol.channel.unsubscribe(protocol._cb)
+    protocol.channel.close()
+    relay.close()
+    config.agent_collector_backend_services = backend
+    config.agent_grpc_compression = ''
@@ -0,0 +1,57 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import logging
+from typing import Any
+
+import pytest
+
+from skywalking.trace.context import get_context
+
+
+@pytest.fixture
+def bench_logger():
+    logger = logging.getLogger('benchmark')
+    logger.propagate = False
+    logger.handlers = [logging.NullHandler()]
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+@pytest.fixture
+def log_reporter():
+    from logging import Logger
+    from skywalking.log import sw_logging
+
+    handle = Logger.handle
+    sw_logging.install()
+    yield
+    Logger.handle = handle
+
+
+def test_logger_handle_baseline(benchmark: Any, bench_logger):
+    benchmark(bench_logger.warning, 'order %s shipped', 42)
+
+
+def test_logger_handle_without_span(benchmark: Any, reporting_agent, log_reporter, bench_logger):
+    benchmark(bench_logger.warning, 'order %s shipped', 42)
+
+
+def test_logger_handle_with_span(benchmark: Any, reporting_agent, log_reporter, bench_logger):
+    context = get_context()
+    with context.new_entry_span(op='/api/v1/orders/{id}'):
+        benchmark(bench_logger.warning, 'order %s shipped', 42)
@@ -16,29 +16,29 @@
 #
 
 import threading
+from typing import Any
 
+import pytest
 
-class AtomicRef:
-    def __init__(self, var):
-        self._lock = threading.Lock()
-        self._var = var
+from skywalking.meter.counter import Counter, CounterMode
 
-    def get(self):
-        with self._lock:
-            return self._var
+INCREMENTS = 10000
 
-    def set(self, new_var):
-        with self._lock:
-            self._var = new_var
 
-    def compare_and_set(self, expect, update) -> bool:
-        """
-        Atomically sets the value to the given updated value if the current value == the expected value
+@pytest.mark.parametrize('threads', [1, 4, 8])
+def test_counter_increment_contention(benchmark: Any, threads: int):
+    counter = Counter('benchmark_counter', CounterMode.INCREMENT)
 
-        :return: return True if success, False if the actual value was not equal to the expected value.
-        """
-        with self._lock:
-            if self._var == expect:
-                self._var = update
-                return True
-            return False
+    def increment():
+        for _ in range(INCREMENTS):
+            counter.increment(1)
+
+    def run():
+        workers = [threading.Thread(target=increment) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    benchmark(run)
+    assert counter.get() % (threads * INCREMENTS) == 0
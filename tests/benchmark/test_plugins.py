@@ -0,0 +1,146 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import io
+from http.server import BaseHTTPRequestHandler
+from typing import Any
+
+import pytest
+
+REQUEST = b'GET /api/v1/orders/42?expand=items HTTP/1.1\r\nHost: localhost:8080\r\n\r\n'
+
+
+class OrderHandler(BaseHTTPRequestHandler):
+    def do_GET(self):  # noqa
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeSocket:
+    """
+    Serves one canned HTTP request to a request handler without any network.
+    """
+
+    def makefile(self, mode, buffering=-1):
+        return io.BytesIO(REQUEST) if 'r' in mode else io.BytesIO()
+
+    def sendall(self, data):
+        pass
+
+
+@pytest.fixture
+def http_server_plugin():
+    from skywalking.plugins import sw_http_server
+
+    handle, send_response_only = BaseHTTPRequestHandler.handle, BaseHTTPRequestHandler.send_response_only
+    sw_http_server.install()
+    yield
+    BaseHTTPRequestHandler.handle, BaseHTTPRequestHandler.send_response_only = handle, send_response_only
+
+
+def serve():
+    OrderHandler(FakeSocket(), ('10.0.0.1', 52100), None)
+
+
+def test_http_server_baseline(benchmark: Any):
+    benchmark(serve)
+
+
+def test_http_server_instrumented(benchmark: Any, reporting_agent, http_server_plugin):
+    benchmark(serve)
+
+
+class FakeConnection:
+    host = 'mysql.internal'
+    port = 3306
+    db = b'orders'
+    _result = None
+
+
+@pytest.fixture
+def pymysql_cursor():
+    cursors = pytest.importorskip('pymysql.cursors')
+
+    class FakeCursor(cursors.Cursor):
+        """
+        A DB-API cursor whose round trip to the server returns immediately.
+        """
+
+        def _query(self, q):
+            return 1
+
+    return FakeCursor(FakeConnection())
+
+
+@pytest.fixture
+def pymysql_plugin():
+    from pymysql.cursors import Cursor
+    from skywalking.plugins import sw_pymysql
+
+    execute = Cursor.execute
+    sw_pymysql.install()
+    yield
+    Cursor.execute = execute
+
+
+def test_pymysql_baseline(benchmark: Any, pymysql_cursor):
+    benchmark(pymysql_cursor.execute, 'SELECT * FROM orders WHERE id = 42')
+
+
+def test_pymysql_instrumented(benchmark: Any, reporting_agent, pymysql_cursor, pymysql_plugin):
+    from skywalking.trace.context import get_context
+
+    context = get_context()
+    with context.new_entry_span(op='/api/v1/orders/{id}'):  # database calls are traced as part of a request
+        benchmark(pymysql_cursor.execute, 'SELECT * FROM orders WHERE id = 42')
+
+
+class FakeKafkaConsumer:
+    config = {'bootstrap_servers': ['kafka.internal:9092'], 'group_id': 'orders'}
+
+    class _subscription:  # noqa
+        subscription = ['orders']
+
+
+@pytest.fixture
+def kafka_poll():
+    """
+    A poll of 500 records produced by as many traces.
+    """
+    from collections import namedtuple
+    from skywalking.trace.carrier import Carrier
+
+    Record = namedtuple('Record', 'headers')
+    records = []
+    for i in range(500):
+        carrier = Carrier(trace_id=f'trace-{i}', segment_id=f'segment-{i}', span_id='1', service='producer',
+                          service_instance='producer-1', endpoint='/orders', client_address='kafka.internal:9092')
+        records.append(Record(headers=[('traceparent', b'-'), (carrier.key, carrier.val.encode('utf-8'))]))
+    return {'orders-0': records}
+
+
+def test_kafka_batch_consume(benchmark: Any, reporting_agent, kafka_poll):
+    from skywalking.plugins.sw_kafka import _sw__poll_once_func
+
+    poll_once = _sw__poll_once_func(lambda *args, **kwargs: kafka_poll)
+    benchmark(poll_once, FakeKafkaConsumer(), 0, 500)
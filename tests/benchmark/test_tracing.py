@@ -0,0 +1,164 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from contextlib import ExitStack
+from queue import Queue
+from typing import Any
+from unittest import mock
+
+import pytest
+
+from skywalking import Component, Layer, config
+from skywalking.trace.carrier import Carrier
+from skywalking.trace.context import SpanContext, get_context
+
+
+def trace(depth: int, headers: dict = None) -> SpanContext:
+    """
+    An entry span, `depth` nested local spans and an exit span, like a request handled by a few layers of code
+    calling a downstream service.
+    """
+    carrier = None
+    if headers is not None:
+        carrier = Carrier()
+        for item in carrier:
+            if item.key in headers:
+                item.val = headers[item.key]
+
+    context = get_context()
+    with ExitStack() as stack:
+        stack.enter_context(context.new_entry_span(op='/api/v1/orders/{id}', carrier=carrier))
+        for i in range(depth):
+            stack.enter_context(context.new_local_span(op=f'OrderService/layer-{i}'))
+        with context.new_exit_span(op='/api/v1/inventory', peer='inventory.internal:8080',
+                                   component=Component.Requests) as span:
+            span.layer = Layer.Http
+            span.inject()
+    return context
+
+
+@pytest.mark.parametrize('depth', [0, 5, 20])
+def test_span_tree(benchmark: Any, reporting_agent, depth: int):
+    benchmark(trace, depth)
+
+
+def test_span_tree_encoded(benchmark: Any, reporting_agent):
+    with mock.patch.object(config, 'agent_trace_encode_spans', True):
+        benchmark(trace, 20)
+
+
+def test_carrier_inject(benchmark: Any, reporting_agent):
+    context = get_context()
+    with context.new_entry_span(op='/api/v1/orders/{id}'):
+        with context.new_exit_span(op='/api/v1/inventory', peer='inventory.internal:8080') as span:
+            def inject():
+                return {item.key: item.val for item in span.inject()}
+
+            headers = benchmark(inject)
+    assert 'sw8' in headers
+
+
+def test_carrier_extract(benchmark: Any, reporting_agent):
+    context = get_context()
+    with context.new_entry_span(op='/api/v1/orders/{id}'):
+        with context.new_exit_span(op='/api/v1/inventory', peer='inventory.internal:8080') as span:
+            headers = {item.key: item.val for item in span.inject()}
+
+    def extract():
+        carrier = Carrier()
+        for item in carrier:
+            if item.key in headers:
+                item.val = headers[item.key]
+        return carrier
+
+    assert benchmark(extract).is_valid
+
+
+def test_span_tree_with_upstream_carrier(benchmark: Any, reporting_agent):
+    context = get_context()
+    with context.new_entry_span(op='/api/v1/orders/{id}'):
+        with context.new_exit_span(op='/api/v1/inventory', peer='inventory.internal:8080') as span:
+            headers = {item.key: item.val for item in span.inject()}
+
+    benchmark(trace, 5, headers)
+
+
+class SerializingReporter:
+    def report(self, generator):
+        for segment in generator:
+            segment.SerializeToString()
+
+    def report_serialized(self, generator):  # segments are serialized by the protocol, kept for a retry
+        for _ in generator:
+            pass
+
+
+@pytest.mark.parametrize('encode', [False, True])
+@pytest.mark.parametrize('depth', [0, 20])
+def test_segment_serialization(benchmark: Any, reporting_agent, depth: int, encode: bool):
+    """
+    Reporting segments, with spans kept as objects or encoded as they finished.
+    """
+    from skywalking.agent.protocol.grpc import GrpcProtocol
+
+    protocol = GrpcProtocol()
+    protocol.traces_reporter = SerializingReporter()
+    with mock.patch.object(config, 'agent_trace_encode_spans', encode):
+        segments = [trace(depth).segment for _ in range(100)]
+
+    def report():
+        queue = Queue()
+        for segment in segments:
+            queue.put(segment)
+        protocol.report_segment(queue, block=False)
+
+    benchmark(report)
+    protocol.channel.unsubscribe(protocol._cb)
+    protocol.channel.close()
+
+
+@pytest.mark.parametrize('patterns', [0, 100, 1000])
+def test_ignore_check(benchmark: Any, reporting_agent, patterns: int):
+    ignore_path = config.agent_trace_ignore_path
+    config.agent_trace_ignore_path = ','.join(f'/static/{i}/**' for i in range(patterns))
+    config.finalize_regex()
+    try:
+        assert benchmark(SpanContext.ignore_check, '/api/v1/orders/123') is None
+    finally:
+        config.agent_trace_ignore_path = ignore_path
+        config.finalize_regex()
+
+
+@pytest.mark.parametrize('task', [False, True])
+def test_span_tree_with_profiling(benchmark: Any, reporting_agent, task: bool):
+    """
+    Profiling is active, with no profile task (the common case) or a task watching another endpoint.
+    """
+    from skywalking import profile
+    from skywalking.profile.profile_context import ProfileTaskExecutionContext
+    from skywalking.profile.profile_task import ProfileTask
+
+    profile.init()
+    service = profile.profile_task_execution_service
+    if task:
+        service.task_execution_context = ProfileTaskExecutionContext(ProfileTask(first_span_op_name='/other',
+                                                                                 max_sampling_count=5))
+    config.agent_profile_active = True  # restored by reporting_agent
+    try:
+        benchmark(trace, 5)
+    finally:
+        service.task_execution_context = None
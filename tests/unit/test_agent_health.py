@@ -0,0 +1,102 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import threading
+import unittest
+from queue import Empty
+
+import skywalking.meter as meter
+from skywalking import config
+from skywalking.meter.agent_health import MeteredQueue, register_backoff
+from skywalking.meter.meter_service import MeterService
+from skywalking.utils.counter import LockFreeCounter
+
+
+class TestAgentHealth(unittest.TestCase):
+    def setUp(self):
+        self.meter_service = meter._meter_service
+        meter._meter_service = MeterService()  # not started, only collects registered meters
+
+    def tearDown(self):
+        meter._meter_service = self.meter_service
+
+    def test_high_water_mark(self):
+        queue = MeteredQueue('segment', maxsize=10)
+        queue.register()
+        for i in range(5):
+            queue.put(i)
+        queue.get()
+        queue.get()
+
+        depth = meter._meter_service.get_meter('instance_agent_segment_queue_depth')
+        high_water_mark = meter._meter_service.get_meter('instance_agent_segment_queue_high_water_mark')
+        self.assertEqual(3, depth.get())
+        self.assertEqual(5, high_water_mark.get())
+        self.assertEqual(3, high_water_mark.get())  # starts over from the current depth after each report
+
+    def test_measure_report(self):
+        queue = MeteredQueue('log')
+        for i in range(3):
+            queue.put(i)
+
+        with queue.measure():
+            items = []
+            while True:
+                try:
+                    items.append(queue.get(block=False))
+                except Empty:
+                    break
+
+        self.assertEqual([0, 1, 2], items)
+        self.assertEqual(max(1, config.agent_reporter_flush_batch_size), queue.batch_size)  # batching unaffected
+        counts = {bucket.bucket: bucket.count for bucket in queue.report_batch_size.buckets}
+        self.assertEqual(1, counts[1])  # a batch of 3 items falls into the [1, 5) bucket
+        self.assertEqual(1, sum(bucket.count for bucket in queue.latency.buckets))
+        self.assertEqual(1, sum(bucket.count for bucket in queue.serialization_time.buckets))
+
+    def test_dropped(self):
+        queue = MeteredQueue('meter')
+        queue.register()
+        threads = [threading.Thread(target=lambda: [queue.dropped.increment() for _ in range(1000)])
+                   for _ in range(4)]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+
+        dropped = meter._meter_service.get_meter('instance_agent_meter_dropped_queue_full')
+        self.assertEqual(4000, dropped.get())
+        self.assertEqual(4000, dropped.get())
+
+    def test_backoff(self):
+        backoff = {}
+        register_backoff(backoff, 'segment')
+        gauge = meter._meter_service.get_meter('instance_agent_segment_backoff')
+        self.assertEqual(0, gauge.get())
+        backoff['segment'] = 8
+        self.assertEqual(8, gauge.get())
+
+    def test_lock_free_counter(self):
+        counter = LockFreeCounter()
+        self.assertEqual(0, counter.get())
+        counter.increment()
+        counter.increment()
+        self.assertEqual(2, counter.get())
+        self.assertEqual(2, counter.get())
+
+
+if __name__ == '__main__':
+    unittest.main()
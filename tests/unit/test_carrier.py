@@ -0,0 +1,56 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import unittest
+from unittest import mock
+
+from skywalking import config
+from skywalking.trace.carrier import Carrier
+from skywalking.trace.context import SpanContext
+from skywalking.trace.span import EntrySpan
+
+
+def upstream(i: int) -> Carrier:
+    return Carrier(trace_id=f'trace-{i}', segment_id=f'segment-{i}', span_id='1', service='producer',
+                   service_instance='producer-1', endpoint='/orders', client_address='broker:9092')
+
+
+class TestCarrier(unittest.TestCase):
+
+    def test_from_headers(self):
+        headers = {'sw8': upstream(1).val.encode('utf-8'), 'sw8-correlation': 'a2V5:dmFs', 'other': b'x'}
+        carrier = Carrier.from_headers(headers)
+        assert carrier.is_valid
+        assert carrier.trace_id == 'trace-1'
+        assert carrier.correlation_carrier.correlation == {'key': 'val'}
+        assert not Carrier.from_headers(None).is_valid
+
+    def test_refs_deduplicated_and_capped(self):
+        span = EntrySpan(context=SpanContext(), op='Kafka/orders/Consumer/group')
+        with mock.patch.object(config, 'agent_trace_max_refs_per_span', 3):
+            for i in range(5):
+                span.extract(upstream(i))
+                span.extract(upstream(i))  # redelivered
+
+        assert [ref.trace_id for ref in span.refs] == ['trace-0', 'trace-1', 'trace-2']
+        assert span.refs_dropped == 2
+        assert span.tags['refs.dropped'].val == '2'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from skywalking import config, dynamic_config, sampling
+from skywalking.command import command_service
+from skywalking.protocol.common.Command_pb2 import Command, Commands
+from skywalking.protocol.common.Common_pb2 import KeyStringValuePair
+from skywalking.sampling.sampler import TokenBucketSampler
+
+
+class TestDynamicConfig(unittest.TestCase):
+
+    def setUp(self):
+        for option, value in (('agent_trace_ignore_path', ''), ('sample_strategy', ''), ('sample_n_per_3_secs', 0),
+                              ('plugin_http_ignore_method', '')):
+            mock.patch.object(config, option, value).start()
+        mock.patch.object(sampling, 'sampling_service', None).start()
+        config.finalize_regex()
+
+    def tearDown(self):
+        dynamic_config._sources.clear()
+        dynamic_config.apply({}, 'test')  # back to the startup configuration
+        dynamic_config._sources.clear()
+        dynamic_config._startup.clear()
+        dynamic_config.uuid = ''
+        dynamic_config._file_mtime = None
+        mock.patch.stopall()
+        config.finalize_regex()
+
+    def test_matchers_swapped_and_restored(self):
+        assert not config.RE_IGNORE_PATH.match('/health')
+        assert dynamic_config.apply({'agent_trace_ignore_path': '/health,/metrics/**'}, 'test')
+        assert config.RE_IGNORE_PATH.match('/health')
+        assert config.RE_IGNORE_PATH.match('/metrics/jvm')
+        assert not dynamic_config.apply({'agent_trace_ignore_path': '/health,/metrics/**'}, 'test')  # no change
+
+        assert dynamic_config.apply({}, 'test')
+        assert not config.RE_IGNORE_PATH.match('/health')
+
+    def test_sampler_swapped(self):
+        assert dynamic_config.apply({'sample_strategy': 'token_bucket', 'sample_rate_per_sec': '5'}, 'test')
+        assert isinstance(sampling.sampling_service, TokenBucketSampler)
+        assert sampling.sampling_service.bucket.rate == 5.0
+        assert config.sample_rate_per_sec == 5.0
+
+    def test_invalid_update_rejected(self):
+        assert not dynamic_config.apply({'sample_rate_per_sec': 'fast'}, 'test')
+        assert not dynamic_config.apply({'sample_strategy': 'token_bucket', 'agent_trace_ignore_path': '/a',
+                                         'sample_n_per_3_secs': 'x'}, 'test')
+        assert config.sample_strategy == '' and config.agent_trace_ignore_path == ''
+
+        # refreshed before the sampler fails, the matchers are rolled back too
+        assert not dynamic_config.apply({'sample_strategy': 'unknown', 'agent_trace_ignore_path': '/a'}, 'test')
+        assert config.sample_strategy == '' and not config.RE_IGNORE_PATH.match('/a')
+        assert sampling.sampling_service is None
+
+    def test_not_dynamic_ignored(self):
+        protocol = config.agent_protocol
+        assert dynamic_config.apply({'agent_protocol': 'kafka', 'sample_record_error_traces': 'true'}, 'test')
+        assert config.agent_protocol == protocol
+        assert config.sample_record_error_traces is True
+
+    def test_command(self):
+        commands = Commands(commands=[Command(command='ConfigurationDiscoveryCommand', args=[
+            KeyStringValuePair(key='SerialNumber', value='1'),
+            KeyStringValuePair(key='UUID', value='uuid-1'),
+            KeyStringValuePair(key='plugin_http_ignore_method', value='OPTIONS'),
+        ])])
+        command_service.receive_command(commands)
+        command_service.dispatch()
+        assert config.ignore_http_method_check('options')
+        assert dynamic_config.uuid == 'uuid-1'
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'agent.conf')
+            mock.patch.object(config, 'agent_dynamic_config_file', path).start()
+            dynamic_config.check_file()  # no file yet, the startup configuration
+
+            with open(path, 'w') as f:
+                f.write('# incident\nsample_strategy = probabilistic\nsample_probability=0.1\n')
+            dynamic_config.check_file()
+            assert config.sample_probability == 0.1
+
+            os.remove(path)
+            dynamic_config.check_file()
+            assert config.sample_strategy == ''
+
+    def test_sources_merged(self):
+        assert dynamic_config.apply({'sample_strategy': 'token_bucket', 'sample_rate_per_sec': '5'}, dynamic_config.OAP)
+        assert dynamic_config.apply({'agent_trace_ignore_path': '/health', 'sample_rate_per_sec': '2'},
+                                    dynamic_config.FILE)
+        assert config.sample_strategy == 'token_bucket'  # the OAP settings are kept
+        assert config.sample_rate_per_sec == 2.0  # the file takes precedence
+        assert config.RE_IGNORE_PATH.match('/health')
+
+        # overridden by the file, nothing changes yet
+        assert not dynamic_config.apply({'sample_strategy': 'token_bucket', 'sample_rate_per_sec': '7'},
+                                        dynamic_config.OAP)
+        assert config.sample_rate_per_sec == 2.0
+        assert config.RE_IGNORE_PATH.match('/health')  # the file settings are kept
+
+        assert dynamic_config.apply({}, dynamic_config.FILE)
+        assert config.sample_rate_per_sec == 7.0
+        assert not config.RE_IGNORE_PATH.match('/health')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import unittest
+from unittest import mock
+
+from skywalking import config
+from skywalking.agent import agent
+from skywalking.protocol.language_agent.Tracing_pb2 import SegmentObject
+from skywalking.trace.context import SpanContext
+from skywalking.trace.encoder import encode_segment, segment_object
+from skywalking.trace.tags import TagHttpMethod
+
+
+def trace():
+    context = SpanContext()
+    with mock.patch.object(agent, 'archive_segment') as archive_segment:
+        with context.new_entry_span(op='/orders') as span:
+            span.tag(TagHttpMethod('GET'))
+            with context.new_exit_span(op='/inventory', peer='inventory:8080'):
+                pass
+    return archive_segment.call_args[0][0]
+
+
+class TestEncoder(unittest.TestCase):
+
+    def setUp(self):
+        self.patches = [mock.patch.object(agent, 'is_segment_queue_full', return_value=False),
+                        mock.patch.object(config, 'agent_profile_active', False)]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+
+    def test_encoded_segment(self):
+        with mock.patch.object(config, 'agent_trace_encode_spans', True):
+            segment = trace()
+        assert segment.spans == [] and segment.encoded
+
+        encoded = SegmentObject.FromString(encode_segment(segment))
+        assert encoded.traceSegmentId == str(segment.segment_id)
+        assert encoded.traceId == str(segment.related_traces[0])
+        assert encoded.service == config.agent_name
+
+        # the same spans as the segment built from span objects
+        expected = segment_object(trace())
+        assert [(span.spanId, span.parentSpanId, span.operationName, span.peer, span.spanType, list(span.tags))
+                for span in encoded.spans] == \
+            [(span.spanId, span.parentSpanId, span.operationName, span.peer, span.spanType, list(span.tags))
+             for span in expected.spans]
+        assert [span.operationName for span in encoded.spans] == ['/inventory', '/orders']
+
+
+if __name__ == '__main__':
+    unittest.main()
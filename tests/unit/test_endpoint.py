@@ -0,0 +1,82 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import unittest
+
+from skywalking.trace.endpoint import OVERFLOW, EndpointNormalizer
+
+
+class TestEndpointNormalizer(unittest.TestCase):
+
+    def test_collapse_ids(self):
+        normalizer = EndpointNormalizer([], collapse_ids=True, max_endpoints=0, cache_size=100)
+        assert normalizer.normalize('/users/42/orders/7') == '/users/{id}/orders/{id}'
+        assert normalizer.normalize('/files/123e4567-e89b-12d3-a456-426614174000') == '/files/{id}'
+        assert normalizer.normalize('/items/5f1d7a3b9c8e4a2b1c0d9e8f') == '/items/{id}'
+        assert normalizer.normalize('/v2/users') == '/v2/users'  # ids are whole segments only
+        assert EndpointNormalizer([], False, 0, 100).normalize('/users/42') == '/users/42'
+
+    def test_patterns(self):
+        normalizer = EndpointNormalizer(['/users/*/orders', '/static/**'], True, 0, 100)
+        assert normalizer.normalize('/users/alice/orders') == '/users/*/orders'
+        assert normalizer.normalize('/static/js/app.js') == '/static/**'
+        assert normalizer.normalize('/users/alice') == '/users/alice'
+
+    def test_cardinality_cap(self):
+        normalizer = EndpointNormalizer([], True, max_endpoints=2, cache_size=2)
+        assert normalizer.normalize('/a') == '/a'
+        assert normalizer.admit('/b/<int:id>') == '/b/<int:id>'
+        assert normalizer.normalize('/c') == OVERFLOW
+        assert normalizer.normalize('/a') == '/a'  # known endpoints keep their names
+        assert normalizer.normalize('/a/1') == OVERFLOW
+        assert len(normalizer.cache) <= 2
+
+
+class TestFastAPIEndpoint(unittest.TestCase):
+
+    def test_mounted_app(self):
+        try:
+            from starlette.applications import Starlette
+            from starlette.routing import Mount, Route
+            from starlette.staticfiles import StaticFiles
+        except ImportError:
+            self.skipTest('requires starlette')
+        from skywalking.plugins.sw_fastapi import endpoint_of
+
+        def handler(request):
+            pass
+
+        api = Starlette(routes=[Route('/users/{user_id:int}', handler)])
+        app = Starlette(routes=[
+            Route('/health', handler, methods=['GET']),
+            Mount('/api/{version}', app=api),
+            Mount('/static', app=StaticFiles(directory='.', check_dir=False)),
+        ])
+
+        def scope(path, method='GET'):
+            return {'type': 'http', 'path': path, 'root_path': '', 'method': method, 'app': app}
+
+        assert endpoint_of(scope('/health')) == '/health'
+        assert endpoint_of(scope('/health', 'POST')) == '/health'  # partial match, answered with 405
+        assert endpoint_of(scope('/api/v1/users/42')) == '/api/{version}/users/{user_id}'
+        assert endpoint_of(scope('/api/v1/users/alice')) == '/api/v1/users/alice'  # no route of the mounted app
+        assert endpoint_of(scope('/static/js/app.js')) == '/static/js/app.js'
+
+
+if __name__ == '__main__':
+    unittest.main()
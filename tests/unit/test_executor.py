@@ -0,0 +1,95 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import skywalking.meter as meter
+from skywalking import config, sampling
+from skywalking.agent import agent
+from skywalking.plugins import sw_concurrent_futures
+from skywalking.trace.context import get_context
+
+
+def work():
+    with get_context().new_exit_span(op='/inventory', peer='inventory:8080'):
+        pass
+
+
+class TestExecutorPlugin(unittest.TestCase):
+
+    def setUp(self):
+        self.submit = ThreadPoolExecutor.submit
+        sw_concurrent_futures.install()
+        self.patches = [mock.patch.object(agent, 'is_segment_queue_full', return_value=False),
+                        mock.patch.object(config, 'agent_profile_active', False),
+                        mock.patch.object(sampling, 'sampling_service', None),
+                        mock.patch.object(agent, 'archive_segment')]
+        self.archive_segment = [patch.start() for patch in self.patches][-1]
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        ThreadPoolExecutor.submit = self.submit
+
+    def segments(self):
+        return {segment.spans[-1].op: segment for segment, in (call[0] for call in self.archive_segment.call_args_list)}
+
+    def test_submit(self):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with get_context().new_entry_span(op='/orders') as entry:
+                executor.submit(work).result()
+            executor.submit(work).result()  # nothing to continue outside of a trace
+
+        segments = self.segments()
+        assert set(segments) == {'/orders', 'ThreadPoolExecutor/work', '/inventory'}
+        span = segments['ThreadPoolExecutor/work'].spans[-1]
+        assert [(ref.ref_type, ref.segment_id, ref.span_id) for ref in span.refs] == \
+            [('CrossThread', str(entry.context.segment.segment_id), entry.sid)]
+        assert {tag.key for tag in span.iter_tags()} == {'executor.queue_wait_ms', 'executor.run_time_ms'}
+
+    def test_run_in_executor(self):
+        async def handle():
+            with get_context().new_entry_span(op='/orders'):
+                await asyncio.get_running_loop().run_in_executor(None, work)
+
+        asyncio.run(handle())
+        span = self.segments()['ThreadPoolExecutor/work'].spans[-1]
+        assert span.refs and span.refs[0].ref_type == 'CrossThread'
+
+    def test_histograms(self):
+        with mock.patch.object(meter, '_meter_service') as meter_service, \
+                mock.patch.object(sw_concurrent_futures, '_histograms', {}):
+            with ThreadPoolExecutor(thread_name_prefix='io') as executor:
+                for _ in range(3):
+                    executor.submit(work).result()
+            queue_wait, run_time = sw_concurrent_futures._histograms['io']
+            assert meter_service.register.call_count == 2
+            assert sum(bucket.count for bucket in queue_wait.buckets) == 3
+            assert sum(bucket.count for bucket in run_time.buckets) == 3
+            assert queue_wait.get_tag('executor') == 'io'
+
+    def test_executor_name(self):
+        assert sw_concurrent_futures.executor_name(ThreadPoolExecutor()) == 'ThreadPoolExecutor'
+        assert sw_concurrent_futures.executor_name(ThreadPoolExecutor(thread_name_prefix='io')) == 'io'
+
+
+if __name__ == '__main__':
+    unittest.main()
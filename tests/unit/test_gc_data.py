@@ -0,0 +1,67 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import gc
+import unittest
+from unittest import mock
+
+from skywalking import meter
+from skywalking.meter.meter_service import MeterService
+from skywalking.meter.pvm import gc_data
+from skywalking.meter.pvm.gc_data import GCDataSource
+
+
+class TestGCDataSource(unittest.TestCase):
+
+    def setUp(self):
+        self.meter_service = MeterService()
+        patch = mock.patch.object(meter, '_meter_service', self.meter_service)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        if gc_data._callback in gc.callbacks:
+            gc.callbacks.remove(gc_data._callback)
+
+    def test_collections_recorded(self):
+        source = GCDataSource()
+        source.register()
+        collected = list(source.collected)
+
+        gc.collect()
+        gc.collect(0)
+
+        pauses = {m.get_tag('generation'): m for m in self.meter_service.meter_map.values()
+                  if m.get_name() == 'instance_pvm_gc_pause'}
+        assert sorted(pauses) == ['g0', 'g1', 'g2']  # tagged meters of the same name are all kept
+        assert sum(bucket.count for bucket in pauses['g2'].buckets) == 1
+        assert sum(bucket.count for bucket in pauses['g0'].buckets) >= 1
+        assert source.gc_time.transform().singleValue.value > 0
+        assert source.gc_time.transform().singleValue.value == 0  # reported per period
+        assert source.collected[2] >= collected[2]
+
+    def test_callback_replaced(self):
+        GCDataSource().register()
+        source = GCDataSource()  # e.g. after fork()
+        source.register()
+        assert gc.callbacks.count(source.gc_callback) == 1
+        assert sum(callback.__qualname__ == 'GCDataSource.gc_callback' for callback in gc.callbacks
+                   if hasattr(callback, '__qualname__')) == 1
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import unittest
+import warnings
+from unittest import mock
+
+import grpc
+
+from skywalking import config
+from skywalking.client.grpc import channel_compression, channel_options
+
+
+class TestGrpcChannel(unittest.TestCase):
+    def tearDown(self):
+        config.agent_grpc_compression = ''
+        config.agent_grpc_keepalive_time_ms = 0
+        config.agent_grpc_max_send_message_length = 0
+
+    def test_defaults(self):
+        self.assertEqual(grpc.Compression.NoCompression, channel_compression())
+        self.assertEqual([], channel_options())
+
+    def test_configured(self):
+        config.agent_grpc_compression = 'gzip'
+        config.agent_grpc_keepalive_time_ms = 30000
+        config.agent_grpc_max_send_message_length = 1024
+
+        self.assertEqual(grpc.Compression.Gzip, channel_compression())
+        options = dict(channel_options())
+        self.assertEqual(30000, options['grpc.keepalive_time_ms'])
+        self.assertEqual(config.agent_grpc_keepalive_timeout_ms, options['grpc.keepalive_timeout_ms'])
+        self.assertEqual(1024, options['grpc.max_send_message_length'])
+        self.assertNotIn('grpc.client_idle_timeout_ms', options)
+
+    def test_compression_none(self):
+        with mock.patch.object(config, 'agent_grpc_compression', 'none'), warnings.catch_warnings():
+            warnings.simplefilter('error')
+            config.finalize_feature()
+            self.assertEqual('', config.agent_grpc_compression)
+            self.assertEqual(grpc.Compression.NoCompression, channel_compression())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import socket
+import unittest
+from concurrent import futures
+from queue import Queue
+
+import grpc
+
+from skywalking import config
+from skywalking.protocol.common.Command_pb2 import Commands
+from skywalking.protocol.language_agent.Tracing_pb2_grpc import TraceSegmentReportServiceServicer, \
+    add_TraceSegmentReportServiceServicer_to_server
+from skywalking.trace.segment import Segment
+
+
+class StreamCollector(TraceSegmentReportServiceServicer):
+    def __init__(self):
+        self.streams = []
+
+    def collect(self, request_iterator, context):
+        self.streams.append(sum(1 for _ in request_iterator))
+        return Commands()
+
+
+class TestGrpcStreamingSession(unittest.TestCase):
+    def setUp(self):
+        with socket.socket() as s:
+            s.bind(('localhost', 0))
+            port = s.getsockname()[1]
+
+        self.collector = StreamCollector()
+        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+        add_TraceSegmentReportServiceServicer_to_server(self.collector, self.server)
+        self.server.add_insecure_port(f'localhost:{port}')
+        self.server.start()
+
+        self.backend = config.agent_collector_backend_services
+        config.agent_collector_backend_services = f'localhost:{port}'
+        config.agent_grpc_streaming_session = True
+        config.agent_grpc_streaming_session_max_age = 1
+        config.agent_grpc_streaming_session_max_messages = 3
+
+    def tearDown(self):
+        config.agent_collector_backend_services = self.backend
+        config.agent_grpc_streaming_session = False
+        self.server.stop(None)
+
+    def test_rotate_on_size_and_age(self):
+        from skywalking.agent.protocol.grpc import GrpcProtocol
+
+        protocol = GrpcProtocol()
+        queue = Queue()
+        for _ in range(5):
+            queue.put(Segment())
+
+        protocol.report_segment(queue)  # rotated after 3 segments
+        self.assertEqual([3], self.collector.streams)
+
+        protocol.report_segment(queue)  # the rest, then idles on the queue until the session is 1 second old
+        self.assertEqual([3, 2], self.collector.streams)
+        self.assertTrue(queue.empty())
+
+        protocol.channel.unsubscribe(protocol._cb)
+        protocol.channel.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
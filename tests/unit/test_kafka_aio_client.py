@@ -0,0 +1,112 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from skywalking.agent.protocol import kafka_aio
+from skywalking.client.kafka_aio import DeliveryWindow
+
+
+class FakeProducer:
+    def __init__(self):
+        self.futures = []
+
+    async def send(self, topic, key=None, value=None):
+        future = asyncio.get_running_loop().create_future()
+        self.futures.append(future)
+        return future
+
+
+class TestDeliveryWindow(unittest.TestCase):
+    def test_sends_without_waiting_for_ack(self):
+        async def run():
+            producer = FakeProducer()
+            window = DeliveryWindow(producer, 4)
+            for i in range(4):
+                await window.send('topic', b'key', b'%d' % i)
+            self.assertEqual(4, len(window))
+
+            for future in producer.futures:
+                future.set_result(None)
+            await window.drain()
+            self.assertEqual(0, len(window))
+
+        asyncio.run(run())
+
+    def test_backpressure_when_window_is_full(self):
+        async def run():
+            producer = FakeProducer()
+            window = DeliveryWindow(producer, 2)
+            await window.send('topic', b'key', b'0')
+            await window.send('topic', b'key', b'1')
+
+            blocked = asyncio.ensure_future(window.send('topic', b'key', b'2'))
+            await asyncio.sleep(0.01)
+            self.assertFalse(blocked.done())
+            self.assertEqual(2, len(producer.futures))
+
+            producer.futures[0].set_result(None)
+            await asyncio.wait_for(blocked, 1)
+            self.assertEqual(3, len(producer.futures))
+            self.assertEqual(2, len(window))
+
+        asyncio.run(run())
+
+    def test_delivery_failure_is_raised(self):
+        async def run():
+            producer = FakeProducer()
+            window = DeliveryWindow(producer, 8)
+            await window.send('topic', b'key', b'0')
+            producer.futures[0].set_exception(ConnectionError('broker down'))
+            await asyncio.sleep(0)
+
+            with self.assertRaises(ConnectionError):
+                await window.send('topic', b'key', b'1')
+            await window.send('topic', b'key', b'2')  # the failure is raised only once
+            self.assertEqual(2, len(producer.futures))
+
+        asyncio.run(run())
+
+    def test_drained_when_protocol_stops(self):
+        async def run():
+            protocol = kafka_aio.KafkaProtocolAsync.__new__(kafka_aio.KafkaProtocolAsync)
+            producers = [FakeProducer() for _ in range(3)]
+            protocol.traces_reporter, protocol.log_reporter, protocol.meter_reporter = \
+                [SimpleNamespace(window=DeliveryWindow(producer, 8), topic=f'topic-{i}')
+                 for i, producer in enumerate(producers)]
+            for reporter in (protocol.traces_reporter, protocol.log_reporter):
+                await reporter.window.send(reporter.topic, b'key', b'0')
+
+            stop = asyncio.ensure_future(protocol.stop())
+            await asyncio.sleep(0.01)
+            self.assertFalse(stop.done())  # waits for the records in flight
+            producers[0].futures[0].set_exception(ConnectionError('broker down'))
+            producers[1].futures[0].set_result(None)
+            with mock.patch.object(kafka_aio, 'logger') as logger:
+                await asyncio.wait_for(stop, 1)
+            logger.warning.assert_called_once()
+            self.assertEqual('topic-0', logger.warning.call_args[0][1])
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import unittest
+from unittest import mock
+
+from skywalking.agent.protocol.kafka import KafkaProtocol
+from skywalking.client import kafka as kafka_client
+
+
+class FakeFuture:
+    def __init__(self):
+        self.callbacks = []
+        self.errbacks = []
+
+    def add_callback(self, fn):
+        self.callbacks.append(fn)
+
+    def add_errback(self, fn):
+        self.errbacks.append(fn)
+
+    def get(self, timeout=None):
+        raise AssertionError('reporters must not block on the broker')
+
+
+class FakeProducer:
+    instances = []
+
+    def __init__(self, **configs):
+        self.configs = configs
+        self.records = []
+        self.futures = []
+        FakeProducer.instances.append(self)
+
+    def send(self, topic, key=None, value=None):
+        self.records.append((topic, key, value))
+        future = FakeFuture()
+        self.futures.append(future)
+        return future
+
+
+class TestKafkaClient(unittest.TestCase):
+    def setUp(self):
+        FakeProducer.instances = []
+        patcher = mock.patch.object(kafka_client, 'KafkaProducer', FakeProducer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_tuned_defaults(self):
+        self.assertEqual(100, kafka_client.kafka_configs['linger_ms'])
+        self.assertEqual(65536, kafka_client.kafka_configs['batch_size'])
+        self.assertEqual('gzip', kafka_client.kafka_configs['compression_type'])
+
+    def test_single_shared_producer(self):
+        protocol = KafkaProtocol()
+
+        self.assertEqual(1, len(FakeProducer.instances))
+        producer = FakeProducer.instances[0]
+        self.assertEqual(kafka_client.kafka_configs, producer.configs)
+        for client in (protocol.service_management, protocol.traces_reporter, protocol.log_reporter,
+                       protocol.meter_reporter):
+            self.assertIs(producer, client.producer)
+
+    def test_heartbeat_does_not_block(self):
+        protocol = KafkaProtocol()
+        producer = FakeProducer.instances[0]
+
+        protocol.heartbeat()
+
+        future = producer.futures[-1]
+        self.assertEqual(1, len(future.callbacks))
+        self.assertEqual(1, len(future.errbacks))
+        with self.assertLogs('skywalking', level='WARNING'):
+            future.errbacks[0](Exception('broker down'))
+
+
+if __name__ == '__main__':
+    unittest.main()
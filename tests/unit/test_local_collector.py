@@ -0,0 +1,149 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import os
+import shutil
+import socket
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import grpc
+
+from skywalking import config, meter
+from skywalking.agent.collector import LocalCollector
+from skywalking.agent.protocol.collector import FRAME, CollectorClient, FrameKind, pack
+
+
+class FakeReporter:
+    def __init__(self):
+        self.reported = []
+
+    def report_serialized(self, generator):
+        self.reported.extend(generator)
+
+
+class FlakyReporter(FakeReporter):
+    def __init__(self):
+        super().__init__()
+        self.failures = 0
+
+    def report_serialized(self, generator):
+        if self.failures:
+            self.failures -= 1
+            list(generator)
+            raise grpc.RpcError()
+        super().report_serialized(generator)
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class TestLocalCollector(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'collector.sock')
+        self.collector = LocalCollector(self.path)
+        self.segments, self.logs = FlakyReporter(), FakeReporter()
+        self.collector.reporters[FrameKind.SEGMENT] = self.collector.protocol.traces_reporter = self.segments
+        self.collector.reporters[FrameKind.LOG] = self.logs
+        self.collector.reporters[FrameKind.METER] = self.meters = FakeReporter()
+        self.collector.start()
+
+    def tearDown(self):
+        self.collector.stop()
+        self.collector.protocol.channel.unsubscribe(self.collector.protocol._cb)
+        self.collector.protocol.channel.close()
+        shutil.rmtree(self.dir)
+
+    def test_forward(self):
+        client = CollectorClient(self.path)
+        assert client.send(FrameKind.SEGMENT, [b'segment-1', b'segment-2'])
+        assert client.send(FrameKind.LOG, [b'log'])
+        assert wait_until(lambda: len(self.segments.reported) == 2 and self.logs.reported)
+        assert self.segments.reported == [b'segment-1', b'segment-2']
+        assert self.logs.reported == [b'log']
+        client.close()
+
+    def test_failed_report_kept_in_backlog(self):
+        self.segments.failures = 1
+        client = CollectorClient(self.path)
+        assert client.send(FrameKind.SEGMENT, [b'segment-1'])
+        assert wait_until(lambda: len(self.collector.protocol.backlog) == 1)
+        assert self.collector.reporter_backoff['collector_segment'] == 1
+        assert client.send(FrameKind.SEGMENT, [b'segment-2'])
+        assert wait_until(lambda: self.segments.reported == [b'segment-1', b'segment-2'])  # the backlog goes first
+        assert wait_until(lambda: self.collector.reporter_backoff['collector_segment'] == 0)
+        client.close()
+
+    def test_dropped_frames(self):
+        from skywalking.protocol.language_agent.Meter_pb2 import MeterData
+
+        queue = self.collector.queues[FrameKind.LOG]
+        queue.maxsize = 1
+        queue.batch_size = 2  # held until the flush interval
+        with mock.patch('skywalking.agent.collector.logger') as logger:
+            for _ in range(3):
+                self.collector.dispatch(FrameKind.LOG, b'log')
+        assert queue.dropped.get() == 2
+        logger.warning.assert_called_once()  # rate limited
+
+        with mock.patch.object(meter, '_meter_service', None):
+            self.collector._LocalCollector__register_health_meters()
+            self.collector._LocalCollector__report_health()
+        assert wait_until(lambda: self.meters.reported)
+        values = {data.singleValue.name: data.singleValue.value
+                  for data in map(MeterData.FromString, self.meters.reported) if data.HasField('singleValue')}
+        assert values['instance_agent_collector_log_dropped_queue_full'] == 2
+
+    def test_frames_split_across_reads(self):
+        data = pack(FrameKind.SEGMENT, [b'x' * 100])
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.path)
+            sock.sendall(data[:FRAME.size + 10])
+            time.sleep(0.05)
+            sock.sendall(data[FRAME.size + 10:])
+            assert wait_until(lambda: self.segments.reported == [b'x' * 100])
+
+    def test_unreachable_collector(self):
+        client = CollectorClient(os.path.join(self.dir, 'absent.sock'))
+        assert not client.available()
+        assert not client.send(FrameKind.SEGMENT, [b'segment'])
+
+    def test_collector_protocol_falls_back(self):
+        from skywalking.agent.protocol.collector import CollectorProtocol
+
+        with mock.patch.object(config, 'agent_local_collector_socket', os.path.join(self.dir, 'absent.sock')):
+            protocol = CollectorProtocol()
+        reporter = FakeReporter()
+        message = mock.Mock()
+        message.SerializeToString.return_value = b'segment'
+        protocol.report_records(FrameKind.SEGMENT, reporter, iter([message]))
+        assert reporter.reported == [b'segment']  # reported by the process itself
+        protocol.channel.unsubscribe(protocol._cb)
+        protocol.channel.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
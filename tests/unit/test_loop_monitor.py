@@ -0,0 +1,144 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import threading
+from asyncio import base_events, events
+import time
+import unittest
+from unittest import mock
+
+from skywalking import config, sampling
+from skywalking.agent import agent
+from skywalking.meter import loop_monitor
+from skywalking.meter.loop_monitor import LoopMonitor
+from skywalking.trace.context import get_context
+
+
+class TestLoopMonitor(unittest.TestCase):
+
+    def setUp(self):
+        self.patches = [
+            mock.patch.object(agent, 'is_segment_queue_full', return_value=False),
+            mock.patch.object(agent, 'archive_segment'),
+            mock.patch.object(config, 'agent_profile_active', False),
+            mock.patch.object(sampling, 'sampling_service', None),
+        ]
+        for patch in self.patches:
+            patch.start()
+        self.monitor = LoopMonitor(interval=0.01, threshold=0.05)
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        self.loop.close()
+
+    def run_loop(self, coro):
+        result = {}
+
+        def run():
+            self.monitor.watch(self.loop)
+            try:
+                result['value'] = self.loop.run_until_complete(coro)
+            finally:
+                self.monitor.unwatch(self.loop)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        return thread, result
+
+    def test_lag(self):
+        thread, _ = self.run_loop(asyncio.sleep(0.1))
+        thread.join()
+        assert not self.monitor.probes
+        assert sum(bucket.count for bucket in self.monitor.lag.buckets) > 0
+
+    def test_blocked_callback_logged(self):
+        blocking = threading.Event()
+
+        async def handler():
+            with get_context().new_local_span(op='/blocking') as span:
+                await asyncio.sleep(0.02)
+                blocking.set()
+                time.sleep(0.3)
+            return span
+
+        thread, result = self.run_loop(handler())
+        blocking.wait()
+        time.sleep(0.1)
+        self.monitor.check()
+        self.monitor.check()  # the stall is sampled once
+        thread.join()
+
+        logs = result['value'].logs
+        assert len(logs) == 1
+        items = {item.key: item.val for item in logs[0].items}
+        assert items['event'] == 'event loop blocked'
+        assert int(items['blocked_ms']) >= 50
+        assert 'handler' in items['stack']
+
+    def test_threshold_off(self):
+        self.monitor.threshold = 0
+        probe = mock.Mock(beat=0, sampled=False)
+        self.monitor.probes[self.loop] = probe
+        self.monitor.check()
+        assert not probe.sampled
+
+
+class ForeignLoop(asyncio.AbstractEventLoop):  # a loop not based on BaseEventLoop, like uvloop
+    pass
+
+
+class TestLoopMonitorInstall(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = getattr(events, '_BaseDefaultEventLoopPolicy', None) or events.BaseDefaultEventLoopPolicy
+        self.originals = (base_events.BaseEventLoop.run_forever, self.policy.new_event_loop,
+                          self.policy.set_event_loop, loop_monitor.monitor)
+
+    def tearDown(self):
+        asyncio.set_event_loop(None)
+        base_events.BaseEventLoop.run_forever, self.policy.new_event_loop, self.policy.set_event_loop, \
+            loop_monitor.monitor = self.originals
+        loop_monitor._unprobed_types.clear()
+
+    def test_foreign_loop_warned(self):
+        loop_monitor.install(interval=0.01, threshold=0)
+        with mock.patch.object(loop_monitor.logger, 'warning') as warning:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            loop.close()
+            warning.assert_not_called()
+
+            asyncio.set_event_loop(ForeignLoop())
+            asyncio.set_event_loop(ForeignLoop())
+            assert warning.call_count == 1  # once per type
+            assert 'ForeignLoop' in warning.call_args[0][2]
+
+    def test_running_foreign_loop_probed(self):
+        loop = mock.Mock(spec=ForeignLoop)
+        with mock.patch.object(asyncio, 'get_running_loop', return_value=loop), \
+                mock.patch.object(loop_monitor.logger, 'warning') as warning:
+            monitor = loop_monitor.install(interval=0.01, threshold=0)
+        assert loop in monitor.probes
+        loop.call_soon.assert_called_once_with(monitor.probes[loop].probe)
+        warning.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -23,6 +23,7 @@ from skywalking.meter.counter import Counter, CounterMode
 from skywalking.meter.histogram import Histogram
 from skywalking.meter.gauge import Gauge
 from skywalking.meter.meter import BaseMeter
+from skywalking.meter.meter_service import MeterService
 from skywalking import meter
 
 
@@ -179,5 +180,30 @@ class TestMeter(unittest.TestCase):
             self.assertEqual(i, meterdata.singleValue.value)
 
 
+class TestMeterService(unittest.TestCase):
+    def setUp(self):
+        meter._meter_service = MeterService()
+
+    def tearDown(self):
+        meter._meter_service = meter_service
+
+    def test_tagged_meters(self):
+        c = Counter.Builder('tagged_c', CounterMode.INCREMENT).tag('k', 'v').build()
+        other = Counter.Builder('tagged_c', CounterMode.INCREMENT).tag('k', 'w').build()
+        h = Histogram.Builder('tagged_h', [0, 1]).tag('k', 'v').build()
+        self.assertEqual(3, len(meter._meter_service.meter_map))  # meters of the same name told apart by their tags
+
+        @Counter.increase(name='tagged_c', num=2)
+        @Counter.timer(name='tagged_c')
+        @Histogram.timer(name='tagged_h')
+        def decorated():
+            pass
+
+        decorated()
+        self.assertEqual(0, c.count)
+        self.assertGreaterEqual(other.count, 2)
+        self.assertEqual(1, sum(bucket.count for bucket in h.transform().histogram.values))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,87 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import sys
+import threading
+import time
+import types
+import unittest
+
+from skywalking.meter import plugin_overhead
+
+LIBRARY = """
+import time
+
+
+class Client:
+    def call(self, seconds):
+        time.sleep(seconds)
+        return seconds
+
+    async def acall(self):
+        ...
+"""
+
+
+def install(client_class):
+    _call = client_class.call
+    _acall = client_class.acall
+
+    def _sw_call(this, seconds):
+        time.sleep(0.01)  # the instrumentation overhead
+        return _call(this, seconds)
+
+    async def _sw_acall(this):
+        return await _acall(this)
+
+    client_class.call = _sw_call
+    client_class.acall = _sw_acall
+
+
+class TestPluginOverhead(unittest.TestCase):
+    def setUp(self):
+        self.library = types.ModuleType('sw_fake_library')
+        exec(compile(LIBRARY, '<sw_fake_library>', 'exec'), vars(self.library))
+        sys.modules[self.library.__name__] = self.library
+        install(self.library.Client)
+        plugin_overhead.track({__file__: 'sw_fake'})
+
+    def tearDown(self):
+        del sys.modules[self.library.__name__]
+
+    def test_self_time_excludes_library(self):
+        client = self.library.Client()
+        self.assertEqual(0.1, client.call(0.1))
+        thread = threading.Thread(target=client.call, args=(0.1, ))
+        thread.start()
+        thread.join()
+
+        calls, self_time = plugin_overhead.snapshot()[('sw_fake', 'call')]
+        self.assertEqual(2, calls)
+        self.assertGreaterEqual(self_time, 0.02)
+        self.assertLess(self_time, 0.1)  # the 0.2s spent in the library are not counted
+        self.assertIn('sw_fake', plugin_overhead.dump())
+
+    def test_async_functions_are_not_tracked(self):
+        self.assertEqual('_sw_acall', self.library.Client.acall.__name__)
+        self.assertFalse(hasattr(self.library.Client.acall, '__wrapped__'))
+        self.assertTrue(hasattr(self.library.Client.call, '__wrapped__'))
+
+
+if __name__ == '__main__':
+    unittest.main()
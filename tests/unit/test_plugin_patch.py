@@ -0,0 +1,128 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import importlib.util
+import types
+import unittest
+import urllib.request
+from unittest import mock
+
+from skywalking import config, dynamic_config, plugins
+
+
+class Base:
+    def inherited(self):
+        return 'base'
+
+
+class Target(Base):
+    def own(self):
+        return 'own'
+
+
+def _sw_own(self):
+    return 'patched own'
+
+
+def _sw_inherited(self):
+    return 'patched inherited'
+
+
+def install():  # patches are recorded under the name of this file, like a plugin
+    plugins.patch(Target, 'own', _sw_own)
+    plugins.patch(Target, 'inherited', _sw_inherited)
+    plugins.patch(module, 'value', 2)
+
+
+module = types.ModuleType('target')
+module.value = 1
+PLUGIN = 'test_plugin_patch'
+
+
+class TestPluginPatch(unittest.TestCase):
+
+    def setUp(self):
+        mock.patch.dict(plugins._patches).start()
+        mock.patch.object(plugins, '_uninstalled', set()).start()
+        self.own = vars(Target)['own']
+
+    def tearDown(self):
+        plugins.uninstall(PLUGIN)
+        mock.patch.stopall()
+
+    def test_originals_restored(self):
+        install()
+        assert Target().own() == 'patched own' and Target().inherited() == 'patched inherited'
+        assert module.value == 2
+        assert PLUGIN in plugins.installed_plugins()
+
+        assert plugins.uninstall(PLUGIN)
+        assert vars(Target)['own'] is self.own
+        assert 'inherited' not in vars(Target)  # inherited again, not copied from the base class
+        assert Target().inherited() == 'base'
+        assert module.value == 1
+        assert PLUGIN not in plugins.installed_plugins()
+        assert not plugins.uninstall(PLUGIN)
+
+        assert plugins.reinstall(PLUGIN)
+        assert vars(Target)['own'] is _sw_own and vars(Target)['inherited'] is _sw_inherited
+        assert module.value == 2
+        assert not plugins.reinstall(PLUGIN)
+
+    def test_later_replacement_left_alone(self):
+        install()
+
+        def replaced(self):
+            return 'replaced'
+        Target.own = replaced
+        plugins.uninstall(PLUGIN)
+        assert vars(Target)['own'] is replaced
+        assert module.value == 1
+        Target.own = self.own
+
+    def test_real_plugin(self):
+        original = vars(urllib.request.OpenerDirector)['open']
+        spec = importlib.util.find_spec('skywalking.plugins.sw_urllib_request')
+        plugin = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(plugin)
+        plugin.install()
+        try:
+            assert vars(urllib.request.OpenerDirector)['open'] is not original
+            assert plugins.uninstall('sw_urllib_request')
+            assert vars(urllib.request.OpenerDirector)['open'] is original
+        finally:
+            plugins.uninstall('sw_urllib_request')
+
+    def test_toggled_by_dynamic_config(self):
+        install()
+        mock.patch.object(config, 'agent_disable_plugins', ['']).start()
+        try:
+            assert dynamic_config.apply({'agent_disable_plugins': 'sw_foo,test_plugin_.*'}, 'test')
+            assert vars(Target)['own'] is self.own
+            assert dynamic_config.apply({'agent_disable_plugins': 'sw_foo'}, 'test')
+            assert vars(Target)['own'] is _sw_own
+            assert not dynamic_config.apply({'agent_disable_plugins': '('}, 'test')  # invalid pattern, rolled back
+            assert config.agent_disable_plugins == ['sw_foo']
+            assert vars(Target)['own'] is _sw_own
+        finally:
+            dynamic_config.apply({}, 'test')
+            dynamic_config._startup.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+import unittest
+from unittest import mock
+
+from skywalking.meter.pvm import process_data
+from skywalking.meter.pvm.process_data import ProcessDataSource, ProcReader, PsutilReader
+
+KEYS = {'process_rss', 'thread_active_count', 'open_fds', 'voluntary_context_switches',
+        'involuntary_context_switches', 'total_mem_utilization', 'process_mem_utilization'}
+CPU_KEYS = {'total_cpu_utilization', 'process_cpu_utilization'}
+
+
+class TestProcessData(unittest.TestCase):
+
+    @unittest.skipUnless(ProcReader.available(), 'requires /proc')
+    def test_proc_reader(self):
+        reader = ProcReader()
+        snapshot = reader.read()
+        assert KEYS <= set(snapshot)
+        assert not CPU_KEYS & set(snapshot)  # utilization needs two snapshots
+        assert snapshot['process_rss'] > 0 and snapshot['open_fds'] > 0
+        assert 0 < snapshot['process_mem_utilization'] < 1
+
+        event = threading.Event()
+        thread = threading.Thread(target=event.wait)
+        thread.start()
+        sum(range(1000000))  # some CPU time
+        snapshot = reader.read()
+        event.set()
+        thread.join()
+        assert KEYS | CPU_KEYS <= set(snapshot)
+        assert snapshot['thread_active_count'] >= 2
+        assert snapshot['process_cpu_utilization'] >= 0
+
+    def test_psutil_reader(self):
+        try:
+            reader = PsutilReader()
+        except ImportError:
+            self.skipTest('requires psutil')
+        assert KEYS | CPU_KEYS <= set(reader.read())
+
+    def test_one_snapshot_per_period(self):
+        source = ProcessDataSource()
+        source.reader = mock.Mock()
+        source.reader.read.return_value = {'open_fds': 3, 'process_rss': 1024}
+        assert next(source.open_fds_generator()) == 3
+        assert next(source.process_rss_generator()) == 1024
+        assert next(source.thread_active_count_generator()) == 0
+        source.reader.read.assert_called_once()
+
+        with mock.patch.object(process_data, 'SNAPSHOT_MAX_AGE', 0):
+            next(source.open_fds_generator())
+        assert source.reader.read.call_count == 2
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import threading
+import unittest
+from unittest import mock
+
+from skywalking import config, profile
+from skywalking.agent import SkyWalkingAgentAsync, agent
+from skywalking.agent.scheduler import Scheduler
+from skywalking.profile import profile_service
+from skywalking.profile.profile_context import ProfileTaskExecutionContext
+from skywalking.profile.profile_task import ProfileTask
+from skywalking.trace.context import SpanContext
+
+
+class TestProfileSlots(unittest.TestCase):
+
+    def setUp(self):
+        profile.init()
+        self.service = profile.profile_task_execution_service
+        self.execution_context = ProfileTaskExecutionContext(ProfileTask(first_span_op_name='/orders',
+                                                                         max_sampling_count=5))
+        self.patches = [mock.patch.object(config, 'agent_profile_active', True),
+                        mock.patch.object(config, 'agent_profile_max_parallel', 2),
+                        mock.patch.object(agent, 'is_segment_queue_full', return_value=False),
+                        mock.patch.object(agent, 'archive_segment')]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        self.service.task_execution_context = None
+
+    def test_no_task(self):
+        context = SpanContext()
+        with context.new_entry_span(op='/orders'):
+            assert context.profile_status is None
+
+    def test_slot_released_when_trace_ends(self):
+        self.service.task_execution_context = self.execution_context
+        slots = self.execution_context.profiling_segment_slots
+
+        context = SpanContext()
+        with context.new_entry_span(op='/orders'):
+            assert context.profile_status.is_being_watched()
+            assert list(slots) == [threading.get_ident()]
+            # the thread is already profiled, another trace on it is not
+            assert not self.service.add_profiling(SpanContext(), 'segment', '/orders').is_being_watched()
+        assert not slots
+
+        context = SpanContext()
+        with context.new_entry_span(op='/customers'):
+            assert not context.profile_status.is_being_watched()
+        assert not slots
+
+    def test_max_parallel(self):
+        self.service.task_execution_context = self.execution_context
+        statuses = []
+        barrier = threading.Barrier(3)
+
+        def attempt():
+            statuses.append(self.service.add_profiling(SpanContext(), 'segment', '/orders').is_being_watched())
+            barrier.wait()  # keep the threads alive, so that their idents are not reused
+
+        threads = [threading.Thread(target=attempt) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(statuses) == [False, True, True]
+        assert len(self.execution_context.profiling_segment_slots) == 2
+
+
+class TestProfileScheduler(unittest.TestCase):
+
+    def test_scheduler_thread(self):
+        scheduler = Scheduler()
+        scheduler.start()
+        try:
+            done = threading.Event()
+            with mock.patch.object(agent, 'scheduler', scheduler):
+                profile_service.Scheduler.schedule(10, done.set)
+            assert done.wait(5)
+        finally:
+            scheduler.stop()
+
+    def test_asyncio_agent(self):
+        done = threading.Event()
+        with mock.patch.object(profile_service, 'agent', mock.Mock(spec=SkyWalkingAgentAsync)):
+            profile_service.Scheduler.schedule(10, lambda event: event.set(), args=[done])
+        assert done.wait(5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import threading
+import time
+import unittest
+
+from skywalking import config
+from skywalking.agent.reporter_queue import ReporterQueue
+
+
+class TestReporterQueue(unittest.TestCase):
+    def setUp(self):
+        self.batch_size, self.flush_interval = config.agent_reporter_flush_batch_size, \
+            config.agent_reporter_flush_interval_ms
+        config.agent_reporter_flush_batch_size = 3
+        config.agent_reporter_flush_interval_ms = 100
+
+    def tearDown(self):
+        config.agent_reporter_flush_batch_size = self.batch_size
+        config.agent_reporter_flush_interval_ms = self.flush_interval
+
+    def test_full_batch_wakes_up_immediately(self):
+        queue = ReporterQueue()
+        for i in range(3):
+            queue.put(i)
+        start = time.monotonic()
+        self.assertTrue(queue.wait_batch())
+        self.assertLess(time.monotonic() - start, 0.05)
+
+    def test_partial_batch_waits_for_flush_deadline(self):
+        queue = ReporterQueue()
+        queue.put(0)
+        start = time.monotonic()
+        self.assertTrue(queue.wait_batch())
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_sleeps_until_first_item(self):
+        queue = ReporterQueue()
+        woken = []
+        thread = threading.Thread(target=lambda: woken.append(queue.wait_batch()))
+        thread.start()
+        time.sleep(0.2)
+        self.assertEqual([], woken)
+
+        for i in range(3):
+            queue.put(i)
+        thread.join(1)
+        self.assertEqual([True], woken)
+
+    def test_close_releases_reporter(self):
+        queue = ReporterQueue()
+        thread = threading.Thread(target=queue.wait_batch)
+        thread.start()
+        queue.close()
+        thread.join(1)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(queue.wait_batch())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,9 +15,18 @@
 # limitations under the License.
 #
 
+import threading
 import unittest
+from unittest import mock
 
+from skywalking import config, sampling
+from skywalking.agent import agent
+from skywalking.decorators import runnable
+from skywalking.sampling.sampler import AdaptiveSampler, EndpointQuotaSampler, ProbabilisticSampler, \
+    TokenBucketSampler, parse_quotas
 from skywalking.sampling.sampling_service import SamplingService, SamplingServiceAsync
+from skywalking.trace.carrier import Carrier
+from skywalking.trace.context import NoopContext, SamplingContext, UnsampledContext, get_context
 
 
 class TestSampling(unittest.TestCase):
@@ -84,5 +93,124 @@ class TestSamplingAsync(unittest.IsolatedAsyncioTestCase):
         assert sampling_service.try_sampling()
 
 
+
+class TestSamplers(unittest.TestCase):
+
+    def test_token_bucket(self):
+        sampler = TokenBucketSampler(rate=1, burst=2)
+        assert sampler.try_sampling()
+        assert sampler.try_sampling()
+        assert not sampler.try_sampling()
+        sampler.bucket.last -= 1  # a second later, one token has been refilled
+        assert sampler.try_sampling()
+        assert not sampler.try_sampling()
+
+    def test_force_sampled_borrows_tokens(self):
+        sampler = TokenBucketSampler(rate=1)
+        sampler.force_sampled()
+        assert not sampler.try_sampling()
+
+    def test_probabilistic(self):
+        assert not any(ProbabilisticSampler(0).try_sampling() for _ in range(100))
+        assert all(ProbabilisticSampler(1).try_sampling() for _ in range(100))
+
+    def test_endpoint_quota(self):
+        sampler = EndpointQuotaSampler(rate=1, quotas=parse_quotas('/health:0,GET:/orders:2'), max_endpoints=3)
+        assert not sampler.try_sampling('/health')
+        assert sampler.try_sampling('GET:/orders')
+        assert sampler.try_sampling('GET:/orders')
+        assert not sampler.try_sampling('GET:/orders')
+        assert sampler.try_sampling('/rare')  # a hot endpoint does not use up the quota of the others
+        assert sampler.try_sampling('/overflow')  # beyond max_endpoints, endpoints share one quota
+        assert not sampler.try_sampling('/another')
+
+    def test_upstream_decision(self):
+        sampler = ProbabilisticSampler(0)
+        carrier = Carrier()
+        carrier.val = '1-MQ==-Mg==-3-c2VydmljZQ==-aW5zdGFuY2U=-L2FwaQ==-aG9zdA=='
+        assert sampler.sample('/api', carrier)
+        carrier.val = '0-MQ==-Mg==-3-c2VydmljZQ==-aW5zdGFuY2U=-L2FwaQ==-aG9zdA=='
+        assert not ProbabilisticSampler(1).sample('/api', carrier)
+
+    def test_adaptive(self):
+        sampler = AdaptiveSampler(budget=0.02, rate=100, min_rate=1, max_rate=1000, period=10)
+        sampler.admitted = 1000
+        sampler.last -= 10
+        sampler.last_process_cpu -= 10  # the process used a whole CPU
+        with mock.patch.object(sampler, 'agent_cpu_delta', return_value=0.5):  # 0.5ms per trace
+            sampler.adjust()
+        # 2% of 1 CPU second per second fits 40 traces per second, the rate moves towards it
+        assert 40 < sampler.bucket.rate < 100
+        assert sampler.admitted == 0
+
+        with mock.patch.object(sampler, 'agent_cpu_delta', return_value=None):  # nothing measurable, no change
+            rate = sampler.bucket.rate
+            sampler.adjust()
+            assert sampler.bucket.rate == rate
+
+
+class TestSamplingContext(unittest.TestCase):
+
+    def setUp(self):
+        sampling.sampling_service = EndpointQuotaSampler(rate=1, quotas={'/health': 0}, max_endpoints=10)
+        self.queue_full = mock.patch.object(agent, 'is_segment_queue_full', return_value=False)
+        self.queue_full.start()
+
+    def tearDown(self):
+        self.queue_full.stop()
+        sampling.sampling_service = None
+
+    def test_decision_deferred_to_first_span(self):
+        context = get_context()
+        assert isinstance(context, SamplingContext)
+        with context.new_entry_span(op='/health') as span:
+            assert isinstance(span.context, NoopContext)
+            assert isinstance(get_context().new_exit_span(op='/db', peer='db'), type(span))  # children are noop too
+        with get_context().new_local_span(op='/job') as span:
+            assert not isinstance(span.context, NoopContext)
+            assert get_context() is span.context
+
+    @mock.patch.object(config, 'sample_record_error_traces', True)
+    def test_error_trace_recorded(self):
+        with mock.patch.object(agent, 'archive_segment') as archive_segment:
+            with get_context().new_entry_span(op='/health') as span:
+                assert isinstance(span.context, UnsampledContext)
+                with get_context().new_local_span(op='/check'):
+                    pass
+            archive_segment.assert_not_called()
+
+            try:
+                with get_context().new_entry_span(op='/health'):
+                    raise ValueError()
+            except ValueError:
+                pass
+            segment = archive_segment.call_args[0][0]
+            assert [(span.op, span.kind.name, span.error_occurred) for span in segment.spans] == \
+                [('/health', 'Entry', True)]
+
+    def test_runnable_continues_trace(self):
+        sampling.sampling_service = TokenBucketSampler(rate=100)
+        with mock.patch.object(agent, 'archive_segment') as archive_segment:
+            with get_context().new_local_span(op='/parent'):
+                @runnable(op='/child')
+                def child():
+                    pass
+
+                thread = threading.Thread(target=child.continue_tracing())
+                thread.start()
+                thread.join()
+                thread = threading.Thread(target=child)  # inline, the snapshot taken at decoration
+                thread.start()
+                thread.join()
+
+            segments = [call[0][0] for call in archive_segment.call_args_list]
+            children = [segment.spans[0] for segment in segments if segment.spans[0].op == '/child']
+            assert len(children) == 2
+            parent = next(segment for segment in segments if segment.spans[0].op == '/parent')
+            for span in children:
+                assert len(span.refs) == 1
+                assert span.refs[0].segment_id == str(parent.segment_id)
+
+
 if __name__ == '__main__':
     unittest.main()
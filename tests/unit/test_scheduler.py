@@ -0,0 +1,114 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import threading
+import time
+import unittest
+from queue import Queue
+from unittest import mock
+
+from skywalking import config
+from skywalking.agent.scheduler import Scheduler
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = Scheduler()
+        self.scheduler.start()
+
+    def tearDown(self):
+        self.scheduler.stop()
+        self.scheduler.join(1)
+
+    def test_jobs_run_in_due_order(self):
+        ran = []
+        done = threading.Event()
+        self.scheduler.schedule(0.2, lambda: done.set() or ran.append('late'))
+        self.scheduler.schedule(0.05, lambda: ran.append('early'))
+        self.scheduler.schedule(0, lambda: ran.append('now'))
+        self.assertTrue(done.wait(1))
+        self.assertEqual(['now', 'early', 'late'], ran)
+
+    def test_periodic_job(self):
+        runs = []
+        done = threading.Event()
+
+        def job():
+            runs.append(time.monotonic())
+            if len(runs) < 3:
+                return 0.05  # run again in 50ms
+            done.set()
+            return None
+
+        self.scheduler.schedule(0, job)
+        self.assertTrue(done.wait(1))
+        time.sleep(0.1)
+        self.assertEqual(3, len(runs))
+        self.assertGreaterEqual(runs[2] - runs[0], 0.1)
+
+    def test_failing_job_does_not_stop_scheduler(self):
+        def job():
+            raise ValueError('the job is not run again')
+
+        done = threading.Event()
+        self.scheduler.schedule(0, job)
+        self.scheduler.schedule(0.05, done.set)
+        self.assertTrue(done.wait(1))
+
+    def test_stop(self):
+        self.scheduler.stop()
+        self.scheduler.join(1)
+        self.assertFalse(self.scheduler.is_alive())
+
+
+class FakeReporter:
+    def __init__(self):
+        self.reported = []
+
+    def report_serialized(self, generator):
+        self.reported.extend(generator)
+
+
+class TestSchedulerJobs(unittest.TestCase):
+    def test_heartbeat_not_held_up_by_meter_report(self):
+        from skywalking.agent import agent
+        from skywalking.agent.protocol.grpc import GrpcProtocol
+
+        protocol = GrpcProtocol(connect=False)
+        protocol.meter_reporter = FakeReporter()
+        protocol.stream_max_age = 5  # a streaming session would wait this long for more meters
+        queue = Queue()
+        queue.put(b'meter')
+        scheduler = Scheduler()
+        scheduler.start()
+        heartbeat = threading.Event()
+        try:
+            with mock.patch.object(agent, '_SkyWalkingAgent__protocol', protocol, create=True), \
+                    mock.patch.object(agent, '_SkyWalkingAgent__meter_queue', queue, create=True), \
+                    mock.patch.object(config, 'agent_self_meter_reporter_active', False):
+                scheduler.schedule(0, agent._SkyWalkingAgent__report_meter)
+                scheduler.schedule(0.05, heartbeat.set)
+                self.assertTrue(heartbeat.wait(1))
+            self.assertEqual([b'meter'], protocol.meter_reporter.reported)
+        finally:
+            scheduler.stop()
+            protocol.channel.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,256 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from concurrent import futures
+from queue import Queue
+
+import grpc
+
+from skywalking import config
+from skywalking.agent.protocol.spool import ReplayBuffer, Spool, SpoolKind
+from skywalking.protocol.common.Command_pb2 import Commands
+from skywalking.protocol.language_agent.Tracing_pb2_grpc import TraceSegmentReportServiceServicer, \
+    add_TraceSegmentReportServiceServicer_to_server
+from skywalking.trace.segment import Segment
+
+
+class SegmentCollector(TraceSegmentReportServiceServicer):
+    def __init__(self):
+        self.segment_ids = []
+
+    def collect(self, request_iterator, context):
+        for segment in request_iterator:
+            self.segment_ids.append(segment.traceSegmentId)
+        return Commands()
+
+
+class TestSpool(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'test.spool')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_append_peek_commit(self):
+        spool = Spool(self.path, 1024)
+        self.assertTrue(spool.empty())
+        spool.append(SpoolKind.SEGMENT, b'segment')
+        spool.append(SpoolKind.LOG, b'log')
+
+        records, offset = spool.peek(1)
+        self.assertEqual([(SpoolKind.SEGMENT, b'segment')], records)
+        spool.commit(offset)
+
+        records, offset = spool.peek(10)
+        self.assertEqual([(SpoolKind.LOG, b'log')], records)
+        spool.commit(offset)
+        self.assertTrue(spool.empty())
+
+    def test_overwrite_oldest_when_full(self):
+        spool = Spool(self.path, 64)
+        for i in range(10):  # each record takes 9 + 10 bytes, wraps around the ring a few times
+            spool.append(SpoolKind.METER, f'payload-{i:02d}'.encode())
+
+        records, _ = spool.peek(10)
+        self.assertEqual([f'payload-{i:02d}'.encode() for i in range(7, 10)], [data for _, data in records])
+        self.assertEqual(7, spool.dropped)
+        self.assertFalse(spool.append(SpoolKind.METER, b'x' * 64))
+
+    def test_restore_after_reopen(self):
+        spool = Spool(self.path, 256)
+        for i in range(3):
+            spool.append(SpoolKind.SEGMENT, f'segment-{i}'.encode())
+        spool.commit(spool.peek(1)[1])
+        spool.close()
+
+        spool = Spool(self.path, 256)
+        records, _ = spool.peek(10)
+        self.assertEqual([b'segment-1', b'segment-2'], [data for _, data in records])
+
+    def test_corrupted_record_is_discarded(self):
+        spool = Spool(self.path, 256)
+        spool.append(SpoolKind.SEGMENT, b'good')
+        spool.append(SpoolKind.SEGMENT, b'torn')
+        spool.close()
+
+        with open(self.path, 'r+b') as f:
+            f.seek(-1, os.SEEK_END)
+            f.seek(f.tell() - 256 + 9 + 4 + 9)  # first payload byte of the second record
+            f.write(b'X')
+
+        spool = Spool(self.path, 256)
+        records, _ = spool.peek(10)
+        self.assertEqual([(SpoolKind.SEGMENT, b'good')], records)
+
+    def test_adopt_orphans_of_dead_processes(self):
+        dead = subprocess.Popen([sys.executable, '-c', 'pass'])
+        dead.wait()
+        orphan = Spool(os.path.join(self.dir.name, f'svc-{dead.pid}.spool'), 128)  # of another size
+        orphan.append(SpoolKind.SEGMENT, b'before the crash')
+        orphan.close()
+        alive = Spool(os.path.join(self.dir.name, f'svc-{os.getppid()}.spool'), 128)
+        alive.append(SpoolKind.LOG, b'still running')
+        alive.close()
+
+        with mock.patch.object(config, 'agent_spool_dir', self.dir.name), \
+                mock.patch.object(config, 'agent_name', 'svc'), mock.patch.object(config, 'agent_spool_max_size', 256):
+            spool = Spool.for_process()
+
+        self.assertEqual([(SpoolKind.SEGMENT, b'before the crash')], spool.peek(10)[0])
+        self.assertEqual(sorted([f'svc-{os.getpid()}.spool', f'svc-{os.getppid()}.spool']),
+                         sorted(os.listdir(self.dir.name)))
+        spool.close()
+
+
+class TestReplayBuffer(unittest.TestCase):
+    def test_capped_by_bytes(self):
+        buffer = ReplayBuffer(20)
+        for i in range(4):
+            buffer.append(SpoolKind.SEGMENT, f'segment-{i}'.encode())  # 9 bytes each
+
+        records, offset = buffer.peek(10)
+        self.assertEqual([b'segment-2', b'segment-3'], [data for _, data in records])
+        self.assertEqual(2, buffer.dropped)
+        buffer.append(SpoolKind.LOG, b'log')
+        buffer.commit(offset)
+        self.assertEqual([(SpoolKind.LOG, b'log')], buffer.peek(10)[0])
+        self.assertFalse(buffer.append(SpoolKind.LOG, b'x' * 21))
+
+
+class TestGrpcSpool(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        config.agent_spool_active = True
+        config.agent_spool_dir = self.dir.name
+
+    def tearDown(self):
+        config.agent_spool_active = False
+        self.dir.cleanup()
+
+    @staticmethod
+    def segments(n):
+        queue = Queue()
+        segments = [Segment() for _ in range(n)]
+        for segment in segments:
+            queue.put(segment)
+        return queue, [str(segment.segment_id) for segment in segments]
+
+    @staticmethod
+    def close(protocol):
+        protocol.channel.unsubscribe(protocol._cb)
+        protocol.channel.close()
+
+    def test_spool_and_replay(self):
+        from skywalking.agent.protocol.grpc import GrpcProtocol
+
+        with socket.socket() as s:  # a port nobody listens on
+            s.bind(('localhost', 0))
+            port = s.getsockname()[1]
+
+        config.agent_collector_backend_services = f'localhost:{port}'
+        protocol = GrpcProtocol()
+        queue, segment_ids = self.segments(2)
+        try:  # either the stream fails, or the channel is already known to be down
+            protocol.report_segment(queue, block=False)
+        except grpc.RpcError:
+            pass
+        # segments pulled from the queue are spooled, the rest remain in the queue
+        self.assertEqual(2, len(protocol.spool.peek(10)[0]) + queue.qsize())
+        protocol.spool.close()
+        self.close(protocol)
+
+        collector = SegmentCollector()
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+        add_TraceSegmentReportServiceServicer_to_server(collector, server)
+        server.add_insecure_port(f'localhost:{port}')
+        server.start()
+        try:
+            protocol = GrpcProtocol()  # reopens the spool file of this process
+            segment = Segment()
+            queue.put(segment)
+            protocol.report_segment(queue, block=False)
+
+            self.assertEqual(segment_ids + [str(segment.segment_id)], collector.segment_ids)
+            self.assertTrue(protocol.spool.empty())
+            self.close(protocol)
+        finally:
+            server.stop(None)
+
+    def test_heartbeat_replays_a_slice(self):
+        from skywalking.agent.protocol.grpc import GrpcProtocol
+
+        config.agent_spool_active = False
+        protocol = GrpcProtocol(connect=False)
+        protocol.service_management = mock.Mock()
+        protocol.traces_reporter = mock.Mock()
+        for i in range(3):
+            protocol.backlog.append(SpoolKind.SEGMENT, f'segment-{i}'.encode())
+        with mock.patch.object(config, 'agent_spool_replay_batch_size', 1):
+            protocol.heartbeat()
+        self.assertEqual(1, protocol.traces_reporter.report_serialized.call_count)
+        self.assertEqual(2, len(protocol.backlog))
+        self.close(protocol)
+
+    def test_replay_buffer(self):
+        from skywalking.agent.protocol.grpc import GrpcProtocol
+
+        config.agent_spool_active = False
+        with socket.socket() as s:
+            s.bind(('localhost', 0))
+            port = s.getsockname()[1]
+
+        config.agent_collector_backend_services = f'localhost:{port}'
+        protocol = GrpcProtocol()
+        self.assertIsInstance(protocol.backlog, ReplayBuffer)
+        queue, segment_ids = self.segments(2)
+        with self.assertRaises(grpc.RpcError):
+            protocol.report_segment(queue, block=False)
+        # segments pulled by the failed stream are kept serialized, the rest remain in the queue
+        self.assertEqual(2, len(protocol.backlog) + queue.qsize())
+        self.assertLess(0, len(protocol.backlog))
+        backlog = protocol.backlog
+        self.close(protocol)
+
+        collector = SegmentCollector()
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+        add_TraceSegmentReportServiceServicer_to_server(collector, server)
+        server.add_insecure_port(f'localhost:{port}')
+        server.start()
+        try:
+            protocol = GrpcProtocol()
+            protocol.backlog = backlog
+            segment = Segment()
+            queue.put(segment)
+            protocol.report_segment(queue, block=False)
+
+            self.assertEqual(segment_ids + [str(segment.segment_id)], collector.segment_ids)
+            self.assertTrue(backlog.empty())
+            self.close(protocol)
+        finally:
+            server.stop(None)
+
+
+if __name__ == '__main__':
+    unittest.main()
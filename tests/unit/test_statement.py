@@ -0,0 +1,58 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import unittest
+from unittest import mock
+
+from skywalking import config
+from skywalking.trace import statement
+
+
+class TestStatement(unittest.TestCase):
+
+    def tearDown(self):
+        statement.cached = None
+
+    def test_fingerprint(self):
+        assert statement.fingerprint("SELECT * FROM t1 WHERE a = 'it''s' AND b IN (1, 2, 3) AND c = 1.5e3") == \
+            'SELECT * FROM t1 WHERE a = ? AND b IN (?) AND c = ?'
+        # placeholders and identifiers are kept
+        assert statement.fingerprint('SELECT c2 FROM t1 WHERE a = $1 AND b = %s AND c = :p1') == \
+            'SELECT c2 FROM t1 WHERE a = $1 AND b = %s AND c = :p1'
+
+    def test_statement(self):
+        with mock.patch.object(config, 'plugin_sql_statement_max_length', 20), \
+                mock.patch.object(config, 'plugin_sql_statement_fingerprint', True):
+            statement.init()
+            assert statement.statement("SELECT * FROM orders WHERE id = 'a'") == 'SELECT * FROM orders...'
+            assert statement.statement(b'SELECT 1') == 'SELECT ?'
+            # repeated queries, even distinct objects, share one string
+            assert statement.statement(''.join(['SELECT ', '* FROM t'])) is statement.statement('SELECT * FROM t')
+            assert statement.cached.cache_info().hits == 1
+
+            class Composed:  # not hashable, e.g. psycopg sql.Composed
+                __hash__ = None
+
+                def __str__(self):
+                    return 'SELECT 2'
+
+            assert statement.statement(Composed()) == 'SELECT ?'
+
+
+if __name__ == '__main__':
+    unittest.main()
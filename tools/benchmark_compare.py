@@ -0,0 +1,78 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Compare two pytest-benchmark JSON reports and flag regressions, e.g.
+
+    python3 tools/benchmark_compare.py benchmark-baseline.json benchmark.json --threshold 10
+
+Exits with status 1 if any benchmark got slower than the baseline by more than the threshold percentage.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path: str, stat: str) -> dict:
+    with open(path) as report:
+        return {bench['fullname']: bench['stats'][stat] for bench in json.load(report)['benchmarks']}
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """
+    Returns the rows of (name, baseline, current, change in percent, regressed) of benchmarks found in both reports
+    """
+    rows = []
+    for name in sorted(baseline.keys() & current.keys()):
+        change = (current[name] - baseline[name]) / baseline[name] * 100 if baseline[name] else 0.0
+        rows.append((name, baseline[name], current[name], change, change > threshold))
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Compare two pytest-benchmark JSON reports')
+    parser.add_argument('baseline', help='the report to compare against')
+    parser.add_argument('current', help='the report of the change under test')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='the slowdown in percent considered as a regression, default 10')
+    parser.add_argument('--stat', default='median', choices=['min', 'max', 'mean', 'median'],
+                        help='the statistic to compare, default median')
+    args = parser.parse_args()
+
+    baseline, current = load(args.baseline, args.stat), load(args.current, args.stat)
+    rows = compare(baseline, current, args.threshold)
+
+    width = max((len(row[0]) for row in rows), default=10)
+    print(f"{'benchmark':<{width}}  {'baseline':>14}  {'current':>14}  {'change':>8}")
+    for name, base, cur, change, regressed in rows:
+        flag = '  REGRESSION' if regressed else ''
+        print(f'{name:<{width}}  {base * 1e6:>12.3f}us  {cur * 1e6:>12.3f}us  {change:>+7.1f}%{flag}')
+
+    for name in sorted(baseline.keys() - current.keys()):
+        print(f'missing from current report: {name}')
+    for name in sorted(current.keys() - baseline.keys()):
+        print(f'new, no baseline: {name}')
+
+    regressions = [row for row in rows if row[4]]
+    if regressions:
+        print(f'{len(regressions)} benchmark(s) regressed by more than {args.threshold}% ({args.stat})')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())